@@ -0,0 +1,372 @@
+"""Synthetic wow.export output for the importer benchmarks.
+
+Writes export folders in the layout importWoWOBJ reads: ADT tiles with
+their placement CSVs and liquid files, and M2/WMO models with .mtl, .json
+sidecars and (for nested models) their own placement CSVs. Output is
+deterministic for a given scenario, so timings can be compared between
+runs and add-on versions.
+
+Usable without Blender: python fixtures.py <scenario> <output directory>
+"""
+import json
+import math
+import os
+import random
+import struct
+import sys
+import zlib
+
+# matches MAX_SIZE in import_wowobj
+MAX_SIZE = 51200 / 3
+TILE_SIZE = 533.33333
+CHUNK_SIZE = TILE_SIZE / 16
+UNIT_SIZE = CHUNK_SIZE / 8
+
+FIXTURE_VERSION = 1
+
+ADT_FIELDS = ('ModelFile', 'PositionX', 'PositionY', 'PositionZ', 'RotationX', 'RotationY', 'RotationZ', 'RotationW', 'ScaleFactor', 'ModelId', 'Type', 'FileDataID', 'DoodadSetIndexes', 'DoodadSetNames')
+WMO_FIELDS = ('ModelFile', 'PositionX', 'PositionY', 'PositionZ', 'RotationW', 'RotationX', 'RotationY', 'RotationZ', 'ScaleFactor', 'DoodadSet', 'FileDataID')
+
+# every key a scenario may set, with its default
+DEFAULTS = {
+    'tiles': 1,               # ADT tiles, laid out in a square; 0 imports a single model instead
+    'model_type': 'wmo',      # type of the single model when tiles is 0
+    'root_vertices': 20000,   # size of that single model
+    'root_groups': 8,
+    'root_materials': 4,
+    'terrain_vertices': 37120,
+    'terrain_groups': 256,
+    'terrain_materials': 1,
+    'model_vertices': 2000,   # size of every placed model
+    'model_groups': 4,
+    'model_materials': 2,
+    'unique_m2': 20,          # distinct M2 models per tile
+    'm2_rows': 200,           # M2 placement rows per tile
+    'unique_wmo': 2,
+    'wmo_rows': 4,
+    'gobj_rows': 0,
+    'nesting_depth': 2,       # 1: tiles place models, 2: WMOs place doodad sets, and so on
+    'nested_rows': 30,        # placement rows of every nested model CSV
+    'nested_unique': 10,
+    'liquid_chunks': 64,      # chunks with liquid per tile, out of 256
+    'liquid_size': 8,         # width and height of every liquid instance
+    'texture_size': 64,
+    'seed': 1,
+}
+
+SCENARIOS = {
+    'm2_single': {'tiles': 0, 'model_type': 'm2'},
+    'wmo_doodads': {'tiles': 0, 'model_type': 'wmo', 'root_vertices': 60000, 'root_groups': 32, 'root_materials': 16, 'nesting_depth': 1, 'nested_rows': 400, 'nested_unique': 40},
+    'adt_tile': {'tiles': 1},
+    'adt_tile_dense': {'tiles': 1, 'm2_rows': 2000, 'unique_m2': 60, 'gobj_rows': 50, 'liquid_chunks': 256},
+    'adt_2x2': {'tiles': 4},
+    'adt_4x4': {'tiles': 16, 'm2_rows': 100, 'nested_rows': 10},
+}
+
+
+def scenario_config(name, overrides=None):
+    config = dict(DEFAULTS)
+    config.update(SCENARIOS[name])
+    config.update(overrides or {})
+    return config
+
+
+def write_png(path, size, color):
+    """Write a solid RGBA PNG without any imaging library"""
+    row = b'\0' + bytes(color) * size
+    raw = row * size
+
+    def chunk(tag, data):
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff)
+
+    with open(path, 'wb') as fp:
+        fp.write(b'\x89PNG\r\n\x1a\n')
+        fp.write(chunk(b'IHDR', struct.pack('>IIBBBBB', size, size, 8, 6, 0, 0, 0)))
+        fp.write(chunk(b'IDAT', zlib.compress(raw, 6)))
+        fp.write(chunk(b'IEND', b''))
+
+
+class FixtureWriter:
+    def __init__(self, root, config):
+        self.root = root
+        self.config = config
+        self.random = random.Random(config['seed'])
+        self.textures = {}
+        self.written = set()
+        self.next_id = 1
+
+    def texture(self, name):
+        """Relative path of a shared texture, written on first use"""
+        relative = 'textures/' + name + '.png'
+        if relative not in self.textures:
+            path = os.path.join(self.root, relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            color = [self.random.randrange(256) for _ in range(3)] + [255]
+            write_png(path, self.config['texture_size'], color)
+            self.textures[relative] = path
+
+        return relative
+
+    def write_obj(self, path, name, vertex_count, group_count, materials, group_prefix, uv_layers=1):
+        """Write a grid mesh split into group_count groups, cycling through materials"""
+        columns = max(2, int(math.sqrt(vertex_count)))
+        rows = max(2, vertex_count // columns)
+        span = 10.0
+
+        with open(path, 'w', newline='\n') as fp:
+            fp.write('# Exported using wow.export benchmark fixtures\n')
+            fp.write('o ' + name + '\n')
+            fp.write('mtllib ' + os.path.basename(path)[:-4] + '.mtl\n')
+
+            for y in range(rows):
+                for x in range(columns):
+                    fp.write('v %.4f %.4f %.4f\n' % (x * span / columns, math.sin(x * 0.3 + y * 0.2), y * span / rows))
+
+            for y in range(rows):
+                for x in range(columns):
+                    fp.write('vn 0 1 0\n')
+
+            for layer in range(uv_layers):
+                tag = 'vt' if layer == 0 else 'vt' + str(layer + 1)
+                for y in range(rows):
+                    for x in range(columns):
+                        fp.write('%s %.4f %.4f\n' % (tag, x / (columns - 1), y / (rows - 1)))
+
+            quads = [(y * columns + x + 1, y * columns + x + 2, (y + 1) * columns + x + 2, (y + 1) * columns + x + 1) for y in range(rows - 1) for x in range(columns - 1)]
+            per_group = max(1, len(quads) // group_count)
+
+            for group in range(group_count):
+                start = group * per_group
+                end = len(quads) if group == group_count - 1 else min(len(quads), start + per_group)
+                if start >= end:
+                    break
+
+                fp.write('g %s_%03d\n' % (group_prefix, group))
+                fp.write('usemtl %s\n' % materials[group % len(materials)])
+                for a, b, c, d in quads[start:end]:
+                    fp.write('f %d/%d/%d %d/%d/%d %d/%d/%d\n' % (a, a, a, b, b, b, c, c, c))
+                    fp.write('f %d/%d/%d %d/%d/%d %d/%d/%d\n' % (a, a, a, c, c, c, d, d, d))
+
+    def write_mtl(self, path, materials):
+        with open(path, 'w', newline='\n') as fp:
+            for material in materials:
+                fp.write('newmtl %s\n' % material)
+                fp.write('illum 1\n')
+                fp.write('map_Kd %s\n' % self.materials_dir(path, material))
+
+    def materials_dir(self, mtl_path, material):
+        target = os.path.join(self.root, self.texture(material))
+        return os.path.relpath(target, os.path.dirname(mtl_path)).replace(os.sep, '/')
+
+    def model(self, kind, index, depth):
+        """Write an M2 or WMO export and any nested placements, returning its path relative to root"""
+        config = self.config
+        name = '%s_%03d_d%d' % (kind, index, depth)
+        relative = 'world/%s/%s.obj' % (kind, name)
+        path = os.path.join(self.root, relative)
+
+        if relative in self.written:
+            return relative
+
+        self.written.add(relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        prefix = 'root_' if depth == 0 else 'model_'
+        material_count = config[prefix + 'materials']
+        group_count = config[prefix + 'groups']
+        materials = ['%s_mat_%d' % (name, i) for i in range(material_count)]
+        group_prefix = 'Geoset' if kind == 'm2' else 'group'
+
+        self.write_obj(path, name, config[prefix + 'vertices'], group_count, materials, group_prefix)
+        self.write_mtl(path[:-4] + '.mtl', materials)
+
+        if kind == 'm2':
+            info = {
+                'fileType': 'm2',
+                'skin': {'textureUnits': [{
+                    'skinSectionIndex': i,
+                    'materialIndex': i % material_count,
+                    'shaderID': 0,
+                    'textureCount': 1,
+                    'textureComboIndex': i % material_count,
+                    'textureTransformComboIndex': -1
+                } for i in range(group_count)]},
+                'materials': [{'flags': 0, 'blendingMode': i % 2} for i in range(material_count)],
+                'textures': [{'fileNameExternal': self.materials_dir(path, material)} for material in materials],
+                'textureCombos': list(range(material_count))
+            }
+        else:
+            base_id = self.next_id
+            self.next_id += material_count
+            info = {
+                'fileType': 'wmo',
+                'textures': [{'fileDataID': base_id + i, 'mtlName': material, 'fileNameExternal': self.materials_dir(path, material)} for i, material in enumerate(materials)],
+                'materials': [{'shader': 0, 'texture1': base_id + i, 'blendMode': 0} for i in range(material_count)]
+            }
+
+        with open(path[:-4] + '.json', 'w') as fp:
+            json.dump(info, fp)
+
+        # WMOs place their doodad sets, deeper levels keep nesting the same way
+        if kind == 'wmo' and depth < config['nesting_depth']:
+            self.write_set_placements(path, depth + 1)
+
+        return relative
+
+    def write_set_placements(self, path, depth):
+        config = self.config
+        rows = []
+        for row in range(config['nested_rows']):
+            kind = 'wmo' if depth < config['nesting_depth'] and row == 0 else 'm2'
+            modelPath = os.path.join(self.root, self.model(kind, row % config['nested_unique'], depth))
+            w, x, y, z = self.quaternion()
+            rows.append({
+                'ModelFile': os.path.relpath(modelPath, os.path.dirname(path)).replace(os.sep, '/'),
+                'PositionX': self.random.uniform(-50, 50),
+                'PositionY': self.random.uniform(-50, 50),
+                'PositionZ': self.random.uniform(0, 20),
+                'RotationW': w, 'RotationX': x, 'RotationY': y, 'RotationZ': z,
+                'ScaleFactor': 1,
+                'DoodadSet': 'Set_$DefaultGlobal' if row % 3 else 'Set_Extra',
+                'FileDataID': 0
+            })
+
+        write_csv(path[:-4] + '_ModelPlacementInformation.csv', WMO_FIELDS, rows)
+
+    def quaternion(self):
+        angle = self.random.uniform(0, math.tau)
+        return math.cos(angle / 2), 0.0, 0.0, math.sin(angle / 2)
+
+    def tile(self, tile_x, tile_y):
+        config = self.config
+        tile_id = '%d_%d' % (tile_x, tile_y)
+        path = os.path.join(self.root, 'adt_%s.obj' % tile_id)
+
+        materials = ['tex_%s_%d' % (tile_id, i) for i in range(config['terrain_materials'])]
+        self.write_obj(path, 'adt_' + tile_id, config['terrain_vertices'], config['terrain_groups'], materials, 'chunk')
+        self.write_mtl(path[:-4] + '.mtl', materials)
+
+        origin_x = MAX_SIZE - tile_x * TILE_SIZE
+        origin_z = MAX_SIZE - tile_y * TILE_SIZE
+        rows = []
+
+        def position():
+            # placement files use map space, see _m2_placement_matrix
+            return tile_x * TILE_SIZE + self.random.uniform(0, TILE_SIZE), self.random.uniform(0, 100), tile_y * TILE_SIZE + self.random.uniform(0, TILE_SIZE)
+
+        for kind, count, unique in (('m2', config['m2_rows'], config['unique_m2']), ('wmo', config['wmo_rows'], config['unique_wmo'])):
+            for row in range(count):
+                modelPath = self.model(kind, row % unique, 1)
+                x, y, z = position()
+                rows.append({
+                    'ModelFile': modelPath,
+                    'PositionX': x, 'PositionY': y, 'PositionZ': z,
+                    'RotationX': self.random.uniform(-5, 5), 'RotationY': self.random.uniform(0, 360), 'RotationZ': self.random.uniform(-5, 5), 'RotationW': 0,
+                    'ScaleFactor': round(self.random.uniform(0.8, 1.2), 3),
+                    'ModelId': self.next_unique_id(),
+                    'Type': kind, 'FileDataID': 0, 'DoodadSetIndexes': 0, 'DoodadSetNames': ''
+                })
+
+        for row in range(config['gobj_rows']):
+            modelPath = self.model('m2', row % config['unique_m2'], 1)
+            w, x, y, z = self.quaternion()
+            rows.append({
+                'ModelFile': modelPath,
+                'PositionX': self.random.uniform(-TILE_SIZE, TILE_SIZE), 'PositionY': self.random.uniform(-TILE_SIZE, TILE_SIZE), 'PositionZ': self.random.uniform(0, 100),
+                'RotationX': x, 'RotationY': y, 'RotationZ': z, 'RotationW': w,
+                'ScaleFactor': 1,
+                'ModelId': self.next_unique_id(),
+                'Type': 'gobj', 'FileDataID': 0, 'DoodadSetIndexes': 0, 'DoodadSetNames': ''
+            })
+
+        if config['nesting_depth'] > 0:
+            write_csv(path[:-4] + '_ModelPlacementInformation.csv', ADT_FIELDS, rows)
+
+        if config['liquid_chunks'] > 0:
+            self.write_liquid(os.path.join(self.root, 'liquid_%s.json' % tile_id), origin_x, origin_z)
+
+        return path
+
+    def next_unique_id(self):
+        self.next_id += 1
+        return self.next_id
+
+    def write_liquid(self, path, origin_x, origin_z):
+        config = self.config
+        size = config['liquid_size']
+        chunks = [None] * 256
+
+        for index in self.random.sample(range(256), min(256, config['liquid_chunks'])):
+            chunk_x = origin_x - (index // 16) * CHUNK_SIZE
+            chunk_y = origin_z - (index % 16) * CHUNK_SIZE
+            height = self.random.uniform(0, 50)
+            center = size / 2
+
+            chunks[index] = {'instances': [{
+                'liquidType': self.random.choice((1, 2, 3, 4, 6)),
+                'width': size,
+                'height': size,
+                'xOffset': 0,
+                'yOffset': 0,
+                'minHeightLevel': height,
+                'maxHeightLevel': height + 1,
+                'vertexData': {'height': [height + self.random.uniform(0, 1) for _ in range((size + 1) * (size + 1))]},
+                'bitmap': [self.random.randrange(256) | 1 for _ in range((size * size + 7) // 8)],
+                'worldPosition': [chunk_y - center * UNIT_SIZE, height, chunk_x - center * UNIT_SIZE],
+                'terrainChunkPosition': [chunk_x, chunk_y, 0]
+            }]}
+
+        with open(path, 'w') as fp:
+            json.dump({'liquidChunks': chunks}, fp)
+
+
+def write_csv(path, fields, rows):
+    with open(path, 'w', newline='\n', encoding='utf-8') as fp:
+        fp.write(';'.join(fields) + '\n')
+        for row in rows:
+            fp.write(';'.join(str(row[field]) for field in fields) + '\n')
+
+
+def generate(name, root, overrides=None):
+    """Write the fixtures of a scenario into root and return the OBJ files to import.
+
+    Existing output is reused when it was generated from the same configuration.
+    """
+    config = scenario_config(name, overrides)
+    stamp = json.dumps({'version': FIXTURE_VERSION, 'config': config}, sort_keys=True)
+    stampPath = os.path.join(root, 'fixture.json')
+    filesPath = os.path.join(root, 'files.json')
+
+    try:
+        with open(stampPath) as fp:
+            if fp.read() == stamp:
+                with open(filesPath) as files:
+                    return [os.path.join(root, f) for f in json.load(files)]
+    except OSError:
+        pass
+
+    os.makedirs(root, exist_ok=True)
+    writer = FixtureWriter(root, config)
+
+    if config['tiles'] > 0:
+        side = math.ceil(math.sqrt(config['tiles']))
+        files = [writer.tile(32 + i % side, 32 + i // side) for i in range(config['tiles'])]
+    else:
+        files = [os.path.join(root, writer.model(config['model_type'], 0, 0))]
+
+    with open(filesPath, 'w') as fp:
+        json.dump([os.path.relpath(f, root) for f in files], fp)
+
+    with open(stampPath, 'w') as fp:
+        fp.write(stamp)
+
+    return files
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3 or sys.argv[1] not in SCENARIOS:
+        print('usage: fixtures.py <%s> <output directory>' % '|'.join(SCENARIOS))
+        sys.exit(2)
+
+    for objectFile in generate(sys.argv[1], sys.argv[2]):
+        print(objectFile)
@@ -0,0 +1,193 @@
+"""Headless benchmarks for the WoW OBJ importer.
+
+Run with Blender in background mode, arguments after -- go to this script:
+
+    blender --background --factory-startup --python run_benchmark.py -- [options]
+
+Every scenario is generated by fixtures.py, imported --repeat times into an
+emptied scene through the import operator and timed. The median of each
+scenario is compared with baseline.json; the script exits with status 1
+when a scenario got slower than the baseline by more than --tolerance.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import bpy
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCHMARK_DIR)
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+import fixtures
+import io_scene_wowobj
+
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+DEFAULT_WORK_DIR = os.path.join(tempfile.gettempdir(), 'wowobj-benchmark')
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    parser = argparse.ArgumentParser(prog='run_benchmark.py', description='Time the WoW OBJ importer on synthetic exports')
+    parser.add_argument('--scenario', action='append', choices=sorted(fixtures.SCENARIOS), help='scenario to run, may be repeated (default: all)')
+    parser.add_argument('--repeat', type=int, default=3, help='timed imports per scenario')
+    parser.add_argument('--warmup', type=int, default=1, help='untimed imports per scenario, to fill OS file caches')
+    parser.add_argument('--set', action='append', default=[], metavar='OPTION=VALUE', help='import operator option, e.g. instancingMode=POINTS')
+    parser.add_argument('--fixture', action='append', default=[], metavar='KEY=VALUE', help='override a fixture setting of every scenario, e.g. m2_rows=5000')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline to compare against')
+    parser.add_argument('--update-baseline', action='store_true', help='store the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='allowed slowdown against the baseline, as a fraction')
+    parser.add_argument('--work-dir', default=DEFAULT_WORK_DIR, help='directory for fixtures and profiles')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    return parser.parse_args(argv)
+
+
+def parse_assignments(assignments):
+    values = {}
+    for assignment in assignments:
+        key, _, value = assignment.partition('=')
+        try:
+            values[key] = json.loads(value)
+        except ValueError:
+            values[key] = value
+
+    return values
+
+
+def reset_scene():
+    """Remove everything a previous import created, so every run starts from the same state"""
+    for data in (bpy.data.objects, bpy.data.meshes, bpy.data.materials, bpy.data.images, bpy.data.node_groups, bpy.data.collections):
+        bpy.data.batch_remove(list(data))
+
+    scene = bpy.context.scene
+    for key in list(scene.keys()):
+        del scene[key]
+
+
+def run_import(files, options, profilePath):
+    directory = os.path.dirname(files[0])
+    start = time.perf_counter()
+    bpy.ops.import_scene.wowobj(
+        directory=directory,
+        files=[{'name': os.path.relpath(f, directory)} for f in files],
+        enableProfiling=True,
+        profileOutput=profilePath,
+        **options
+    )
+    elapsed = time.perf_counter() - start
+
+    with open(profilePath, encoding='utf-8') as fp:
+        profile = json.load(fp)
+
+    return elapsed, {name: stats['total'] for name, stats in profile['stages'].items()}
+
+
+def run_scenario(name, args, options, overrides):
+    root = os.path.join(args.work_dir, name)
+    start = time.perf_counter()
+    files = fixtures.generate(name, root, overrides)
+    print(f'[benchmark] {name}: fixtures ready in {time.perf_counter() - start:.1f}s')
+
+    profilePath = os.path.join(args.work_dir, f'{name}.profile.json')
+    times = []
+    stages = {}
+
+    for run in range(args.warmup + args.repeat):
+        reset_scene()
+        elapsed, runStages = run_import(files, options, profilePath)
+        if run < args.warmup:
+            continue
+
+        times.append(elapsed)
+        for stage, total in runStages.items():
+            stages.setdefault(stage, []).append(total)
+
+    result = {
+        'median': statistics.median(times),
+        'min': min(times),
+        'runs': times,
+        'stages': {stage: statistics.median(totals) for stage, totals in stages.items()},
+        'objects': len(bpy.data.objects),
+        'meshes': len(bpy.data.meshes),
+        'materials': len(bpy.data.materials),
+        'images': len(bpy.data.images),
+        'options': options,
+        'fixture': fixtures.scenario_config(name, overrides)
+    }
+
+    reset_scene()
+    return result
+
+
+def compare(results, baseline, tolerance):
+    """Print every result against the baseline, returning the names of regressed scenarios"""
+    regressions = []
+    print(f"{'scenario':<18}{'median (s)':>12}{'baseline (s)':>14}{'change':>10}")
+
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None or reference.get('options') != result['options'] or reference.get('fixture') != result['fixture']:
+            print(f"{name:<18}{result['median']:>12.3f}{'-':>14}{'':>10}")
+            continue
+
+        change = result['median'] / reference['median'] - 1
+        flag = ''
+        if change > tolerance:
+            regressions.append(name)
+            flag = '  REGRESSION'
+
+        print(f"{name:<18}{result['median']:>12.3f}{reference['median']:>14.3f}{change:>+10.1%}{flag}")
+
+    return regressions
+
+
+def main():
+    args = parse_args()
+    options = parse_assignments(args.set)
+    overrides = parse_assignments(args.fixture)
+
+    if not hasattr(bpy.types, 'IMPORT_SCENE_OT_wowobj'):
+        io_scene_wowobj.register()
+
+    try:
+        with open(args.baseline, encoding='utf-8') as fp:
+            baseline = json.load(fp)
+    except FileNotFoundError:
+        baseline = {'results': {}}
+
+    results = {}
+    for name in args.scenario or list(fixtures.SCENARIOS):
+        results[name] = run_scenario(name, args, options, overrides)
+
+    regressions = compare(results, baseline.get('results', {}), args.tolerance)
+
+    report = {
+        'addon_version': '.'.join(str(v) for v in io_scene_wowobj.bl_info['version']),
+        'blender_version': bpy.app.version_string,
+        'machine': f'{platform.system()} {platform.machine()} {platform.processor()}'.strip(),
+        'cpu_count': os.cpu_count(),
+        'results': results
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fp:
+            json.dump(report, fp, indent=1)
+
+    if args.update_baseline:
+        baseline.update({key: value for key, value in report.items() if key != 'results'})
+        baseline.setdefault('results', {}).update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as fp:
+            json.dump(baseline, fp, indent=1)
+        print(f'[benchmark] Updated baseline {args.baseline}')
+    elif regressions:
+        print(f"[benchmark] Slower than baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -39,10 +39,19 @@ import bpy
 import bpy.utils.previews
 import os
 import sys
+import time
 
 from bpy_extras.io_utils import (ImportHelper, orientation_helper)
 
 preview_collections = {}
+# import sessions run by modal operators, the auto import waits for them
+_modal_sessions = set()
+
+# modal imports run for this long per timer event before handing control back to Blender
+MODAL_SLICE_SECONDS = 0.1
+MODAL_TIMER_INTERVAL = 0.01
+# seconds between two checks of last_export while auto import is on
+WATCH_INTERVAL = 1.0
 
 
 def get_last_export_path():
@@ -55,12 +64,106 @@ def get_last_export_path():
     else:
         return os.path.expanduser('~/.config/wow.export/last_export')
 
+
+def get_cache_directory(override=''):
+    """Get the directory used for add-on caches, honouring a user override."""
+    if override:
+        return bpy.path.abspath(override)
+
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA', os.path.expanduser('~'))
+        return os.path.join(base, 'wow.export', 'Blender Cache')
+    elif sys.platform == 'darwin':
+        return os.path.expanduser('~/Library/Caches/wow.export')
+    else:
+        return os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'wow.export')
+
+def create_import_session(settings, importFiles, cacheDirectory='', report=None, importPlacements=True, proxies=None):
+    from .import_session import ImportSession
+    metadata = {'addon_version': '.'.join(str(v) for v in bl_info['version'])}
+    return ImportSession(settings, importFiles, get_cache_directory(cacheDirectory), metadata, report, importPlacements, proxies)
+
+
+class ModalImportMixin:
+    """Runs an ImportSession in time slices from a timer, reporting progress.
+
+    Between slices the progress bar and status text are updated and Esc
+    cancels the session, keeping everything imported up to that point.
+    """
+    _session = None
+    _steps = None
+    _timer = None
+
+    def start_session(self, context, session, modal):
+        if not modal or bpy.app.background or context.window is None:
+            session.run()
+            return {'FINISHED'}
+
+        self._session = session
+        self._steps = session.steps()
+        _modal_sessions.add(session)
+
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(MODAL_TIMER_INTERVAL, window=context.window)
+        wm.modal_handler_add(self)
+        wm.progress_begin(0, 100)
+        context.workspace.status_text_set(session.progress.status())
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        session = self._session
+        if event.type == 'ESC' and event.value == 'PRESS':
+            session.cancel()
+        elif event.type != 'TIMER':
+            return {'RUNNING_MODAL'}
+
+        deadline = time.perf_counter() + MODAL_SLICE_SECONDS
+        try:
+            # once cancelled, only the wrap-up of the current file is left
+            while session.cancelled or time.perf_counter() < deadline:
+                next(self._steps)
+        except StopIteration:
+            self._end_modal(context)
+            if session.cancelled:
+                self.report({'WARNING'}, f'Import cancelled, kept {session.progress.models_done} imported models')
+            return {'FINISHED'}
+        except Exception as e:
+            self._end_modal(context)
+            self.report({'ERROR'}, f'Error importing: {e}')
+            return {'CANCELLED'}
+
+        context.window_manager.progress_update(session.progress.fraction() * 100)
+        context.workspace.status_text_set(session.progress.status())
+        return {'RUNNING_MODAL'}
+
+    def cancel(self, context):
+        # Blender ends the operator, e.g. when another file is loaded or the window closes
+        if self._steps is None:
+            return
+
+        try:
+            # runs the clean-up of the session: workers, pending images, caches
+            self._steps.close()
+        except Exception as e:
+            print(f'[WoWOBJ] Error while stopping the import: {e}')
+        self._end_modal(context)
+
+    def _end_modal(self, context):
+        _modal_sessions.discard(self._session)
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+        self._steps = self._timer = None
+
+
 @orientation_helper(axis_forward='-Z', axis_up='Y')
 
 class Settings:
     useAlpha = True
     createVertexGroups = False
     allowDuplicates = False
+    incrementalSync = False
     importWMO = True
     importWMOSets = True
     importM2 = True
@@ -70,12 +173,36 @@ class Settings:
     createEmissiveMaterials = True
     createDoodadSetCollections = False
     importLiquid = True
+    mergeLiquids = True
     importUVAnimations = True
-
-    def __init__(self, useAlpha = True, createVertexGroups = False, allowDuplicates = False, importWMO = True, importWMOSets = True, importM2 = True, importGOBJ = True, importTextures = True, useTerrainBlending = True, createEmissiveMaterials = True, createDoodadSetCollections = False, importLiquid = True, importUVAnimations = True):
+    useParseCache = False
+    parseCacheSize = 1024
+    cacheDirectory = ''
+    instancingMode = 'COPY'
+    useProxies = False
+    shareGeometry = False
+    assetCache = 'NONE'
+    filterMode = 'NONE'
+    filterMin = (0.0, 0.0)
+    filterMax = (0.0, 0.0)
+    filterCentre = (0.0, 0.0)
+    filterRadius = 500.0
+    filterM2Distance = 0.0
+    filterWMODistance = 0.0
+    filterGOBJDistance = 0.0
+    useParallelParsing = False
+    lazyImageLoading = True
+    parallelImageDecode = False
+    textureResolution = 'FULL'
+    enableProfiling = False
+    profileOutput = ''
+    profileFormat = 'JSON'
+
+    def __init__(self, useAlpha = True, createVertexGroups = False, allowDuplicates = False, incrementalSync = False, importWMO = True, importWMOSets = True, importM2 = True, importGOBJ = True, importTextures = True, useTerrainBlending = True, createEmissiveMaterials = True, createDoodadSetCollections = False, importLiquid = True, mergeLiquids = True, importUVAnimations = True, useParseCache = False, parseCacheSize = 1024, cacheDirectory = '', instancingMode = 'COPY', useProxies = False, shareGeometry = False, assetCache = 'NONE', filterMode = 'NONE', filterMin = (0.0, 0.0), filterMax = (0.0, 0.0), filterCentre = (0.0, 0.0), filterRadius = 500.0, filterM2Distance = 0.0, filterWMODistance = 0.0, filterGOBJDistance = 0.0, useParallelParsing = False, lazyImageLoading = True, parallelImageDecode = False, textureResolution = 'FULL', enableProfiling = False, profileOutput = '', profileFormat = 'JSON'):
         self.useAlpha = useAlpha
         self.createVertexGroups = createVertexGroups
         self.allowDuplicates = allowDuplicates
+        self.incrementalSync = incrementalSync
         self.importWMO = importWMO
         self.importWMOSets = importWMOSets
         self.importM2 = importM2
@@ -85,9 +212,32 @@ class Settings:
         self.createEmissiveMaterials = createEmissiveMaterials
         self.createDoodadSetCollections = createDoodadSetCollections
         self.importLiquid = importLiquid
+        self.mergeLiquids = mergeLiquids
         self.importUVAnimations = importUVAnimations
-
-class ImportWoWOBJ(bpy.types.Operator, ImportHelper):
+        self.useParseCache = useParseCache
+        self.parseCacheSize = parseCacheSize
+        self.cacheDirectory = cacheDirectory
+        self.instancingMode = instancingMode
+        self.useProxies = useProxies
+        self.shareGeometry = shareGeometry
+        self.assetCache = assetCache
+        self.filterMode = filterMode
+        self.filterMin = filterMin
+        self.filterMax = filterMax
+        self.filterCentre = filterCentre
+        self.filterRadius = filterRadius
+        self.filterM2Distance = filterM2Distance
+        self.filterWMODistance = filterWMODistance
+        self.filterGOBJDistance = filterGOBJDistance
+        self.useParallelParsing = useParallelParsing
+        self.lazyImageLoading = lazyImageLoading
+        self.parallelImageDecode = parallelImageDecode
+        self.textureResolution = textureResolution
+        self.enableProfiling = enableProfiling
+        self.profileOutput = profileOutput
+        self.profileFormat = profileFormat
+
+class ImportWoWOBJ(ModalImportMixin, bpy.types.Operator, ImportHelper):
     '''Load a Wavefront OBJ File with additional ADT metadata'''
     bl_idname = 'import_scene.wowobj'
     bl_label = 'Import WoW OBJ'
@@ -106,17 +256,90 @@ class ImportWoWOBJ(bpy.types.Operator, ImportHelper):
     useAlpha: bpy.props.BoolProperty(name = 'Use Alpha', description = 'Link alpha channel for materials', default = 1)
     createVertexGroups: bpy.props.BoolProperty(name = 'Create Vertex Groups', description = 'Create vertex groups for submeshes', default = 0)
     allowDuplicates: bpy.props.BoolProperty(name = 'Allow Duplicates (ADT)', description = 'Bypass the duplicate M2/WMO protection for ADT tiles', default = 0)
+    incrementalSync: bpy.props.BoolProperty(name = 'Incremental Sync', description = 'Update files that are already in the scene: rebuild models whose source files changed, add new placements and remove placements that are gone', default = 0)
     useTerrainBlending: bpy.props.BoolProperty(name = 'Use terrain blending', description = 'Blend terrain textures using exported alpha maps', default = 1)
     createEmissiveMaterials: bpy.props.BoolProperty(name = 'Create emissive materials', description = 'When applicable based on the material\'s blending mode. Might be less compatible when exporting to use in other software', default = 1)
     createDoodadSetCollections: bpy.props.BoolProperty(name = 'Create Doodad Set Collections', description = 'If enabled, will create a collection of each doodad set (if available), and move the imported objects into them. Useful for single model imports with many sets.', default = 0)
     importLiquid: bpy.props.BoolProperty(name = 'Import Liquid', description = 'If exported, liquid chunks will be imported as plane geometry', default = 1)
+    mergeLiquids: bpy.props.BoolProperty(name = 'Merge Liquids', description = 'Build one object per liquid type for each tile instead of one object per liquid instance', default = 1)
     importUVAnimations: bpy.props.BoolProperty(name = 'Import UV Animations', description = 'If available in M2 models, UV texture animations will be imported and set up automatically', default = 1)
+    lazyImageLoading: bpy.props.BoolProperty(name = 'Lazy Image Loading', description = 'Leave texture pixels unloaded until they are first displayed or rendered. When disabled, textures are decoded during the import', default = 1)
+    textureResolution: bpy.props.EnumProperty(
+        name = 'Texture Resolution',
+        description = 'Load textures from downscaled copies kept in the cache directory, to save memory while laying out large areas. Use Full Resolution Textures in the sidebar before rendering',
+        items = (
+            ('FULL', 'Full', 'Load the exported textures'),
+            ('HALF', '1/2', 'Load copies at half the width and height'),
+            ('QUARTER', '1/4', 'Load copies at a quarter of the width and height'),
+            ('EIGHTH', '1/8', 'Load copies at an eighth of the width and height'),
+        ),
+        default = 'FULL'
+    )
+    parallelImageDecode: bpy.props.BoolProperty(name = 'Parallel Texture Decode', description = 'Decode exported PNG textures on worker threads during the import and write their pixels into the images, instead of decoding them one by one on the first redraw. Requires numpy', default = 0)
+    instancingMode: bpy.props.EnumProperty(
+        name = 'Placement Instancing',
+        description = 'How repeated placements of the same model are created',
+        items = (
+            ('COPY', 'Copies', 'WMO placements get their own copy of the mesh data, doodads share it'),
+            ('LINKED', 'Linked Duplicates', 'All placements of a model share a single mesh datablock'),
+            ('COLLECTION', 'Collection Instances', 'Placements are empties instancing one collection per model'),
+            ('POINTS', 'Point Instances', 'Placements become points of one geometry nodes instancer per model'),
+            ('MERGE', 'Merged Meshes', 'ADT doodads and game objects are baked into one mesh per tile and material, for static scenes. WMOs are linked duplicates'),
+        ),
+        default = 'COPY'
+    )
+    useProxies: bpy.props.BoolProperty(name = 'Placements as Proxies', description = 'Place a wireframe box around the bounds of each placed model instead of importing it. Only the vertex positions of each model are read, selected proxies can be turned into full models later with Hydrate Proxies', default = 0)
+    shareGeometry: bpy.props.BoolProperty(name = 'Share Identical Geometry', description = 'Models whose exports have identical geometry under different names share one mesh, each object keeps its own materials. Not used together with Incremental Sync', default = 0)
+    assetCache: bpy.props.EnumProperty(
+        name = 'Asset Library',
+        description = 'Keep converted M2 and WMO models in library .blend files in the cache directory, keyed by the content of their exported files, and reuse them in later sessions instead of importing them again',
+        items = (
+            ('NONE', 'Off', 'Import every model from its exported files'),
+            ('LINK', 'Link', 'Link meshes, materials and images from the library, they stay read-only'),
+            ('APPEND', 'Append', 'Append local copies of meshes, materials and images from the library'),
+        ),
+        default = 'NONE'
+    )
+    filterMode: bpy.props.EnumProperty(
+        name = 'Placement Filter',
+        description = 'Only import the ADT placements in part of the map, positions are WoW world coordinates in yards',
+        items = (
+            ('NONE', 'None', 'Import every placement of the tile'),
+            ('REGION', 'Region', 'Placements inside an axis-aligned region'),
+            ('RADIUS', 'Radius', 'Placements within a distance of a point'),
+        ),
+        default = 'NONE'
+    )
+    filterMin: bpy.props.FloatVectorProperty(name = 'Region Min', description = 'Corner of the region with the lowest world X and Y', size = 2, default = (0.0, 0.0))
+    filterMax: bpy.props.FloatVectorProperty(name = 'Region Max', description = 'Corner of the region with the highest world X and Y', size = 2, default = (0.0, 0.0))
+    filterCentre: bpy.props.FloatVectorProperty(name = 'Centre', description = 'World X and Y distances are measured from', size = 2, default = (0.0, 0.0))
+    filterRadius: bpy.props.FloatProperty(name = 'Radius', description = 'Placements further from the centre are skipped', default = 500.0, min = 0.0)
+    filterM2Distance: bpy.props.FloatProperty(name = 'M2 Distance', description = 'Skip M2 placements further than this from the centre of the filter, 0 for no extra limit', default = 0.0, min = 0.0)
+    filterWMODistance: bpy.props.FloatProperty(name = 'WMO Distance', description = 'Skip WMO placements further than this from the centre of the filter, 0 for no extra limit', default = 0.0, min = 0.0)
+    filterGOBJDistance: bpy.props.FloatProperty(name = 'GOBJ Distance', description = 'Skip GOBJ placements further than this from the centre of the filter, 0 for no extra limit', default = 0.0, min = 0.0)
+    useParallelParsing: bpy.props.BoolProperty(name = 'Parallel Parsing', description = 'Read and parse the next tile and the models it places on worker threads while the current one is being built. Only faster when the exported files are on slow storage, such as a network share', default = 0)
+    useParseCache: bpy.props.BoolProperty(name = 'Use Parse Cache', description = 'Store parsed OBJ, MTL and JSON data in a binary cache so repeated imports of unchanged files skip parsing', default = 0)
+    parseCacheSize: bpy.props.IntProperty(name = 'Parse Cache Size (MB)', description = 'Least recently used cache entries are removed once the cache grows past this size', default = 1024, min = 16)
+    enableProfiling: bpy.props.BoolProperty(name = 'Profile Import', description = 'Record time, calls and bytes for each import stage and print a summary to the console', default = 0)
+    profileOutput: bpy.props.StringProperty(name = 'Profile Output', description = 'Optional file to write the recorded profile to', default = '', subtype = 'FILE_PATH')
+    profileFormat: bpy.props.EnumProperty(
+        name = 'Profile Format',
+        description = 'Format of the profile output file',
+        items = (
+            ('JSON', 'JSON', 'Stage totals, per-model timings and all recorded events'),
+            ('CHROME', 'Chrome Trace', 'Trace events for chrome://tracing or Perfetto'),
+        ),
+        default = 'JSON'
+    )
+    modalImport: bpy.props.BoolProperty(name = 'Show Progress', description = 'Import in small steps while showing progress in the status bar. Esc cancels and keeps what was imported so far. Scripted imports always run to completion', default = 1)
+    cacheDirectory: bpy.props.StringProperty(name = 'Cache Directory', description = 'Directory for add-on caches. Leave empty to use the default location', default = '', subtype = 'DIR_PATH')
 
     def execute(self, context):
         settings = Settings(
             useAlpha = self.useAlpha,
             createVertexGroups = self.createVertexGroups,
             allowDuplicates = self.allowDuplicates,
+            incrementalSync = self.incrementalSync,
             importWMO = self.importWMO,
             importWMOSets = self.importWMOSets,
             importM2 = self.importM2,
@@ -126,19 +349,42 @@ class ImportWoWOBJ(bpy.types.Operator, ImportHelper):
             createEmissiveMaterials = self.createEmissiveMaterials,
             createDoodadSetCollections = self.createDoodadSetCollections,
             importLiquid = self.importLiquid,
-            importUVAnimations = self.importUVAnimations
+            mergeLiquids = self.mergeLiquids,
+            importUVAnimations = self.importUVAnimations,
+            useParseCache = self.useParseCache,
+            parseCacheSize = self.parseCacheSize,
+            cacheDirectory = self.cacheDirectory,
+            instancingMode = self.instancingMode,
+            useProxies = self.useProxies,
+            shareGeometry = self.shareGeometry,
+            assetCache = self.assetCache,
+            filterMode = self.filterMode,
+            filterMin = tuple(self.filterMin),
+            filterMax = tuple(self.filterMax),
+            filterCentre = tuple(self.filterCentre),
+            filterRadius = self.filterRadius,
+            filterM2Distance = self.filterM2Distance,
+            filterWMODistance = self.filterWMODistance,
+            filterGOBJDistance = self.filterGOBJDistance,
+            useParallelParsing = self.useParallelParsing,
+            lazyImageLoading = self.lazyImageLoading,
+            parallelImageDecode = self.parallelImageDecode,
+            textureResolution = self.textureResolution,
+            enableProfiling = self.enableProfiling,
+            profileOutput = self.profileOutput,
+            profileFormat = self.profileFormat
         )
-        settings._import_cache_cleared = False
 
-        from . import import_wowobj
         if self.files:
-            for importFile in self.files:
-                import_wowobj.importWoWOBJAddon(os.path.join(self.directory, importFile.name), settings)
+            importFiles = [os.path.join(self.directory, importFile.name) for importFile in self.files]
         elif self.filepath:
             # Backwards compatibility for old API for custom tooling.
-            import_wowobj.importWoWOBJAddon(self.filepath, settings)
+            importFiles = [self.filepath]
+        else:
+            importFiles = []
 
-        return {'FINISHED'}
+        session = create_import_session(settings, importFiles, self.cacheDirectory, self.report)
+        return self.start_session(context, session, self.modalImport and self.options.is_invoke)
 
     def draw(self, context):
         layout = self.layout
@@ -155,10 +401,47 @@ class ImportWoWOBJ(bpy.types.Operator, ImportHelper):
         box.prop(self, 'useAlpha')
         box.prop(self, 'createVertexGroups')
         box.prop(self, 'allowDuplicates')
+        box.prop(self, 'incrementalSync')
         box.prop(self, 'useTerrainBlending')
         box.prop(self, 'createEmissiveMaterials')
         box.prop(self, 'createDoodadSetCollections')
         box.prop(self, 'importLiquid')
+        if self.importLiquid:
+            box.prop(self, 'mergeLiquids')
+        box.prop(self, 'lazyImageLoading')
+        box.prop(self, 'parallelImageDecode')
+        box.prop(self, 'textureResolution')
+        box.prop(self, 'instancingMode')
+        box.prop(self, 'useProxies')
+        box.prop(self, 'shareGeometry')
+
+        box = layout.box()
+        box.prop(self, 'filterMode')
+        if self.filterMode == 'REGION':
+            box.prop(self, 'filterMin')
+            box.prop(self, 'filterMax')
+        elif self.filterMode == 'RADIUS':
+            box.prop(self, 'filterCentre')
+            box.prop(self, 'filterRadius')
+        if self.filterMode != 'NONE':
+            box.prop(self, 'filterM2Distance')
+            box.prop(self, 'filterWMODistance')
+            box.prop(self, 'filterGOBJDistance')
+
+        box = layout.box()
+        box.prop(self, 'modalImport')
+        box.prop(self, 'useParallelParsing')
+        box.prop(self, 'useParseCache')
+        if self.useParseCache:
+            box.prop(self, 'parseCacheSize')
+        box.prop(self, 'assetCache')
+        box.prop(self, 'cacheDirectory')
+
+        box = layout.box()
+        box.prop(self, 'enableProfiling')
+        if self.enableProfiling:
+            box.prop(self, 'profileOutput')
+            box.prop(self, 'profileFormat')
 
 def menu_func_import(self, context):
     self.layout.operator(ImportWoWOBJ.bl_idname, text='WoW Object (.obj)')
@@ -175,7 +458,7 @@ class WOWEXPORT_OT_import_dialog(bpy.types.Operator):
         return {'FINISHED'}
 
 
-class WOWEXPORT_OT_import_last_export(bpy.types.Operator):
+class WOWEXPORT_OT_import_last_export(ModalImportMixin, bpy.types.Operator):
     """Import models from the last wow.export session"""
     bl_idname = 'wowexport.import_last_export'
     bl_label = 'Import Last Export'
@@ -188,68 +471,23 @@ class WOWEXPORT_OT_import_last_export(bpy.types.Operator):
             self.report({'ERROR'}, f'Export file not found: {export_file}')
             return {'CANCELLED'}
 
-        # prefixes mapped to import handlers
-        obj_prefixes = ('M2_OBJ:', 'M3_OBJ:', 'WMO_OBJ:', 'ADT_OBJ:')
-        gltf_prefixes = ('M2_GLTF:', 'M2_GLB:', 'M3_GLTF:', 'M3_GLB:', 'WMO_GLTF:', 'WMO_GLB:')
-        stl_prefixes = ('M2_STL:', 'M3_STL:', 'WMO_STL:')
-
-        imported_count = 0
-
         try:
             with open(export_file, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    matched = False
-
-                    # obj imports using our custom importer
-                    for prefix in obj_prefixes:
-                        if line.startswith(prefix):
-                            file_path = line[len(prefix):]
-                            if os.path.exists(file_path):
-                                bpy.ops.import_scene.wowobj(filepath=file_path)
-                                imported_count += 1
-                            else:
-                                self.report({'WARNING'}, f'File not found: {file_path}')
-                            matched = True
-                            break
-
-                    if matched:
-                        continue
-
-                    # gltf imports using blender's importer
-                    for prefix in gltf_prefixes:
-                        if line.startswith(prefix):
-                            file_path = line[len(prefix):]
-                            if os.path.exists(file_path):
-                                bpy.ops.import_scene.gltf(filepath=file_path)
-                                imported_count += 1
-                            else:
-                                self.report({'WARNING'}, f'File not found: {file_path}')
-                            matched = True
-                            break
-
-                    if matched:
-                        continue
-
-                    # stl imports using blender's importer
-                    for prefix in stl_prefixes:
-                        if line.startswith(prefix):
-                            file_path = line[len(prefix):]
-                            if os.path.exists(file_path):
-                                bpy.ops.import_mesh.stl(filepath=file_path)
-                                imported_count += 1
-                            else:
-                                self.report({'WARNING'}, f'File not found: {file_path}')
-                            break
+                lines = [line.strip() for line in f]
+
+            obj_files, imported_count = import_export_lines(lines, self.report)
 
+            # OBJ files are reported by their import session once it is done
             if imported_count > 0:
-                self.report({'INFO'}, f'Imported {imported_count} object(s)')
-            else:
+                self.report({'INFO'}, f'Imported {imported_count} glTF/STL file(s)')
+            elif not obj_files:
                 self.report({'WARNING'}, 'No importable objects found in last export')
 
+            if obj_files:
+                settings = Settings(incrementalSync = context.scene.wowexport_incremental_sync)
+                session = create_import_session(settings, obj_files, report=self.report)
+                return self.start_session(context, session, self.options.is_invoke)
+
             return {'FINISHED'}
 
         except Exception as e:
@@ -257,6 +495,242 @@ class WOWEXPORT_OT_import_last_export(bpy.types.Operator):
             return {'CANCELLED'}
 
 
+class WOWEXPORT_OT_hydrate_proxies(ModalImportMixin, bpy.types.Operator):
+    """Replace the selected placement proxies with the full models they stand in for"""
+    bl_idname = 'wowexport.hydrate_proxies'
+    bl_label = 'Hydrate Proxies'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        from .import_wowobj import PROXY_PROP
+        return any(PROXY_PROP in obj for obj in context.selected_objects)
+
+    def execute(self, context):
+        from . import import_wowobj
+        proxies = [obj for obj in context.selected_objects if import_wowobj.PROXY_PROP in obj]
+
+        try:
+            # each proxy brings the options it was placed with
+            session = create_import_session(Settings(), [], report=self.report, proxies=proxies)
+            return self.start_session(context, session, self.options.is_invoke)
+        except Exception as e:
+            self.report({'ERROR'}, f'Error hydrating proxies: {e}')
+            return {'CANCELLED'}
+
+
+class WOWEXPORT_OT_texture_resolution(bpy.types.Operator):
+    """Switch the textures imported from downscaled copies between the copies and the full resolution files"""
+    bl_idname = 'wowexport.texture_resolution'
+    bl_label = 'Texture Resolution'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    full: bpy.props.BoolProperty(name = 'Full Resolution', description = 'Use the exported textures instead of the downscaled copies', default = True)
+
+    def execute(self, context):
+        from .texture_proxy import swap_texture_resolution
+        swapped = swap_texture_resolution(self.full)
+        self.report({'INFO'}, f"Switched {swapped} texture(s) to {'full resolution' if self.full else 'downscaled copies'}")
+        return {'FINISHED'}
+
+
+class WOWEXPORT_OT_prune_asset_cache(bpy.types.Operator):
+    """Remove asset library entries whose exported files changed or are gone, and library files without an entry"""
+    bl_idname = 'wowexport.prune_asset_cache'
+    bl_label = 'Prune Asset Library'
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        from .asset_cache import AssetCache
+        assetCache = AssetCache(os.path.join(get_cache_directory(), 'assets'))
+        removed = assetCache.prune()
+        self.report({'INFO'}, f'Removed {removed} asset library file(s), {len(assetCache.entries)} entries left')
+        return {'FINISHED'}
+
+
+class WOWEXPORT_OT_rebuild_asset_cache(bpy.types.Operator):
+    """Import the models of stale asset library entries again with their original settings and store the results"""
+    bl_idname = 'wowexport.rebuild_asset_cache'
+    bl_label = 'Rebuild Stale Assets'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        from .asset_cache import AssetCache
+        cacheDirectory = get_cache_directory()
+        assetCache = AssetCache(os.path.join(cacheDirectory, 'assets'))
+
+        # one session per combination of settings
+        batches = {}
+        for key, entry in assetCache.stale():
+            options = tuple(sorted(entry['settings'].items()))
+            batches.setdefault(options, []).append(entry['path'])
+
+        rebuilt = 0
+        try:
+            for options, paths in batches.items():
+                settings = Settings(importLiquid = False, assetCache = 'APPEND', **dict(options))
+                session = create_import_session(settings, paths, report=self.report, importPlacements=False)
+                session.run()
+                rebuilt += settings._asset_cache.stored
+
+                # the library holds them now, the scene doesn't need them
+                for obj in session.objects:
+                    mesh = obj.data
+                    bpy.data.objects.remove(obj)
+                    if mesh is not None and mesh.users == 0:
+                        bpy.data.meshes.remove(mesh)
+        except Exception as e:
+            self.report({'ERROR'}, f'Error rebuilding assets: {e}')
+            return {'CANCELLED'}
+
+        # the entries of the old files are stale now
+        AssetCache(os.path.join(cacheDirectory, 'assets')).prune()
+        self.report({'INFO'}, f'Rebuilt {rebuilt} of {sum(len(paths) for paths in batches.values())} stale asset(s)')
+        return {'FINISHED'}
+
+
+def import_export_lines(lines, report):
+    """Import the files listed in last_export lines.
+
+    glTF and STL files go through Blender's importers right away, OBJ files
+    are returned to be imported together as one session. Returns the OBJ
+    files and the number of glTF and STL files imported.
+    """
+    # prefixes mapped to import handlers
+    obj_prefixes = ('M2_OBJ:', 'M3_OBJ:', 'WMO_OBJ:', 'ADT_OBJ:')
+    gltf_prefixes = ('M2_GLTF:', 'M2_GLB:', 'M3_GLTF:', 'M3_GLB:', 'WMO_GLTF:', 'WMO_GLB:')
+    stl_prefixes = ('M2_STL:', 'M3_STL:', 'WMO_STL:')
+
+    imported_count = 0
+    obj_files = []
+
+    for line in lines:
+        if not line:
+            continue
+
+        matched = False
+
+        # obj imports using our custom importer
+        for prefix in obj_prefixes:
+            if line.startswith(prefix):
+                file_path = line[len(prefix):]
+                if os.path.exists(file_path):
+                    # imported together after the loop, as one session
+                    obj_files.append(file_path)
+                else:
+                    report({'WARNING'}, f'File not found: {file_path}')
+                matched = True
+                break
+
+        if matched:
+            continue
+
+        # gltf imports using blender's importer
+        for prefix in gltf_prefixes:
+            if line.startswith(prefix):
+                file_path = line[len(prefix):]
+                if os.path.exists(file_path):
+                    bpy.ops.import_scene.gltf(filepath=file_path)
+                    imported_count += 1
+                else:
+                    report({'WARNING'}, f'File not found: {file_path}')
+                matched = True
+                break
+
+        if matched:
+            continue
+
+        # stl imports using blender's importer
+        for prefix in stl_prefixes:
+            if line.startswith(prefix):
+                file_path = line[len(prefix):]
+                if os.path.exists(file_path):
+                    bpy.ops.import_mesh.stl(filepath=file_path)
+                    imported_count += 1
+                else:
+                    report({'WARNING'}, f'File not found: {file_path}')
+                break
+
+    return obj_files, imported_count
+
+
+def _report_to_console(level, message):
+    print(f"[WoWOBJ] {', '.join(sorted(level))}: {message}")
+
+
+# state of the auto import watcher, driven by _watch_last_export
+_export_watcher = None
+_watch_steps = None
+
+
+def _watch_last_export():
+    """Timer polling last_export, importing appended lines a slice at a time"""
+    global _watch_steps
+
+    if _watch_steps is not None:
+        # an auto import is running, continue it even if the watcher was switched off
+        deadline = time.perf_counter() + MODAL_SLICE_SECONDS
+        try:
+            while time.perf_counter() < deadline:
+                next(_watch_steps)
+            return MODAL_TIMER_INTERVAL
+        except StopIteration:
+            _watch_steps = None
+            print('[WoWOBJ] Auto import finished')
+            try:
+                bpy.ops.ed.undo_push(message='Auto Import Last Export')
+            except RuntimeError:
+                pass
+        except Exception as e:
+            _watch_steps = None
+            print(f'[WoWOBJ] Auto import failed: {e}')
+
+    if _export_watcher is None or not bpy.context.window_manager.wowexport_watch_last_export:
+        return None
+
+    if _modal_sessions:
+        # new exports wait for the running import, last_export is read once it is done
+        return WATCH_INTERVAL
+
+    lines = _export_watcher.poll()
+    if lines:
+        print(f'[WoWOBJ] {len(lines)} new line(s) in last_export')
+        try:
+            obj_files, imported_count = import_export_lines(lines, _report_to_console)
+        except Exception as e:
+            print(f'[WoWOBJ] Auto import failed: {e}')
+            obj_files = []
+
+        if obj_files:
+            settings = Settings(incrementalSync = bpy.context.scene.wowexport_incremental_sync)
+            _watch_steps = create_import_session(settings, obj_files, report=_report_to_console).steps()
+            return MODAL_TIMER_INTERVAL
+
+    return WATCH_INTERVAL
+
+
+@bpy.app.handlers.persistent
+def _restore_decoded_images(*args):
+    from .image_registry import restore_decoded_images
+    restore_decoded_images()
+
+
+def _toggle_export_watcher(self, context):
+    global _export_watcher, _watch_steps
+
+    if self.wowexport_watch_last_export:
+        from .export_watcher import ExportWatcher
+        # only exports made from now on are imported
+        _export_watcher = ExportWatcher(get_last_export_path())
+        _export_watcher.skip_existing()
+        if not bpy.app.timers.is_registered(_watch_last_export):
+            # the timer stops when another file is loaded, along with any import it was running
+            _watch_steps = None
+            bpy.app.timers.register(_watch_last_export, first_interval=WATCH_INTERVAL)
+    else:
+        _export_watcher = None
+
+
 class WOWEXPORT_PT_sidebar_panel(bpy.types.Panel):
     """wow.export tools panel in the 3D viewport sidebar"""
     bl_label = 'wow.export'
@@ -277,12 +751,27 @@ class WOWEXPORT_PT_sidebar_panel(bpy.types.Panel):
 
         layout.operator('wowexport.import_dialog')
         layout.operator('wowexport.import_last_export')
+        layout.prop(context.scene, 'wowexport_incremental_sync')
+        layout.prop(context.window_manager, 'wowexport_watch_last_export')
+        if _watch_steps is not None:
+            layout.label(text='Importing new export...', icon='TIME')
+        layout.operator('wowexport.hydrate_proxies')
+        row = layout.row(align=True)
+        row.operator('wowexport.texture_resolution', text='Full Resolution Textures').full = True
+        row.operator('wowexport.texture_resolution', text='Proxy Textures').full = False
+        row = layout.row(align=True)
+        row.operator('wowexport.prune_asset_cache', text='Prune Assets')
+        row.operator('wowexport.rebuild_asset_cache', text='Rebuild Assets')
 
 
 classes = (
     ImportWoWOBJ,
     WOWEXPORT_OT_import_dialog,
     WOWEXPORT_OT_import_last_export,
+    WOWEXPORT_OT_hydrate_proxies,
+    WOWEXPORT_OT_texture_resolution,
+    WOWEXPORT_OT_prune_asset_cache,
+    WOWEXPORT_OT_rebuild_asset_cache,
     WOWEXPORT_PT_sidebar_panel,
 )
 
@@ -292,6 +781,21 @@ def register():
     for cls in classes:
         register_class(cls)
     bpy.types.TOPBAR_MT_file_import.append(menu_func_import)
+    bpy.app.handlers.load_post.append(_restore_decoded_images)
+    # saved files reference the image files, not pixels only this session has
+    bpy.app.handlers.save_pre.append(_restore_decoded_images)
+
+    bpy.types.Scene.wowexport_incremental_sync = bpy.props.BoolProperty(
+        name = 'Incremental Sync',
+        description = 'Import Last Export updates files already in the scene instead of importing them again',
+        default = False
+    )
+    bpy.types.WindowManager.wowexport_watch_last_export = bpy.props.BoolProperty(
+        name = 'Auto Import',
+        description = 'Watch the last_export file of wow.export and import new exports as they are written',
+        default = False,
+        update = _toggle_export_watcher
+    )
 
     pcoll = bpy.utils.previews.new()
     logo_path = os.path.join(os.path.dirname(__file__), 'logo.png')
@@ -303,6 +807,17 @@ def register():
 def unregister():
     from bpy.utils import unregister_class
     bpy.types.TOPBAR_MT_file_import.remove(menu_func_import)
+    if _restore_decoded_images in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_restore_decoded_images)
+    if _restore_decoded_images in bpy.app.handlers.save_pre:
+        bpy.app.handlers.save_pre.remove(_restore_decoded_images)
+    del bpy.types.Scene.wowexport_incremental_sync
+
+    global _export_watcher, _watch_steps
+    _export_watcher = _watch_steps = None
+    if bpy.app.timers.is_registered(_watch_last_export):
+        bpy.app.timers.unregister(_watch_last_export)
+    del bpy.types.WindowManager.wowexport_watch_last_export
     for cls in reversed(classes):
         unregister_class(cls)
 
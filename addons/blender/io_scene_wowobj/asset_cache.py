@@ -0,0 +1,277 @@
+import hashlib
+import json
+import os
+import time
+
+import bpy
+from mathutils import Matrix
+
+from .image_registry import decoded_as_files
+from .model_loader import get_json_path, stat_sources
+from .obj_parser import read_mtllib
+from .source_sync import SOURCE_PROP, SourceSync, _signature
+
+ASSET_VERSION = 1
+INDEX_NAME = 'index.json'
+
+# settings that change the datablocks built for a model, part of every key
+ASSET_SETTINGS = ('useAlpha', 'importTextures', 'importUVAnimations', 'useTerrainBlending', 'createEmissiveMaterials', 'createVertexGroups', 'textureResolution')
+
+
+def model_sources(objectFile):
+    """stat_sources of the files an OBJ export is built from, without parsing it"""
+    baseDir = os.path.dirname(objectFile)
+    mtllib = read_mtllib(objectFile)
+    mtlPath = os.path.join(baseDir, mtllib) if mtllib else None
+    return stat_sources([p for p in (objectFile, mtlPath, get_json_path(objectFile)) if p])
+
+
+class AssetCache:
+    """Imported models kept in library .blend files across sessions.
+
+    Every entry is one .blend in directory holding the object, mesh,
+    materials and images built for a model, keyed by the content hash of
+    its source files (see SourceSync) and the settings in ASSET_SETTINGS.
+    index.json maps keys to their file, source record and settings. load()
+    links or appends an entry depending on mode. queue() marks a freshly
+    built model and write_pending() stores the queue once its images are
+    loaded, at the end of an import session.
+    """
+    def __init__(self, directory, mode='APPEND'):
+        self.directory = directory
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self._removed = set()
+        self._pending = []
+        self._dirty = False
+        self.entries = self._read_index()
+
+    @property
+    def index_path(self):
+        return os.path.join(self.directory, INDEX_NAME)
+
+    def _read_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as fp:
+                stored = json.load(fp)
+            if stored.get('version') == ASSET_VERSION:
+                return stored.get('assets', {})
+        except (OSError, ValueError) as e:
+            print(f'[WoWOBJ] Ignoring unreadable asset library index {self.index_path}: {e}')
+
+        return {}
+
+    def key(self, record, settings):
+        options = {name: getattr(settings, name) for name in ASSET_SETTINGS}
+        payload = json.dumps([ASSET_VERSION, record['hash'], options], sort_keys=True)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def current_names(self):
+        """Object names of the models whose entries match their files on disk by size and mtime"""
+        names = set()
+        for entry in self.entries.values():
+            source = entry['source']
+            if _signature(source['files'].split('\n')) == (source['size'], source['mtime']):
+                names.add(os.path.basename(entry['path']))
+
+        return names
+
+    def load(self, key, imageRegistry=None, materialCache=None):
+        """Object of the entry for key, linked or appended, None if there is no such entry.
+
+        Materials and images that came with the entry are swapped for the
+        ones already held by materialCache and imageRegistry.
+        """
+        entry = self.entries.get(key)
+        path = os.path.join(self.directory, entry['file']) if entry is not None else None
+        if path is None or not os.path.exists(path):
+            self.misses += 1
+            return None
+
+        link = self.mode == 'LINK'
+        try:
+            with bpy.data.libraries.load(path, link=link) as (dataFrom, dataTo):
+                dataTo.objects = [name for name in dataFrom.objects if name == entry['object']]
+        except OSError as e:
+            print(f'[WoWOBJ] Unable to read asset library {path}: {e}')
+            self.misses += 1
+            return None
+
+        obj = dataTo.objects[0] if dataTo.objects else None
+        if obj is None:
+            self.misses += 1
+            return None
+
+        if link:
+            # a local object over the linked data, so placements can move and copy it
+            linked = obj
+            obj = linked.copy()
+            bpy.data.objects.remove(linked)
+
+        self._share(obj, imageRegistry, materialCache)
+        entry['used'] = time.time()
+        self._dirty = True
+        self.hits += 1
+        return obj
+
+    @staticmethod
+    def _share(obj, imageRegistry, materialCache):
+        for slot in obj.material_slots:
+            material = slot.material
+            if material is None:
+                continue
+
+            shared = materialCache.adopt(material) if materialCache is not None else material
+            if shared != material:
+                if material.library is None:
+                    material.user_remap(shared)
+                    bpy.data.materials.remove(material)
+                else:
+                    # linked meshes can't be changed, the local object holds the material instead
+                    slot.link = 'OBJECT'
+                    slot.material = shared
+                continue
+
+            if imageRegistry is None or material.library is not None or material.node_tree is None:
+                continue
+
+            for node in material.node_tree.nodes:
+                image = getattr(node, 'image', None)
+                if image is None:
+                    continue
+
+                shared = imageRegistry.adopt(image)
+                if shared != image:
+                    image.user_remap(shared)
+                    if not image.users:
+                        bpy.data.images.remove(image)
+
+    def queue(self, key, obj, objectFile, record, settings):
+        """Store obj under key with the next write_pending()"""
+        options = {name: getattr(settings, name) for name in ASSET_SETTINGS}
+        self._pending.append((key, obj, objectFile, dict(record), options))
+
+    def write_pending(self):
+        """Write the queued models to their library files"""
+        pending = self._pending
+        self._pending = []
+        if not pending:
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        # pixels decoded by the image registry aren't saved, the libraries reference the files
+        with decoded_as_files():
+            self._write(pending)
+
+        self.save()
+
+    def _write(self, pending):
+        for key, obj, objectFile, record, options in pending:
+            try:
+                obj.name
+            except ReferenceError:
+                # removed since it was imported
+                continue
+
+            # a standalone copy, the scene object may have a parent and instance collections
+            copy = obj.copy()
+            copy.parent = None
+            copy.rotation_mode = 'XYZ'
+            copy.matrix_basis = Matrix.Identity(4)
+            for prop in list(copy.keys()):
+                if prop != SOURCE_PROP:
+                    del copy[prop]
+
+            fileName = key + '.blend'
+            path = os.path.join(self.directory, fileName)
+            temp = path + '.tmp'
+            entryObject = copy.name
+            try:
+                bpy.data.libraries.write(temp, {copy}, path_remap='ABSOLUTE', fake_user=True, compress=True)
+                os.replace(temp, path)
+            except (OSError, RuntimeError) as e:
+                print(f'[WoWOBJ] Unable to write asset library {path}: {e}')
+                continue
+            finally:
+                bpy.data.objects.remove(copy)
+
+            self.entries[key] = {
+                'path': objectFile,
+                'file': fileName,
+                'object': entryObject,
+                'source': record,
+                'settings': options,
+                'used': time.time()
+            }
+            self._removed.discard(key)
+            self._dirty = True
+            self.stored += 1
+
+    def remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+
+        try:
+            os.remove(os.path.join(self.directory, entry['file']))
+        except OSError:
+            pass
+
+        self._removed.add(key)
+        self._dirty = True
+
+    def stale(self):
+        """(key, entry) of every entry whose model still exists but changed since it was stored"""
+        sourceSync = SourceSync()
+        return [(key, entry) for key, entry in self.entries.items() if os.path.exists(entry['path']) and not sourceSync.is_current(entry['source'])]
+
+    def prune(self):
+        """Remove stale entries, entries of models that are gone and library files without an entry. Returns the number removed"""
+        removed = [key for key, _ in self.stale()]
+        removed += [key for key, entry in self.entries.items() if not os.path.exists(entry['path']) or not os.path.exists(os.path.join(self.directory, entry['file']))]
+        for key in removed:
+            self.remove(key)
+
+        if os.path.isdir(self.directory):
+            # files other Blender sessions stored and indexed since this index was read are kept
+            entries = self._read_index()
+            entries.update(self.entries)
+            for key in self._removed:
+                entries.pop(key, None)
+            known = {entry['file'] for entry in entries.values()}
+            for fileName in os.listdir(self.directory):
+                if fileName.endswith(('.blend', '.tmp')) and fileName not in known:
+                    try:
+                        os.remove(os.path.join(self.directory, fileName))
+                        removed.append(fileName)
+                    except OSError:
+                        pass
+
+        self.save()
+        return len(set(removed))
+
+    def save(self):
+        if not self._dirty:
+            return
+
+        # other Blender sessions may have stored entries since this index was read
+        assets = self._read_index()
+        assets.update(self.entries)
+        for key in self._removed:
+            assets.pop(key, None)
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temp = self.index_path + '.tmp'
+            with open(temp, 'w', encoding='utf-8') as fp:
+                json.dump({'version': ASSET_VERSION, 'assets': assets}, fp)
+            os.replace(temp, self.index_path)
+            self._dirty = False
+        except OSError as e:
+            print(f'[WoWOBJ] Unable to write asset library index {self.index_path}: {e}')
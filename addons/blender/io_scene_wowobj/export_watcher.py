@@ -0,0 +1,80 @@
+import hashlib
+import os
+
+# bytes at the start of the file compared to tell an append from a new export
+FINGERPRINT_SIZE = 4096
+
+
+class ExportWatcher:
+    """Follows the last_export file of wow.export, returning only lines added since the last poll.
+
+    wow.export truncates the file when an export starts and appends a line
+    as each file of it is written, tiles of a map export often seconds
+    apart, so lines are taken as they complete rather than once per export.
+    poll() is a single stat while the file's size and mtime are unchanged.
+    Once they change it reads from the offset it stopped at, up to the last
+    complete line; a trailing line without a newline is taken once the file
+    stayed the same for one poll. A file that got shorter, whose first bytes
+    differ or that was written again without growing came from a new export
+    and is read from the start.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.fingerprint = None
+        self.signature = None
+        self.partial = False
+
+    def _fingerprint(self, fp):
+        fp.seek(0)
+        return hashlib.sha1(fp.read(min(self.offset, FINGERPRINT_SIZE))).digest()
+
+    def skip_existing(self):
+        """Start following from the current end of the file, ignoring what it holds now"""
+        self.offset = 0
+        self.signature = None
+        self.poll()
+        self.poll()
+
+    def poll(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return []
+
+        signature = (stat.st_size, stat.st_mtime_ns)
+        stable = signature == self.signature
+        self.signature = signature
+        if stable and not self.partial:
+            return []
+
+        try:
+            with open(self.path, 'rb') as fp:
+                return self._read(fp, stat.st_size, stable)
+        except OSError:
+            return []
+
+    def _read(self, fp, size, complete):
+        if self.offset and (size < self.offset or self._fingerprint(fp) != self.fingerprint):
+            self.offset = 0
+
+        fp.seek(self.offset)
+        data = fp.read()
+        if not data and not complete and self.offset:
+            # rewritten with the same lines, which were exported again
+            self.offset = 0
+            fp.seek(0)
+            data = fp.read()
+
+        if not complete:
+            end = data.rfind(b'\n') + 1
+            self.partial = end < len(data)
+            data = data[:end]
+        else:
+            self.partial = False
+
+        self.offset += len(data)
+        self.fingerprint = self._fingerprint(fp)
+
+        lines = data.decode('utf-8', errors='replace').splitlines()
+        return [line.strip() for line in lines if line.strip()]
@@ -0,0 +1,63 @@
+import bpy
+
+# ID property with the geometry fingerprint a mesh was built from and its group layout
+GEOMETRY_PROP = 'wowexport_geometry'
+
+
+class GeometryRegistry:
+    """Imported meshes by the fingerprint of the OBJ geometry they were built from.
+
+    Each mesh records the material slot of every OBJ group and, when it has
+    vertex groups, the OBJ group behind each of them. That is what another
+    export with the same fingerprint needs to reuse the mesh with its own
+    materials and group names. Meshes from earlier sessions are found
+    through their ID property.
+    """
+    def __init__(self):
+        self.shared = 0
+        self._meshes = None
+
+    def _index(self):
+        if self._meshes is None:
+            self._meshes = {}
+            for mesh in bpy.data.meshes:
+                record = mesh.get(GEOMETRY_PROP)
+                if record is not None and mesh.library is None:
+                    self._meshes.setdefault(record.get('fingerprint'), []).append(mesh)
+
+        return self._meshes
+
+    def find(self, fingerprint):
+        """Meshes built from geometry with this fingerprint that are still in use"""
+        if not fingerprint:
+            return []
+
+        meshes = []
+        for mesh in self._index().get(fingerprint, ()):
+            try:
+                if mesh.users:
+                    meshes.append(mesh)
+            except ReferenceError:
+                # removed since, e.g. replaced by an incremental rebuild
+                continue
+
+        return meshes
+
+    def add(self, fingerprint, mesh, group_slots, vertex_groups):
+        """Record mesh as built from fingerprint.
+
+        group_slots holds the material index of every OBJ group, vertex_groups
+        the OBJ group index behind each vertex group of the mesh.
+        """
+        if not fingerprint:
+            return
+
+        record = {'fingerprint': fingerprint}
+        # left out when empty, readers treat a missing list as empty
+        if group_slots:
+            record['group_slots'] = list(group_slots)
+        if vertex_groups:
+            record['vertex_groups'] = list(vertex_groups)
+
+        mesh[GEOMETRY_PROP] = record
+        self._index().setdefault(fingerprint, []).append(mesh)
@@ -0,0 +1,341 @@
+import hashlib
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import bpy
+
+from .png_decoder import DECODE_AVAILABLE, UnsupportedPNG, decode_png
+
+# custom property holding the content hash of images loaded through the registry
+IMAGE_HASH_PROP = 'wowexport_image_hash'
+# custom property holding the source file of images whose pixels were decoded by the registry
+DECODED_PROP = 'wowexport_decoded'
+# custom properties of images loaded from a downscaled copy, the texture file and the copy
+FULL_PATH_PROP = 'wowexport_full_path'
+PROXY_PATH_PROP = 'wowexport_proxy_path'
+HASH_CHUNK_SIZE = 1024 * 1024
+DECODE_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def _image_key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _hash_file(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as fp:
+        for chunk in iter(lambda: fp.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def _source_path(image):
+    path = image.get(FULL_PATH_PROP) or image.get(DECODED_PROP)
+    if path is None and image.source == 'FILE' and image.filepath:
+        path = bpy.path.abspath(image.filepath)
+
+    return path
+
+
+def restore_decoded_images():
+    """Turn images decoded by a registry back into file images, their pixels aren't saved with the .blend"""
+    for image in bpy.data.images:
+        path = image.get(DECODED_PROP)
+        if path is None or image.library is not None:
+            continue
+
+        del image[DECODED_PROP]
+        image.source = 'FILE'
+        image.filepath = path
+
+
+@contextmanager
+def decoded_as_files():
+    """Stand in file images for the decoded images until the block ends, e.g. to write a library.
+
+    Unlike restore_decoded_images(), the decoded pixels are kept: the
+    stand-ins take over the names and users of the decoded images and hand
+    them back afterwards. They aren't read unless something displays them.
+    """
+    swapped = []
+    try:
+        for image in list(bpy.data.images):
+            path = image.get(DECODED_PROP)
+            if path is None or image.library is not None:
+                continue
+
+            try:
+                standIn = bpy.data.images.load(path, check_existing=False)
+            except RuntimeError as e:
+                print(f'[WoWOBJ] Unable to reference image {path}: {e}')
+                continue
+
+            for prop in image.keys():
+                if prop != DECODED_PROP:
+                    standIn[prop] = image[prop]
+            standIn.colorspace_settings.name = image.colorspace_settings.name
+            standIn.alpha_mode = image.alpha_mode
+
+            name = image.name
+            image.name = name + '.decoded'
+            standIn.name = name
+            image.user_remap(standIn)
+            swapped.append((image, standIn, name))
+
+        yield
+    finally:
+        for image, standIn, name in swapped:
+            standIn.user_remap(image)
+            bpy.data.images.remove(standIn)
+            image.name = name
+
+
+class ImageRegistry:
+    """Images used by imported materials, keyed by absolute path and content.
+
+    request() hands out an image right away: an image already loaded from
+    the same file (check_existing semantics), or a 1x1 placeholder that
+    materials can be built against. flush() then loads every pending file
+    in one batch. Files that share their content with an image loaded
+    before are not loaded again; their users are remapped instead. Content
+    hashes are only computed for files whose size matches another file.
+
+    With lazy set, Blender decodes pixels when an image is first displayed
+    or rendered; otherwise flush() decodes them right away. With decode set,
+    flush() hands PNG files to a thread pool instead and their pixels are
+    written into the images as the decodes finish, at a later flush() or
+    at finish(). Those images stay generated for the session and become
+    file images again when the .blend is saved or loaded. With proxies, a
+    TextureProxyCache, images are loaded from a downscaled copy of their
+    file while still being keyed and shared by the full resolution file.
+    """
+    def __init__(self, lazy=True, names=None, decode=False, proxies=None):
+        self.lazy = lazy
+        self.names = names
+        self.decode = decode and DECODE_AVAILABLE
+        self.proxies = proxies
+        self.loaded = 0
+        self.shared = 0
+        self.decoded = 0
+        self.loaded_bytes = 0
+        self._executor = None
+        self._decoding = []
+        self._images = None
+        self._pending = {}
+        self._sizes = defaultdict(list)
+        self._hashes = {}
+        self._by_hash = {}
+
+    def _index(self):
+        if self._images is not None:
+            return self._images
+
+        self._images = {}
+        for image in bpy.data.images:
+            if image.library is not None:
+                continue
+
+            path = _source_path(image)
+            if not path:
+                continue
+
+            key = _image_key(path)
+            if key in self._images:
+                continue
+
+            self._images[key] = image
+            try:
+                self._sizes[os.path.getsize(path)].append(key)
+            except OSError:
+                continue
+
+            digest = image.get(IMAGE_HASH_PROP)
+            if digest:
+                self._hashes[key] = digest
+                self._by_hash.setdefault(digest, image)
+
+        return self._images
+
+    def adopt(self, image):
+        """Return the image already registered for the file of image, or register image for it"""
+        path = _source_path(image)
+        if not path or image.library is not None:
+            return image
+
+        key = _image_key(path)
+        existing = self._get(key)
+        if existing is not None and existing != image and self._compatible(existing, image):
+            self.shared += 1
+            return existing
+
+        if existing is None:
+            self._images[key] = image
+        return image
+
+    def _get(self, key):
+        image = self._index().get(key)
+        if image is None:
+            return None
+
+        try:
+            image.name
+        except ReferenceError:
+            # removed since it was indexed
+            del self._images[key]
+            return None
+
+        return image
+
+    def request(self, path):
+        """Return the image for path, loading it with the next flush() if needed"""
+        key = _image_key(path)
+        image = self._get(key)
+        if image is not None:
+            return image
+
+        if not os.path.isfile(path):
+            raise RuntimeError(f'Cannot read image file {path}')
+
+        name = os.path.splitext(os.path.basename(path))[0]
+        if self.names is not None:
+            image = self.names.new('images', name, 1, 1, alpha=True)
+        else:
+            image = bpy.data.images.new(name, 1, 1, alpha=True)
+        self._images[key] = image
+        self._pending[key] = path
+        return image
+
+    def _register_hashes(self, size):
+        for key in self._sizes[size]:
+            if key in self._hashes:
+                continue
+
+            image = self._get(key)
+            if image is None:
+                continue
+
+            try:
+                digest = _hash_file(_source_path(image))
+            except OSError:
+                continue
+
+            self._hashes[key] = digest
+            self._by_hash.setdefault(digest, image)
+            image[IMAGE_HASH_PROP] = digest
+
+    def flush(self):
+        """Load every image requested since the last flush"""
+        pending = self._pending
+        self._pending = {}
+
+        if self.proxies is not None:
+            # downscaled copies of every file about to be loaded, built in parallel
+            self.proxies.prepare(pending.values())
+
+        for key, path in pending.items():
+            image = self._get(key)
+            if image is None:
+                continue
+
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                size = -1
+
+            canonical = None
+            if size >= 0 and self._sizes[size]:
+                # another file of the same size is known, compare contents
+                self._register_hashes(size)
+                try:
+                    digest = _hash_file(path)
+                except OSError:
+                    digest = None
+
+                if digest is not None:
+                    self._hashes[key] = digest
+                    image[IMAGE_HASH_PROP] = digest
+                    canonical = self._by_hash.setdefault(digest, image)
+
+            if canonical is not None and canonical != image and self._compatible(canonical, image):
+                image.user_remap(canonical)
+                bpy.data.images.remove(image)
+                self._images[key] = canonical
+                self.shared += 1
+                continue
+
+            if size >= 0:
+                self._sizes[size].append(key)
+                self.loaded_bytes += size
+            self.loaded += 1
+
+            load_path = path
+            if self.proxies is not None:
+                load_path = self.proxies.get(path) or path
+                if load_path != path:
+                    image[FULL_PATH_PROP] = path
+                    image[PROXY_PATH_PROP] = load_path
+
+            if self.decode and load_path.lower().endswith('.png'):
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=DECODE_WORKERS, thread_name_prefix='wowobj-decode')
+                image[DECODED_PROP] = load_path
+                self._decoding.append((image, load_path, self._executor.submit(decode_png, load_path)))
+                continue
+
+            self._load_file(image, load_path)
+
+        self._apply_decoded(False)
+
+    def _load_file(self, image, path):
+        image.source = 'FILE'
+        image.filepath = path
+
+        if not self.lazy and image.size[0] == 0:
+            # reading the size decodes the file
+            print(f'[WoWOBJ] Unable to decode image {path}')
+
+    def _apply_decoded(self, wait):
+        pending = []
+        for image, path, future in self._decoding:
+            if not wait and not future.done():
+                pending.append((image, path, future))
+                continue
+
+            try:
+                if DECODED_PROP not in image:
+                    # made a file image again, e.g. by saving the .blend
+                    continue
+            except ReferenceError:
+                continue
+
+            try:
+                width, height, pixels = future.result()
+            except (OSError, UnsupportedPNG) as e:
+                # left to Blender, which reads more formats
+                print(f'[WoWOBJ] Loading {path} through Blender: {e}')
+                del image[DECODED_PROP]
+                self._load_file(image, path)
+                continue
+
+            if tuple(image.size) != (width, height):
+                image.scale(width, height)
+            image.pixels.foreach_set(pixels)
+            self.decoded += 1
+
+        self._decoding = pending
+
+    def finish(self):
+        """Wait for the decodes still running and write their pixels"""
+        self._apply_decoded(True)
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    @staticmethod
+    def _compatible(canonical, image):
+        # the same file used as color and as data needs separate images
+        return (canonical.colorspace_settings.name == image.colorspace_settings.name and
+                canonical.alpha_mode == image.alpha_mode)
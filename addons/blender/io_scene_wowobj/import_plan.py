@@ -0,0 +1,211 @@
+import os
+
+from .model_loader import get_json_path, get_liquid_path, get_placement_path
+from .obj_parser import parse_mtl, read_mtllib
+from .placement_loader import PlacementTable
+
+# order in which file kinds are listed in the plan summary
+FILE_KINDS = ('obj', 'mtl', 'json', 'placement', 'liquid', 'texture')
+
+
+def normalize_path(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def read_placement_models(csvPath, rowTypes, includeSets, spatialFilter=None):
+    """List the model paths referenced by a placement CSV, without duplicates.
+
+    rowTypes holds the ADT row types to follow ('m2', 'wmo', 'gobj'),
+    includeSets whether rows of a WMO doodad set CSV are followed and
+    spatialFilter, if given, which ADT rows are in range.
+    """
+    baseDir = os.path.dirname(csvPath)
+    paths = []
+    seen = set()
+
+    with open(csvPath, newline='', encoding='utf-8') as csvFile:
+        placements = PlacementTable.read(csvFile)
+
+    if not placements.is_adt and not includeSets:
+        return paths
+
+    accepted = None
+    if spatialFilter is not None and placements.is_adt:
+        accepted = spatialFilter.select(placements)
+
+    for index, row in enumerate(placements.rows):
+        if placements.is_adt:
+            if (row.get('Type') or '').strip().lower() not in rowTypes:
+                continue
+
+            if accepted is not None and index not in accepted:
+                continue
+
+        modelFile = row.get('ModelFile')
+        if not modelFile:
+            continue
+
+        modelPath = os.path.normpath(os.path.join(baseDir, modelFile))
+        if modelPath not in seen:
+            seen.add(modelPath)
+            paths.append(modelPath)
+
+    return paths
+
+
+class PlanNode:
+    """A file the import will read, with the files it leads to"""
+    __slots__ = ('path', 'kind', 'size', 'dependencies')
+
+    def __init__(self, path, kind, size):
+        self.path = path
+        self.kind = kind
+        self.size = size
+        self.dependencies = []
+
+    @property
+    def exists(self):
+        return self.size is not None
+
+
+class ImportPlan:
+    """Deduplicated graph of every file an import touches.
+
+    roots holds one node per selected OBJ file. An OBJ node depends on its
+    MTL, JSON sidecar, placement CSV and (for ADT tiles) liquid file, an
+    MTL node on its textures and a placement node on the models it places.
+    """
+    def __init__(self):
+        self.nodes = {}
+        self.roots = []
+
+    def add(self, path, kind):
+        """Return (node, created) for path, stat-ing it when first seen"""
+        key = normalize_path(path)
+        node = self.nodes.get(key)
+        if node is not None:
+            return node, False
+
+        try:
+            size = os.stat(path).st_size
+        except OSError:
+            size = None
+
+        node = self.nodes[key] = PlanNode(path, kind, size)
+        return node, True
+
+    def walk(self, root):
+        """Yield every node reachable from root once, dependencies after their dependents"""
+        seen = set()
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if id(node) in seen:
+                continue
+
+            seen.add(id(node))
+            yield node
+            stack.extend(reversed(node.dependencies))
+
+    def models(self, root):
+        return [node.path for node in self.walk(root) if node.kind == 'obj' and node.exists]
+
+    def placed_models(self):
+        """Paths of placed models with their own placement CSV, which are imported once per placement"""
+        roots = set(id(root) for root in self.roots)
+        return {
+            normalize_path(node.path)
+            for node in self.nodes.values()
+            if node.kind == 'obj' and id(node) not in roots and any(dependency.kind == 'placement' for dependency in node.dependencies)
+        }
+
+    def totals(self):
+        """Map each file kind to [file count, total bytes, missing count]"""
+        totals = {kind: [0, 0, 0] for kind in FILE_KINDS}
+        for node in self.nodes.values():
+            total = totals.setdefault(node.kind, [0, 0, 0])
+            if node.exists:
+                total[0] += 1
+                total[1] += node.size
+            else:
+                total[2] += 1
+
+        return totals
+
+    def summary(self):
+        totals = self.totals()
+        fileCount = sum(total[0] for total in totals.values())
+        byteCount = sum(total[1] for total in totals.values())
+        missing = sum(total[2] for total in totals.values())
+
+        parts = ', '.join(f'{kind}={totals[kind][0]} ({format_bytes(totals[kind][1])})' for kind in totals if totals[kind][0])
+        return f'{fileCount} files, {format_bytes(byteCount)} [{parts}], missing={missing}'
+
+
+def format_bytes(size):
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f'{size:.0f} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
+        size /= 1024
+
+    return f'{size:.2f} GB'
+
+
+def build_plan(objectFiles, rowTypes=('m2', 'wmo', 'gobj'), includeSets=True, includeLiquid=True, spatialFilter=None):
+    """Walk the selected OBJ files and every placement CSV below them into an ImportPlan"""
+    plan = ImportPlan()
+    for objectFile in objectFiles:
+        plan.roots.append(_plan_model(plan, objectFile, rowTypes, includeSets, includeLiquid, spatialFilter))
+
+    return plan
+
+
+def _plan_model(plan, objectFile, rowTypes, includeSets, includeLiquid, spatialFilter=None):
+    node, created = plan.add(objectFile, 'obj')
+    if not created or not node.exists:
+        return node
+
+    baseDir, fileName = os.path.split(objectFile)
+
+    try:
+        mtllib = read_mtllib(objectFile)
+    except OSError:
+        mtllib = ''
+
+    if mtllib:
+        mtlNode, mtlCreated = plan.add(os.path.join(baseDir, mtllib), 'mtl')
+        node.dependencies.append(mtlNode)
+
+        if mtlCreated and mtlNode.exists:
+            try:
+                textures = parse_mtl(mtlNode.path, baseDir)
+            except (OSError, IndexError):
+                textures = {}
+
+            for texturePath in dict.fromkeys(textures.values()):
+                mtlNode.dependencies.append(plan.add(texturePath, 'texture')[0])
+
+    sidecars = [(get_json_path(objectFile), 'json')]
+    if includeLiquid and fileName.startswith('adt_'):
+        sidecars.append((get_liquid_path(objectFile), 'liquid'))
+
+    for path, kind in sidecars:
+        if os.path.exists(path):
+            node.dependencies.append(plan.add(path, kind)[0])
+
+    csvPath = get_placement_path(objectFile)
+    if os.path.exists(csvPath):
+        csvNode, csvCreated = plan.add(csvPath, 'placement')
+        node.dependencies.append(csvNode)
+
+        if csvCreated:
+            try:
+                modelPaths = read_placement_models(csvPath, rowTypes, includeSets, spatialFilter)
+            except Exception as e:
+                print(f'[WoWOBJ] Unable to plan models from {csvPath}: {e}')
+                modelPaths = []
+
+            for modelPath in modelPaths:
+                csvNode.dependencies.append(_plan_model(plan, modelPath, rowTypes, includeSets, includeLiquid, spatialFilter))
+
+    return node
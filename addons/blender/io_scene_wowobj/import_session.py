@@ -0,0 +1,195 @@
+import os
+
+import bpy
+
+from . import import_wowobj
+from .progress import ImportProgress
+
+
+class ImportSession:
+    """One run of the importer over a list of selected OBJ files.
+
+    steps() is a generator that yields between bounded slices of work (a
+    parse, a material pass, a mesh build, a placement row), so a modal
+    operator can spread the import over timer events. run() does the whole
+    import at once. Caches, the import plan and the prefetcher live for the
+    duration of the session. Without importPlacements only the models
+    themselves are imported, as when rebuilding the asset library. Given
+    proxies, the session replaces those placement proxies by their models
+    instead of importing files.
+    """
+    def __init__(self, settings, importFiles, cacheDirectory='', metadata=None, report=None, importPlacements=True, proxies=None):
+        self.settings = settings
+        self.files = list(importFiles)
+        self.proxies = list(proxies or ())
+        self.importPlacements = importPlacements
+        self.cacheDirectory = cacheDirectory
+        self.metadata = metadata or {}
+        self.report = report
+        self.progress = settings._progress = ImportProgress(self.files or [proxy[import_wowobj.PROXY_PROP] for proxy in self.proxies])
+        self.objects = []
+
+    @property
+    def cancelled(self):
+        return self.progress.cancelled
+
+    def cancel(self):
+        """Stop at the next placement row or file, keeping what was imported so far"""
+        self.progress.cancelled = True
+
+    def run(self):
+        return import_wowobj.run_steps(self.steps())
+
+    def steps(self):
+        settings = self.settings
+        progress = self.progress
+
+        if settings.enableProfiling:
+            from .profiler import Profiler
+            settings._profiler = Profiler()
+
+        if settings.useParseCache:
+            from .parse_cache import ParseCache
+            cacheDir = os.path.join(self.cacheDirectory, 'parse')
+            settings._parse_cache = ParseCache(cacheDir, settings.parseCacheSize * 1024 * 1024)
+
+        if settings.textureResolution != 'FULL':
+            from .texture_proxy import PROXY_DIVISORS, TextureProxyCache
+            settings._texture_proxies = TextureProxyCache(os.path.join(self.cacheDirectory, 'textures'), PROXY_DIVISORS[settings.textureResolution])
+
+        if settings.useProxies:
+            from .model_bounds import BoundsIndex
+            settings._bounds_index = BoundsIndex(os.path.join(self.cacheDirectory, 'bounds.json') if self.cacheDirectory else None)
+
+        knownNames = bpy.data.objects.keys()
+        if settings.assetCache != 'NONE':
+            from .asset_cache import AssetCache
+            settings._asset_cache = AssetCache(os.path.join(self.cacheDirectory, 'assets'), settings.assetCache)
+            # models in the library are not parsed
+            knownNames = list(settings._asset_cache.current_names().union(knownNames))
+
+        prefetcher = None
+        if self.files and self.importPlacements:
+            from .import_plan import build_plan
+            rowTypes = [rowType for rowType, enabled in (('m2', settings.importM2), ('wmo', settings.importWMO), ('gobj', settings.importGOBJ)) if enabled]
+            # proxies only read the vertex positions of placed models, there is nothing to prefetch for them
+            includeSets = settings.importWMOSets and not settings.useProxies
+            if settings.useProxies:
+                rowTypes = []
+
+            spatialFilter = import_wowobj._get_spatial_filter(settings)
+            plan = build_plan(self.files, rowTypes, includeSets, settings.importLiquid, spatialFilter)
+            print(f'[WoWOBJ] Import plan: {plan.summary()}')
+            progress.models_total = sum(1 for node in plan.nodes.values() if node.kind == 'obj' and node.exists)
+
+            if settings.useParallelParsing:
+                from .prefetch import ModelPrefetcher
+                prefetcher = settings._prefetcher = ModelPrefetcher(
+                    getattr(settings, '_parse_cache', None),
+                    rowTypes,
+                    includeSets,
+                    knownNames,
+                    plan=plan,
+                    spatialFilter=spatialFilter
+                )
+
+        try:
+            if self.proxies:
+                self.objects = yield from import_wowobj.hydrateProxiesSteps(self.proxies, settings)
+                print(f'[WoWOBJ] Hydrated {len(self.objects)} of {len(self.proxies)} proxies')
+
+            for index, importFile in enumerate(self.files):
+                if progress.cancelled:
+                    break
+
+                progress.begin_file(index)
+                if prefetcher is not None:
+                    # keep the workers one tile ahead of the main thread
+                    prefetcher.prefetch_tile(importFile)
+                    if index + 1 < len(self.files):
+                        prefetcher.prefetch_tile(self.files[index + 1])
+
+                obj = yield from import_wowobj.importWoWOBJAddonSteps(importFile, settings, self.importPlacements)
+                if obj is not None:
+                    self.objects.append(obj)
+        finally:
+            if prefetcher is not None:
+                prefetcher.shutdown()
+                print(f'[WoWOBJ] Parallel parsing: {prefetcher.hits} prefetched, {prefetcher.misses} parsed on demand')
+            if settings.useProxies:
+                settings._bounds_index.save()
+
+            imageRegistry = getattr(settings, '_image_registry', None)
+            if imageRegistry is not None:
+                # the decodes of the last file are still running
+                imageRegistry.finish()
+
+            if settings.assetCache != 'NONE':
+                # every image is loaded now
+                settings._asset_cache.write_pending()
+                settings._asset_cache.save()
+
+        if progress.cancelled:
+            print(f'[WoWOBJ] Import cancelled after {progress.models_done} models')
+        elif self.files and self.report is not None:
+            self.report({'INFO'}, f'Imported {len(self.objects)} of {len(self.files)} OBJ file(s)')
+
+        self._select_imported()
+        self._print_stats()
+
+    def _select_imported(self):
+        # selection changes once per session, not once per imported model
+        viewLayer = bpy.context.view_layer
+        for obj in list(viewLayer.objects.selected):
+            obj.select_set(False)
+
+        for obj in self.objects:
+            try:
+                obj.select_set(True)
+            except RuntimeError:
+                # not in the view layer, e.g. the active collection is excluded
+                continue
+
+            viewLayer.objects.active = obj
+
+    def _print_stats(self):
+        settings = self.settings
+
+        if settings.useParseCache:
+            print(f'[WoWOBJ] Parse cache: {settings._parse_cache.hits} hits, {settings._parse_cache.misses} misses')
+
+        materialCache = getattr(settings, '_material_cache', None)
+        if materialCache is not None:
+            print(f'[WoWOBJ] Material cache: {materialCache.hits} hits, {materialCache.misses} misses')
+
+        if settings.useProxies:
+            print(f'[WoWOBJ] Proxy bounds: {settings._bounds_index.hits} cached, {settings._bounds_index.misses} read')
+
+        geometryRegistry = getattr(settings, '_geometry_registry', None)
+        if geometryRegistry is not None and settings.shareGeometry:
+            print(f'[WoWOBJ] Shared geometry: {geometryRegistry.shared} models reused an existing mesh')
+
+        if settings.assetCache != 'NONE':
+            assetCache = settings._asset_cache
+            print(f'[WoWOBJ] Asset library: {assetCache.hits} loaded, {assetCache.misses} imported, {assetCache.stored} stored')
+
+        imageRegistry = getattr(settings, '_image_registry', None)
+        if imageRegistry is not None:
+            print(f'[WoWOBJ] Images: {imageRegistry.loaded} loaded, {imageRegistry.shared} shared by content, {imageRegistry.decoded} decoded in parallel')
+
+        textureProxies = getattr(settings, '_texture_proxies', None)
+        if textureProxies is not None:
+            print(f'[WoWOBJ] Texture proxies: {textureProxies.created} created, {textureProxies.hits} cached')
+
+        if settings.enableProfiling:
+            print(settings._profiler.summary())
+            if settings.profileOutput:
+                profilePath = bpy.path.abspath(settings.profileOutput)
+                metadata = dict(self.metadata, blender_version=bpy.app.version_string, files=self.files)
+
+                try:
+                    settings._profiler.write(profilePath, settings.profileFormat, metadata)
+                    print(f'[WoWOBJ] Wrote import profile to {profilePath}')
+                except OSError as e:
+                    if self.report is not None:
+                        self.report({'WARNING'}, f'Unable to write import profile: {e}')
@@ -1,14 +1,30 @@
 import bpy
 import bmesh
 import os
-import csv
 import hashlib
 import json
+from array import array
 from collections import defaultdict
 
 from math import radians
-from mathutils import Quaternion
+from mathutils import Matrix
 from .animation_processor import process_texture_transform
+from .asset_cache import model_sources
+from .geometry_registry import GEOMETRY_PROP, GeometryRegistry
+from .image_registry import ImageRegistry
+from .liquid_builder import build_liquid_buffers
+from .material_cache import MaterialCache, advanced_m2_material_key, standard_material_key, terrain_material_key, wmo_shader20_material_key
+from .mesh_builder import build_mesh, fill_colors, filter_triangles
+from .mesh_merger import merge_parts, split_by_material
+from .model_bounds import BoundsIndex
+from .model_loader import get_liquid_path, get_placement_path, load_model
+from .name_registry import NameRegistry
+from .placement_index import PlacementIndex
+from .placement_loader import PlacementTable
+from .profiler import NULL_PROFILER
+from .progress import ImportProgress
+from .source_sync import PLACEMENT_PROP, SOURCE_PROP, SourceSync
+from .spatial_filter import SpatialFilter
 
 IS_B40 = bpy.app.version >= (4, 0, 0)
 
@@ -21,16 +37,178 @@ ADT_SIZE = MAP_SIZE / 64
 CHUNK_SIZE = 33.33333
 TILE_SIZE = 533.33333
 PLACEMENT_ISSUE_LOG_LIMIT = 25
+INSTANCE_LIBRARY_NAME = 'WoW Instances'
+INSTANCE_NODE_GROUP_NAME = 'WoWInstanceOnPoints'
+# ID property with the OBJ path a proxy object stands in for
+PROXY_PROP = 'wowexport_proxy'
+# ID property with the import options a proxy was placed with, hydration imports its model with them
+PROXY_SETTINGS_PROP = 'wowexport_proxy_settings'
+PROXY_SETTINGS = ('useAlpha', 'createVertexGroups', 'importWMOSets', 'importTextures', 'useTerrainBlending', 'createEmissiveMaterials', 'createDoodadSetCollections', 'importUVAnimations', 'instancingMode', 'shareGeometry')
+# ID property pointing from a placement to the prototype copy made of it for instancing
+PROTOTYPE_PROP = 'wowexport_prototype'
+# ID property with the number of placements baked into a merged mesh object
+MERGED_PROP = 'wowexport_merged'
+# quads over the corners of ModelBounds.corners
+PROXY_BOX_LOOPS = array('i', (0, 2, 3, 1, 4, 5, 7, 6, 0, 1, 5, 4, 2, 6, 7, 3, 0, 4, 6, 2, 1, 3, 7, 5))
+
+# modes in which placements reference a per-model collection instead of the model object
+INSTANCE_COLLECTION_MODES = {'COLLECTION', 'POINTS'}
+
+# registries of the import slice that is running, used by loadImage and _new_datablock
+_active_image_registry = None
+_active_name_registry = None
 
 def importWoWOBJAddon(objectFile, settings):
-    fileName = os.path.basename(objectFile)
-    if settings and fileName.startswith('adt_') and not getattr(settings, '_import_cache_cleared', False):
-        if 'importedModelIDs' in bpy.context.scene:
-            del bpy.context.scene['importedModelIDs']
-            print('[WoWOBJ] Cleared stale importedModelIDs cache at start of ADT import session.')
-        settings._import_cache_cleared = True
+    obj = run_steps(importWoWOBJAddonSteps(objectFile, settings))
+    _get_image_registry(settings).finish()
+    return obj
+
+def importWoWOBJAddonSteps(objectFile, settings, importPlacements=True):
+    """Generator version of importWoWOBJAddon, yielding between bounded slices of work"""
+    imageRegistry = _get_image_registry(settings)
+
+    try:
+        steps = _bind_registries(importWoWOBJSteps(objectFile, None, settings, importPlacements), imageRegistry, _get_name_registry(settings))
+        return (yield from _profile_slices(steps, _get_profiler(settings)))
+    finally:
+        # every material of the file is built now, load their images in one go
+        profiler = _get_profiler(settings)
+        stage = profiler.begin('images', os.path.basename(objectFile))
+        loadedBytes = imageRegistry.loaded_bytes
+        imageRegistry.flush()
+        profiler.end(stage, imageRegistry.loaded_bytes - loadedBytes)
+
+def _profile_slices(steps, profiler):
+    """Run steps with the profiler paused whenever it yields, so stages only time the slices themselves"""
+    try:
+        while True:
+            try:
+                next(steps)
+            except StopIteration as stop:
+                return stop.value
+
+            profiler.pause()
+            try:
+                yield
+            finally:
+                profiler.resume()
+    finally:
+        steps.close()
+
+def _bind_registries(steps, imageRegistry, nameRegistry):
+    """Run steps with the registries active during each of its slices.
+
+    Sessions driven by different timers interleave their slices, so the
+    registries in place before a slice are restored after it.
+    """
+    def advance(action):
+        global _active_image_registry, _active_name_registry
+        previous = (_active_image_registry, _active_name_registry)
+        _active_image_registry, _active_name_registry = imageRegistry, nameRegistry
+        try:
+            return action()
+        finally:
+            _active_image_registry, _active_name_registry = previous
+
+    try:
+        while True:
+            try:
+                advance(lambda: next(steps))
+            except StopIteration as stop:
+                return stop.value
+            yield
+    finally:
+        # a session closed early runs the clean-up of its steps with its registries
+        advance(steps.close)
+
+def run_steps(steps):
+    """Run an import generator to completion, returning its result"""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+def _get_profiler(settings):
+    return getattr(settings, '_profiler', None) or NULL_PROFILER
+
+def _get_progress(settings):
+    progress = getattr(settings, '_progress', None)
+    if progress is None:
+        progress = settings._progress = ImportProgress()
+
+    return progress
+
+def _get_name_registry(settings):
+    nameRegistry = getattr(settings, '_name_registry', None)
+    if nameRegistry is None:
+        nameRegistry = settings._name_registry = NameRegistry(normalizeName)
+
+    return nameRegistry
+
+def _get_image_registry(settings):
+    imageRegistry = getattr(settings, '_image_registry', None)
+    if imageRegistry is None:
+        imageRegistry = settings._image_registry = ImageRegistry(getattr(settings, 'lazyImageLoading', True), _get_name_registry(settings), getattr(settings, 'parallelImageDecode', False), getattr(settings, '_texture_proxies', None))
+
+    return imageRegistry
 
-    importWoWOBJ(objectFile, None, settings)
+def _get_source_sync(settings):
+    sourceSync = getattr(settings, '_source_sync', None)
+    if sourceSync is None:
+        # content hashes are only compared by incremental sync and keyed on by the asset library
+        sourceSync = settings._source_sync = SourceSync(settings.incrementalSync or settings.assetCache != 'NONE')
+
+    return sourceSync
+
+def _get_spatial_filter(settings):
+    """SpatialFilter for the placement filter settings, None when every placement is imported"""
+    if settings.filterMode not in ('REGION', 'RADIUS'):
+        return None
+
+    spatialFilter = getattr(settings, '_spatial_filter', None)
+    if spatialFilter is None:
+        distances = {'m2': settings.filterM2Distance, 'wmo': settings.filterWMODistance, 'gobj': settings.filterGOBJDistance}
+        if settings.filterMode == 'REGION':
+            spatialFilter = SpatialFilter(region=tuple(settings.filterMin) + tuple(settings.filterMax), type_distances=distances)
+        else:
+            spatialFilter = SpatialFilter(centre=tuple(settings.filterCentre), radius=settings.filterRadius, type_distances=distances)
+        settings._spatial_filter = spatialFilter
+
+    return spatialFilter
+
+def _get_bounds_index(settings):
+    boundsIndex = getattr(settings, '_bounds_index', None)
+    if boundsIndex is None:
+        boundsIndex = settings._bounds_index = BoundsIndex()
+
+    return boundsIndex
+
+def _new_datablock(collection, name, *args):
+    if _active_name_registry is not None:
+        return _active_name_registry.new(collection, name, *args)
+
+    return getattr(bpy.data, collection).new(normalizeName(name), *args)
+
+def _claim_name(collection, name):
+    if _active_name_registry is not None:
+        _active_name_registry.claim(collection, name)
+
+def _release_names(collection, names):
+    if _active_name_registry is not None:
+        _active_name_registry.release(collection, names)
+
+def _remove_datablock(collection, block):
+    name = block.name
+    getattr(bpy.data, collection).remove(block)
+    _release_names(collection, [name])
+
+def _rename_datablock(collection, block, name):
+    if _active_name_registry is not None:
+        block.name = _active_name_registry.allocate(collection, name)
+        _active_name_registry.claim(collection, block.name)
+    else:
+        block.name = normalizeName(name)
 
 def _new_placement_stats(tileName):
     return {
@@ -45,12 +223,20 @@ def _new_placement_stats(tileName):
         'imported_gobj': 0,
         'skipped_duplicates': 0,
         'skipped_disabled_or_unknown': 0,
+        'skipped_out_of_range': 0,
         'missing_files': 0,
         'failed_rows': 0,
+        'kept': 0,
+        'removed': 0,
         'issue_logs': 0
     }
 
 
+def _placed_count(stats):
+    # rows that have a placement in the scene after this import
+    return stats['imported_m2'] + stats['imported_wmo'] + stats['imported_gobj'] + stats['kept']
+
+
 def _log_placement_issue(stats, message):
     if stats['issue_logs'] < PLACEMENT_ISSUE_LOG_LIMIT:
         print(message)
@@ -68,11 +254,541 @@ def _print_placement_summary(stats):
         f"imported(m2={stats['imported_m2']}, wmo={stats['imported_wmo']}, gobj={stats['imported_gobj']}), "
         f"skipped_duplicates={stats['skipped_duplicates']}, "
         f"skipped_disabled_or_unknown={stats['skipped_disabled_or_unknown']}, "
+        f"skipped_out_of_range={stats['skipped_out_of_range']}, "
         f"missing_files={stats['missing_files']}, "
-        f"failed_rows={stats['failed_rows']}"
+        f"failed_rows={stats['failed_rows']}, "
+        f"kept={stats['kept']}, "
+        f"removed={stats['removed']}"
     )
 
 
+def _get_prototype(obj):
+    """The object the placements of obj's model are instanced from.
+
+    That is obj itself, unless obj is a placement: a copy an earlier import
+    left in the scene or a WMO doodad. Those stay where they are and a copy
+    of them, made once, becomes the prototype.
+    """
+    if 'wowexport_instance_collection' in obj:
+        return obj
+
+    prototype = obj.get(PROTOTYPE_PROP)
+    if prototype is not None:
+        return prototype
+
+    if PLACEMENT_PROP not in obj and obj.parent is None:
+        return obj
+
+    prototype = obj.copy()
+    _claim_name('objects', prototype.name)
+    prototype.parent = None
+    if PLACEMENT_PROP in prototype:
+        del prototype[PLACEMENT_PROP]
+    obj[PROTOTYPE_PROP] = prototype
+    return prototype
+
+
+def _get_instance_collection(prototype):
+    """Move a model object into its own collection so placements can instance it"""
+    instanceCollection = prototype.get('wowexport_instance_collection')
+    if instanceCollection is not None:
+        return instanceCollection
+
+    library = bpy.data.collections.get(INSTANCE_LIBRARY_NAME)
+    if library is None:
+        # not linked to any scene, the collections only exist to be instanced
+        library = bpy.data.collections.new(INSTANCE_LIBRARY_NAME)
+        library.use_fake_user = True
+
+    instanceCollection = bpy.data.collections.new(prototype.name)
+    library.children.link(instanceCollection)
+
+    for userCollection in list(prototype.users_collection):
+        userCollection.objects.unlink(prototype)
+    instanceCollection.objects.link(prototype)
+
+    # placements carry the full transform, the prototype keeps only the OBJ orientation
+    prototype.parent = None
+    prototype.location = (0, 0, 0)
+    prototype.rotation_euler = [0, 0, 0]
+    prototype.rotation_euler.x = radians(90)
+    prototype.scale = (1, 1, 1)
+
+    prototype['wowexport_instance_collection'] = instanceCollection
+    return instanceCollection
+
+
+def _new_placement_object(modelName, originalObject, collection, settings, copyData=False, link=True):
+    """Create a placement of an already imported model according to settings.instancingMode"""
+    if settings.instancingMode in INSTANCE_COLLECTION_MODES:
+        placement = _new_datablock('objects', modelName, None)
+        placement.instance_type = 'COLLECTION'
+        placement.instance_collection = _get_instance_collection(_get_prototype(originalObject))
+    else:
+        if settings.instancingMode == 'MERGE' and originalObject.type == 'MESH':
+            # doodads are copies of a prototype in the library, which the merged meshes of later tiles use as well
+            originalObject = _get_prototype(originalObject)
+            _get_instance_collection(originalObject)
+
+        placement = originalObject.copy()
+        _claim_name('objects', placement.name)
+        if 'wowexport_instance_collection' in placement:
+            del placement['wowexport_instance_collection']
+        if copyData and settings.instancingMode == 'COPY':
+            placement.data = originalObject.data.copy()
+            _claim_name('meshes', placement.data.name)
+
+    if link:
+        collection.link(placement)
+
+    return placement
+
+
+def _apply_instance_offset(placement, prototype):
+    # collection instances already include the prototype orientation
+    if placement.instance_type == 'COLLECTION' and placement.instance_collection is not None:
+        placement.matrix_basis = placement.matrix_basis @ _get_prototype(prototype).matrix_basis.inverted()
+
+
+def _get_placement_parent(baseObj, name, collection, reuse=False):
+    """Empty below baseObj that groups one kind of placements, the existing one when updating a tile"""
+    if reuse:
+        for child in baseObj.children:
+            if child.type == 'EMPTY' and (child.name == name or (child.name.startswith(name + '.') and child.name[len(name) + 1:].isdigit())):
+                return child
+
+    parent = _new_datablock('objects', name, None)
+    parent.parent = baseObj
+    parent.rotation_euler = [0, 0, 0]
+    parent.rotation_euler.x = radians(-90)
+    collection.link(parent)
+    return parent
+
+
+def _collect_placements(parents):
+    """Placement objects below parents by their row key, and the point instance and merged objects"""
+    placements = defaultdict(list)
+    combinedObjects = []
+    for parent in parents:
+        for child in parent.children:
+            if PLACEMENT_PROP in child:
+                placements[child[PLACEMENT_PROP]].append(child)
+            elif MERGED_PROP in child or child.modifiers.get('WoW Instances') is not None:
+                combinedObjects.append(child)
+
+    return placements, combinedObjects
+
+
+def _remove_objects(objects):
+    """Remove objects together with everything parented below them"""
+    removed = set()
+    for obj in objects:
+        removed.add(obj)
+        removed.update(obj.children_recursive)
+
+    if removed:
+        names = [obj.name for obj in removed]
+        bpy.data.batch_remove(removed)
+        _release_names('objects', names)
+
+
+def _refresh_model(modelPath, settings):
+    """Rebuild the meshes imported from modelPath if its files changed, keeping every placement of them"""
+    sourceSync = _get_source_sync(settings)
+    if not sourceSync.needs_rebuild(modelPath):
+        return
+
+    meshes = sourceSync.meshes(modelPath)
+    print(f'[WoWOBJ] {os.path.basename(modelPath)} changed, rebuilding {len(meshes)} mesh(es)')
+
+    # exports that shared these meshes through their geometry keep the old one
+    meshSet = set(meshes)
+    detached = {}
+    for user in bpy.data.objects:
+        record = user.get(SOURCE_PROP)
+        if user.data in meshSet and record is not None and record.get('path') != modelPath:
+            key = (user.data.name, record.get('path'))
+            if key not in detached:
+                detached[key] = user.data.copy()
+                detached[key][SOURCE_PROP] = record.to_dict()
+                _claim_name('meshes', detached[key].name)
+            user.data = detached[key]
+
+    replacement = yield from importWoWOBJSteps(modelPath, None, settings, importPlacements=False)
+    newMesh = replacement.data
+    _remove_datablock('objects', replacement)
+
+    for index, mesh in enumerate(meshes):
+        target = newMesh
+        if index > 0:
+            # placements that had their own copy of the mesh keep one
+            target = newMesh.copy()
+            _claim_name('meshes', target.name)
+        mesh.user_remap(target)
+
+    meshName = meshes[0].name
+    released = [mesh.name for mesh in meshes[1:]] + [newMesh.name]
+    bpy.data.batch_remove(meshes)
+    newMesh.name = meshName
+    _release_names('meshes', released)
+
+
+def _get_proxy_mesh(modelPath, settings):
+    """Box mesh around the bounds of modelPath shared by all of its proxies, None if the model is missing"""
+    proxyMeshes = getattr(settings, '_proxy_meshes', None)
+    if proxyMeshes is None:
+        proxyMeshes = settings._proxy_meshes = {}
+
+    mesh = proxyMeshes.get(modelPath)
+    if mesh is None:
+        bounds = _get_bounds_index(settings).get(modelPath)
+        if bounds is None:
+            return None
+
+        mesh = _new_datablock('meshes', os.path.basename(modelPath) + ' proxy')
+        build_mesh(mesh, bounds.corners(), PROXY_BOX_LOOPS, array('i', range(0, 24, 4)), smooth=False)
+        mesh[PROXY_PROP] = modelPath
+        proxyMeshes[modelPath] = mesh
+
+    return mesh
+
+
+def _place_proxy(modelPath, parent, matrix, collection, placementKey, settings):
+    """Stand-in for a placement of modelPath, built from its bounds alone. None if the model is missing"""
+    mesh = _get_proxy_mesh(modelPath, settings)
+    if mesh is None:
+        return None
+
+    proxy = _new_datablock('objects', mesh.name, mesh)
+    proxy.parent = parent
+    proxy.matrix_basis = matrix
+    proxy.display_type = 'WIRE'
+    proxy[PROXY_PROP] = modelPath
+    proxy[PROXY_SETTINGS_PROP] = {name: getattr(settings, name) for name in PROXY_SETTINGS}
+    if placementKey is not None:
+        proxy[PLACEMENT_PROP] = placementKey
+    collection.link(proxy)
+    return proxy
+
+
+def hydrateProxies(proxies, settings):
+    return run_steps(hydrateProxiesSteps(proxies, settings))
+
+def hydrateProxiesSteps(proxies, settings):
+    """Replace proxy objects by the full models they stand in for, returning the new objects"""
+    imageRegistry = _get_image_registry(settings)
+    try:
+        steps = _bind_registries(_hydrate_proxies(proxies, settings), imageRegistry, _get_name_registry(settings))
+        hydrated = yield from _profile_slices(steps, _get_profiler(settings))
+    finally:
+        imageRegistry.flush()
+        imageRegistry.finish()
+
+    # boxes no proxy uses anymore
+    unused = [mesh for mesh in bpy.data.meshes if PROXY_PROP in mesh and not mesh.users]
+    names = [mesh.name for mesh in unused]
+    bpy.data.batch_remove(unused)
+    _release_names('meshes', names)
+    return hydrated
+
+def _hydrate_proxies(proxies, settings):
+    collection = bpy.context.view_layer.active_layer_collection.collection.objects
+    progress = _get_progress(settings)
+    hydrated = []
+
+    for index, proxy in enumerate(proxies):
+        yield
+        if progress.cancelled:
+            break
+
+        progress.begin_file(index)
+        modelPath = proxy[PROXY_PROP]
+
+        # the options of the import that placed the proxy, proxies of earlier versions keep the given ones
+        options = proxy.get(PROXY_SETTINGS_PROP)
+        if options is not None:
+            for name in PROXY_SETTINGS:
+                if name in options:
+                    setattr(settings, name, options[name])
+
+        modelName = normalizeName(os.path.basename(modelPath))
+        if not os.path.exists(modelPath):
+            print(f'[WoWOBJ] Missing model for proxy {proxy.name}: {modelPath}')
+            continue
+
+        # WMOs with doodads are imported for every placement, like in the placement import
+        hasPlacements = os.path.exists(get_placement_path(modelPath))
+        if hasPlacements or modelName not in bpy.data.objects:
+            originalObject = importedFile = yield from importWoWOBJSteps(modelPath, proxy.parent, settings)
+            if settings.instancingMode in INSTANCE_COLLECTION_MODES and not hasPlacements:
+                importedFile = _new_placement_object(modelName, originalObject, collection, settings)
+        else:
+            originalObject = bpy.data.objects[modelName]
+            importedFile = _new_placement_object(modelName, originalObject, collection, settings)
+
+        importedFile.parent = proxy.parent
+        importedFile.matrix_basis = proxy.matrix_basis
+        _apply_instance_offset(importedFile, originalObject)
+        if PLACEMENT_PROP in proxy:
+            importedFile[PLACEMENT_PROP] = proxy[PLACEMENT_PROP]
+
+        _remove_datablock('objects', proxy)
+        hydrated.append(importedFile)
+
+    return hydrated
+
+
+def _add_point_instance(pointInstances, prototype, parent, target, targetName, matrix):
+    """Queue a placement to be written as a point of a points mesh instead of an object"""
+    prototype = _get_prototype(prototype)
+    instanceCollection = _get_instance_collection(prototype)
+    key = (instanceCollection.name, parent.name if parent else '', targetName)
+
+    entry = pointInstances.get(key)
+    if entry is None:
+        entry = pointInstances[key] = {
+            'collection': instanceCollection,
+            'parent': parent,
+            'target': target,
+            'offset': prototype.matrix_basis.inverted(),
+            'matrices': []
+        }
+
+    entry['matrices'].append(matrix @ entry['offset'])
+
+
+def _add_merged_placement(mergedPlacements, prototype, parent, matrix):
+    """Queue a placement to be baked into the merged meshes of its parent"""
+    prototype = _get_prototype(prototype)
+    if prototype.type != 'MESH':
+        raise ValueError(f'{prototype.name} has no mesh to merge')
+
+    # out of the scene like a collection instance prototype, later tiles still find it
+    _get_instance_collection(prototype)
+    mergedPlacements[parent].append((prototype, tuple(tuple(row) for row in matrix)))
+
+
+def _read_mesh_parts(mesh):
+    """Split a triangulated model mesh into MeshParts by material slot"""
+    positions = array('f', bytes(len(mesh.vertices) * 12))
+    mesh.vertices.foreach_get('co', positions)
+    loops = array('i', bytes(len(mesh.loops) * 4))
+    mesh.loops.foreach_get('vertex_index', loops)
+    if len(loops) != len(mesh.polygons) * 3:
+        raise ValueError(f'{mesh.name} is not triangulated')
+
+    materialIndices = array('i', bytes(len(mesh.polygons) * 4))
+    mesh.polygons.foreach_get('material_index', materialIndices)
+
+    uvLayers = []
+    for uvLayer in mesh.uv_layers:
+        uvs = array('f', bytes(len(mesh.loops) * 8))
+        uvLayer.data.foreach_get('uv', uvs)
+        uvLayers.append((uvLayer.name, uvs))
+
+    return split_by_material(positions, loops, materialIndices, uvLayers)
+
+
+def _create_merged_meshes(mergedPlacements, collection, tileName):
+    """Bake the queued placements into one mesh per parent and material"""
+    if not mergedPlacements:
+        return
+
+    meshParts = {}
+    created = 0
+    for parent, placements in mergedPlacements.items():
+        entriesByMaterial = defaultdict(list)
+        for prototype, matrix in placements:
+            mesh = prototype.data
+            parts = meshParts.get(mesh.name)
+            if parts is None:
+                parts = meshParts[mesh.name] = _read_mesh_parts(mesh)
+
+            # slot materials, prototypes sharing a mesh can link their own to the object
+            for materialIndex, part in parts.items():
+                material = prototype.material_slots[materialIndex].material if materialIndex < len(prototype.material_slots) else None
+                entriesByMaterial[material].append((part, matrix))
+
+        for material, entries in entriesByMaterial.items():
+            positions, loops, uvLayers = merge_parts(entries)
+            name = f"{tileName} {parent.name} {material.name if material is not None else 'merged'}"
+
+            mesh = _new_datablock('meshes', name)
+            build_mesh(mesh, positions, loops, array('i', range(0, len(loops), 3)), None, uvLayers)
+            if material is not None:
+                mesh.materials.append(material)
+
+            mergedObject = _new_datablock('objects', name, mesh)
+            mergedObject.parent = parent
+            mergedObject[MERGED_PROP] = len(entries)
+            collection.link(mergedObject)
+            created += 1
+
+    print(f'[WoWOBJ] Merged {sum(len(placements) for placements in mergedPlacements.values())} placements into {created} meshes.')
+
+
+def _get_group_input_identifier(group, name):
+    if hasattr(group, 'interface'):
+        for item in group.interface.items_tree:
+            if item.item_type == 'SOCKET' and item.in_out == 'INPUT' and item.name == name:
+                return item.identifier
+
+        return None
+
+    return group.inputs[name].identifier
+
+
+def _create_point_instances(pointInstances):
+    """Create one points object per model and parent, instancing the model collection on every point"""
+    if not pointInstances:
+        return
+
+    nodeGroup = create_instance_on_points_node_group()
+    collectionInput = _get_group_input_identifier(nodeGroup, 'Collection')
+
+    for entry in pointInstances.values():
+        matrices = entry['matrices']
+        positions = array('f')
+        rotations = array('f')
+        scales = array('f')
+
+        for matrix in matrices:
+            location, rotation, scale = matrix.decompose()
+            positions.extend(location)
+            rotations.extend(rotation.to_euler())
+            scales.extend(scale)
+
+        name = entry['collection'].name + ' points'
+        mesh = _new_datablock('meshes', name)
+        mesh.vertices.add(len(matrices))
+        mesh.vertices.foreach_set('co', positions)
+
+        for attributeName, values in (('rotation', rotations), ('scale', scales)):
+            attribute = mesh.attributes.new(attributeName, 'FLOAT_VECTOR', 'POINT')
+            attribute.data.foreach_set('vector', values)
+
+        mesh.update()
+
+        pointsObject = _new_datablock('objects', name, mesh)
+        pointsObject.parent = entry['parent']
+
+        modifier = pointsObject.modifiers.new('WoW Instances', 'NODES')
+        modifier.node_group = nodeGroup
+        modifier[collectionInput] = entry['collection']
+
+        entry['target'].link(pointsObject)
+
+    print(f'[WoWOBJ] Created {len(pointInstances)} point instance objects for {sum(len(e["matrices"]) for e in pointInstances.values())} placements.')
+
+
+def _get_doodad_set_collection(collectionName):
+    collection = bpy.data.collections.get(collectionName)
+
+    if collection is None:
+        print("Collection for " + collectionName + " does not exist. Creating collection..")
+        collection = bpy.data.collections.new(collectionName)
+        bpy.context.scene.collection.children.link(collection)
+
+    if collection.name not in bpy.context.scene.collection.children:
+        print("Collection " + collectionName + " isn't linked to scene. Linking collection..")
+        bpy.context.scene.collection.children.link(collection)
+
+    return collection
+
+
+def _get_placement_index(settings):
+    placementIndex = getattr(settings, '_placement_index', None)
+    if placementIndex is None:
+        placementIndex = settings._placement_index = PlacementIndex(bpy.context.scene, bpy.data.objects)
+        if len(placementIndex):
+            print(f'[WoWOBJ] {len(placementIndex)} ADT placements already imported into this scene will be skipped')
+
+    return placementIndex
+
+
+def _get_material_cache(settings):
+    materialCache = getattr(settings, '_material_cache', None)
+    if materialCache is None:
+        materialCache = settings._material_cache = MaterialCache()
+
+    return materialCache
+
+
+def _append_material_slot(meshMaterials, material):
+    # materials shared through the material cache keep a single slot
+    if material is not None:
+        for index, existing in enumerate(meshMaterials):
+            if existing == material:
+                return index
+
+    meshMaterials.append(material)
+    return len(meshMaterials) - 1
+
+
+def _get_geometry_registry(settings):
+    geometryRegistry = getattr(settings, '_geometry_registry', None)
+    if geometryRegistry is None:
+        geometryRegistry = settings._geometry_registry = GeometryRegistry()
+
+    return geometryRegistry
+
+
+def _shared_slot_materials(record, groups, groupSlots, slotMaterials, slotCount):
+    """Material for each slot of a shared mesh used by this model's groups, None if two of them want one slot"""
+    sharedSlots = list(record.get('group_slots', ()))
+    if len(sharedSlots) != len(groupSlots):
+        return None
+
+    materials = {}
+    for group, ownSlot, sharedSlot in zip(groups, groupSlots, sharedSlots):
+        if group.face_count == 0:
+            continue
+
+        material = slotMaterials[ownSlot] if ownSlot < len(slotMaterials) else None
+        if sharedSlot >= slotCount:
+            # faces without a slot, fine as long as this model has no material for them either
+            if material is not None:
+                return None
+            continue
+
+        if materials.get(sharedSlot, material) != material:
+            return None
+
+        materials[sharedSlot] = material
+
+    return materials
+
+
+def _find_shared_mesh(objData, groupSlots, slotMaterials, settings):
+    """Mesh already built from the same geometry and the materials this model needs in its slots, (None, None) if there is none"""
+    # a shared mesh only records the source of the export that built it
+    if not settings.shareGeometry or settings.incrementalSync:
+        return None, None
+
+    for mesh in _get_geometry_registry(settings).find(objData.fingerprint):
+        record = mesh[GEOMETRY_PROP]
+        if settings.createVertexGroups and objData.groups and 'vertex_groups' not in record:
+            continue
+
+        materials = _shared_slot_materials(record, objData.groups, groupSlots, slotMaterials, len(mesh.materials))
+        if materials is not None:
+            return mesh, materials
+
+    return None, None
+
+
+def _link_shared_materials(obj, materials):
+    # slots whose material differs from the shared mesh are linked to the object
+    for index, material in materials.items():
+        if index >= len(obj.material_slots):
+            continue
+
+        slot = obj.material_slots[index]
+        if slot.material != material:
+            slot.link = 'OBJECT'
+            slot.material = material
+
+
 def getFirstNodeOfType(nodes, nodeType):
     for node in nodes:
         if node.type == nodeType:
@@ -193,6 +909,66 @@ def create_texture_panner_node_group():
     return group
 
 
+def create_instance_on_points_node_group():
+    """Create reusable geometry nodes group instancing a collection on every point"""
+    group_name = INSTANCE_NODE_GROUP_NAME
+
+    if group_name in bpy.data.node_groups:
+        return bpy.data.node_groups[group_name]
+
+    group = bpy.data.node_groups.new(group_name, 'GeometryNodeTree')
+    group.nodes.clear()
+
+    if hasattr(group, 'interface'):
+        # Blender 4.0+ interface system
+        group.interface.new_socket('Geometry', in_out='INPUT', socket_type='NodeSocketGeometry')
+        group.interface.new_socket('Collection', in_out='INPUT', socket_type='NodeSocketCollection')
+        group.interface.new_socket('Geometry', in_out='OUTPUT', socket_type='NodeSocketGeometry')
+    else:
+        # Blender 3.x interface system
+        group.inputs.new('NodeSocketGeometry', 'Geometry')
+        group.inputs.new('NodeSocketCollection', 'Collection')
+        group.outputs.new('NodeSocketGeometry', 'Geometry')
+
+    if hasattr(group, 'is_modifier'):
+        group.is_modifier = True
+
+    nodes = group.nodes
+    links = group.links
+
+    group_input = nodes.new('NodeGroupInput')
+    group_input.location = (-600, 0)
+
+    group_output = nodes.new('NodeGroupOutput')
+    group_output.location = (300, 0)
+
+    # original space keeps the prototype orientation stored in the collection
+    collection_info = nodes.new('GeometryNodeCollectionInfo')
+    collection_info.location = (-300, -100)
+    collection_info.transform_space = 'ORIGINAL'
+
+    instance_on_points = nodes.new('GeometryNodeInstanceOnPoints')
+    instance_on_points.location = (0, 0)
+
+    links.new(group_input.outputs['Geometry'], instance_on_points.inputs['Points'])
+    links.new(group_input.outputs['Collection'], collection_info.inputs['Collection'])
+    links.new(collection_info.outputs[0], instance_on_points.inputs['Instance'])
+
+    for i, attribute_name in enumerate(('rotation', 'scale')):
+        attribute = nodes.new('GeometryNodeInputNamedAttribute')
+        attribute.location = (-300, -300 - i * 150)
+        attribute.data_type = 'FLOAT_VECTOR'
+        attribute.inputs['Name'].default_value = attribute_name
+
+        # 3.x keeps one output per data type, only the active one is enabled
+        output = [socket for socket in attribute.outputs if socket.enabled][0]
+        links.new(output, instance_on_points.inputs[attribute_name.capitalize()])
+
+    links.new(instance_on_points.outputs['Instances'], group_output.inputs['Geometry'])
+
+    return group
+
+
 def create_competitive_blend_node_group():
 	"""create reusable competitive terrain blending node group"""
 	group_name = 'competitive_terrain_blend'
@@ -665,7 +1441,7 @@ def createWMOShader20Material(material_name, json_info, base_dir, lookup_name=No
 	mat_data = json_info['materials'][mat_idx]
 	tex_paths = json_info.get('texturePathsByFDID', {})
 
-	material = bpy.data.materials.new(name=material_name)
+	material = _new_datablock('materials', material_name)
 	material.use_nodes = True
 	material.blend_method = 'CLIP'
 
@@ -851,17 +1627,19 @@ def detectTextureMode(materials):
 
 
 def loadImage(textureLocation):
-    imageName, imageExt = os.path.splitext(os.path.basename(textureLocation))
-    imageName = normalizeName(imageName)
+    if _active_image_registry is not None:
+        return _active_image_registry.request(textureLocation)
 
-    if not imageName in bpy.data.images:
-        loadedImage = bpy.data.images.load(textureLocation)
-        loadedImage.name = imageName
+    imageCount = len(bpy.data.images)
+    loadedImage = bpy.data.images.load(textureLocation, check_existing=True)
+    if len(bpy.data.images) > imageCount:
+        imageName, imageExt = os.path.splitext(os.path.basename(textureLocation))
+        loadedImage.name = normalizeName(imageName)
 
-    return bpy.data.images[imageName]
+    return loadedImage
 
 def createStandardMaterial(materialName, textureLocation, blendMode, createEmissive, extension_mode='REPEAT'):
-    material = bpy.data.materials.new(name=materialName)
+    material = _new_datablock('materials', materialName)
     material.use_nodes = True
 
     if blendMode in {2, 4}:
@@ -952,7 +1730,7 @@ def get_mix_node_sockets(mix_node):
     return sockets
 
 def createLiquidMaterial(materialName, liquidType):
-    material = bpy.data.materials.new(name=materialName)
+    material = _new_datablock('materials', materialName)
     material.use_nodes = True
     material.blend_method = 'BLEND'
     
@@ -1027,33 +1805,37 @@ def createLiquidMaterial(materialName, liquidType):
     return material
 
 
-def importLiquidChunks(liquidFile, baseObj, settings):
-    print(f'Attempting to import liquid from: {liquidFile}')
-    
-    try:
-        with open(liquidFile, 'r', encoding='utf-8') as fp:
-            liquid_data = json.load(fp)
-        print(f'Successfully loaded liquid JSON with keys: {list(liquid_data.keys())}')
-    except Exception as e:
-        print(f'Could not read liquid data from {liquidFile}: {e}')
-        return
-    
-    if 'liquidChunks' not in liquid_data:
-        print('No liquidChunks found in JSON data')
-        return
-    
-    liquidparent = bpy.data.objects.new('Liquids', None)
-    liquidparent.parent = baseObj
-    liquidparent.name = 'Liquids'
-    liquidparent.rotation_euler = [0, 0, 0]
-    liquidparent.rotation_euler.x = radians(-90)
-    
-    collection = bpy.context.view_layer.active_layer_collection.collection.objects
-    collection.link(liquidparent)
-    
-    liquidChunks = liquid_data['liquidChunks']
-    print(f'Processing {len(liquidChunks)} liquid chunk slots')
-    
+def _get_liquid_material(liquid_type):
+    material_name = f'Liquid_Type_{liquid_type}'
+    material = bpy.data.materials.get(material_name)
+    if material is None:
+        material = createLiquidMaterial(material_name, liquid_type)
+
+    return material
+
+
+def _import_merged_liquids(liquidChunks, liquidparent, collection, settings):
+    """Build one object per liquid type holding every instance of that type in the tile"""
+    liquids = build_liquid_buffers(liquidChunks)
+
+    for liquid_type, buffers in sorted(liquids.items()):
+        mesh_name = f'Liquid_Type_{liquid_type}'
+        mesh = _new_datablock('meshes', mesh_name)
+        build_mesh(mesh, buffers.positions, buffers.loops, buffers.loop_starts)
+
+        if settings.importTextures:
+            mesh.materials.append(_get_liquid_material(liquid_type))
+
+        liquid_obj = _new_datablock('objects', mesh_name, mesh)
+        liquid_obj.parent = liquidparent
+        collection.link(liquid_obj)
+
+        print(f'Liquid type {liquid_type}: merged {buffers.instances} instances into {buffers.face_count} faces')
+
+    return len(liquids)
+
+
+def _import_liquid_instances(liquidChunks, liquidparent, collection, settings):
     liquid_objects_created = 0
     
     for chunk_idx, chunk in enumerate(liquidChunks):
@@ -1097,8 +1879,8 @@ def importLiquidChunks(liquidFile, baseObj, settings):
                 continue
             
             mesh_name = f'Liquid_Chunk_{chunk_x:02d}_{chunk_y:02d}_{instance_idx}'
-            mesh = bpy.data.meshes.new(mesh_name)
-            liquid_obj = bpy.data.objects.new(mesh_name, mesh)
+            mesh = _new_datablock('meshes', mesh_name)
+            liquid_obj = _new_datablock('objects', mesh_name, mesh)
             
             liquid_obj.parent = liquidparent
             collection.link(liquid_obj)
@@ -1179,27 +1961,57 @@ def importLiquidChunks(liquidFile, baseObj, settings):
                 bm.to_mesh(mesh)
                 
                 if settings.importTextures:
-                    material_name = f'Liquid_Type_{liquid_type}'
-                    material = bpy.data.materials.get(material_name)
-                    if material is None:
-                        material = createLiquidMaterial(material_name, liquid_type)
-                    
-                    liquid_obj.data.materials.append(material)
+                    liquid_obj.data.materials.append(_get_liquid_material(liquid_type))
                 
                 liquid_obj.location = (0, 0, 0)
                 liquid_objects_created += 1
             else:
                 collection.unlink(liquid_obj)
-                bpy.data.objects.remove(liquid_obj)
-                bpy.data.meshes.remove(mesh)
+                _remove_datablock('objects', liquid_obj)
+                _remove_datablock('meshes', mesh)
                 print(f'    Skipped empty liquid instance')
             
             bm.free()
+
+    return liquid_objects_created
+
+
+def importLiquidChunks(liquidFile, baseObj, settings):
+    print(f'Attempting to import liquid from: {liquidFile}')
+    
+    try:
+        with open(liquidFile, 'r', encoding='utf-8') as fp:
+            liquid_data = json.load(fp)
+        print(f'Successfully loaded liquid JSON with keys: {list(liquid_data.keys())}')
+    except Exception as e:
+        print(f'Could not read liquid data from {liquidFile}: {e}')
+        return
     
+    if 'liquidChunks' not in liquid_data:
+        print('No liquidChunks found in JSON data')
+        return
+    
+    liquidparent = _new_datablock('objects', 'Liquids', None)
+    liquidparent.parent = baseObj
+    liquidparent.rotation_euler = [0, 0, 0]
+    liquidparent.rotation_euler.x = radians(-90)
+    _get_source_sync(settings).stamp(liquidFile, [liquidFile], liquidparent)
+    
+    collection = bpy.context.view_layer.active_layer_collection.collection.objects
+    collection.link(liquidparent)
+    
+    liquidChunks = liquid_data['liquidChunks']
+    print(f'Processing {len(liquidChunks)} liquid chunk slots')
+    
+    if settings.mergeLiquids:
+        liquid_objects_created = _import_merged_liquids(liquidChunks, liquidparent, collection, settings)
+    else:
+        liquid_objects_created = _import_liquid_instances(liquidChunks, liquidparent, collection, settings)
+
     # Remove parent if no liquid objects were created
     if liquid_objects_created == 0:
         collection.unlink(liquidparent)
-        bpy.data.objects.remove(liquidparent)
+        _remove_datablock('objects', liquidparent)
         print('No liquid geometry found, removed empty parent object')
     else:
         print(f'Liquid import complete: Created {liquid_objects_created} liquid objects')
@@ -1297,7 +2109,7 @@ def createAdvancedM2Material(material_name, texture_unit, materials, textures, t
     material_index = texture_unit['materialIndex']
     texture_combo_index = texture_unit.get('textureComboIndex', 0)
     
-    material = bpy.data.materials.new(name=material_name)
+    material = _new_datablock('materials', material_name)
     material.use_nodes = True
     
     material_data = materials[material_index] if material_index < len(materials) else {}
@@ -1534,7 +2346,7 @@ def createAdvancedM2Material(material_name, texture_unit, materials, textures, t
     return material
 
 def createBlendedTerrain(materialName, textureLocation, layers, baseDir, extension_mode='REPEAT'):
-    material = bpy.data.materials.new(name=materialName)
+    material = _new_datablock('materials', materialName)
 
     try:
         material.use_nodes = True
@@ -1752,176 +2564,150 @@ def createBlendedTerrain(materialName, textureLocation, layers, baseDir, extensi
     except Exception as e:
         print('failed to create terrain material for %s' % materialName)
         print(e)
-        bpy.data.materials.remove(material)
+        _remove_datablock('materials', material)
 
 def importWoWOBJ(objectFile, givenParent = None, settings = None):
+    return run_steps(importWoWOBJSteps(objectFile, givenParent, settings))
+
+def importWoWOBJSteps(objectFile, givenParent = None, settings = None, importPlacements = True):
+    progress = _get_progress(settings)
+    progress.depth += 1
+    try:
+        with _get_profiler(settings).stage('model', os.path.basename(objectFile)):
+            return (yield from _importWoWOBJ(objectFile, givenParent, settings, importPlacements))
+    finally:
+        progress.depth -= 1
+        progress.models_done += 1
+
+def _importModel(objectFile, settings):
+    """Build the object and mesh of one OBJ export, without its liquids and placements"""
     baseDir, fileName = os.path.split(objectFile)
+    profiler = _get_profiler(settings)
+    progress = _get_progress(settings)
+
+    # models converted in an earlier session come from the asset library
+    assetCache = getattr(settings, '_asset_cache', None)
+    assetKey = None
+    if assetCache is not None and not isTerrainFile(fileName):
+        sources = model_sources(objectFile)
+        assetRecord = _get_source_sync(settings).record(objectFile, sources)
+        assetKey = assetCache.key(assetRecord, settings)
+
+        stage = profiler.begin('asset')
+        obj = assetCache.load(assetKey, _get_image_registry(settings), _get_material_cache(settings))
+        profiler.end(stage)
+        if obj is not None:
+            print(f'Loaded {fileName} from the asset library')
+            _rename_datablock('objects', obj, fileName)
+            _get_source_sync(settings).stamp(objectFile, sources, obj)
+            if obj.data.library is None:
+                _get_source_sync(settings).stamp(objectFile, sources, obj.data)
+
+            collection = bpy.context.view_layer.active_layer_collection.collection.objects
+            return (yield from _finish_model(obj, collection, progress))
 
     print('Parsing OBJ: ' + fileName)
-    ### OBJ wide
-    material_libs = set()
-    mtlfile = ''
-    verts = []
-    normals = []
-    uvs = []
-    vertex_colors = []
-    meshes = []
-
-    ### Per group
-    class OBJMesh:
-        def __init__(self):
-            self.usemtl = ''
-            self.name = ''
-            self.verts = set()
-            self.faces = []
-
-    json_info = {}
+
+    # with parallel parsing this is the time spent waiting on the workers
+    stage = profiler.begin('parse')
+    prefetcher = getattr(settings, '_prefetcher', None)
+    if prefetcher is not None:
+        model = prefetcher.get(objectFile)
+    else:
+        model = load_model(objectFile, getattr(settings, '_parse_cache', None))
+    objData = model.obj
+    profiler.end(stage, sum(size for size, mtime in model.sources.values()))
+    progress.set_stage('materials')
+    yield
+
+    json_info = model.json_info
     try:
-        with open(os.path.join(baseDir, fileName[:fileName.rfind('.')] + '.json')) as fp:
-            json_info = json.load(fp)
-            if json_info.get('fileType') == 'm2':
-                # Create mapping from skin section index to texture unit
-                json_info['skinTexUnits'] = {i['skinSectionIndex']: i for i in json_info['skin']['textureUnits']}
-                # Create mapping from mesh name to skin section index for proper lookup
-                json_info['meshToSkinSection'] = {}
-                # Extract texture transform data for animation
-                json_info['textureTransforms'] = json_info.get('textureTransforms', [])
-                json_info['textureTransformsLookup'] = json_info.get('textureTransformsLookup', [])
-            elif json_info.get('fileType') == 'wmo':
-                json_info['mtlTextureIds'] = {i['fileDataID']: i['mtlName'] for i in json_info['textures']}
-
-                # texture file path lookup by fileDataID
-                json_info['texturePathsByFDID'] = {
-                    t['fileDataID']: t.get('fileNameExternal', '')
-                    for t in json_info.get('textures', [])
-                    if t.get('fileNameExternal')
-                }
-
-                # material index lookup by MTL name
-                json_info['mtlIndexes'] = {}
-                for idx, data in enumerate(json_info.get('materials', [])):
-                    # shader 23 (pixelShader 20) uses texture2 as the MTL material
-                    if data.get('shader') == 23:
-                        tex_id = data.get('texture2', 0)
-                    else:
-                        tex_id = data.get('texture1', 0)
+        if json_info.get('fileType') == 'm2':
+            # Create mapping from skin section index to texture unit
+            json_info['skinTexUnits'] = {i['skinSectionIndex']: i for i in json_info['skin']['textureUnits']}
+            # Create mapping from mesh name to skin section index for proper lookup
+            json_info['meshToSkinSection'] = {}
+            # Extract texture transform data for animation
+            json_info['textureTransforms'] = json_info.get('textureTransforms', [])
+            json_info['textureTransformsLookup'] = json_info.get('textureTransformsLookup', [])
+        elif json_info.get('fileType') == 'wmo':
+            json_info['mtlTextureIds'] = {i['fileDataID']: i['mtlName'] for i in json_info['textures']}
+
+            # texture file path lookup by fileDataID
+            json_info['texturePathsByFDID'] = {
+                t['fileDataID']: t.get('fileNameExternal', '')
+                for t in json_info.get('textures', [])
+                if t.get('fileNameExternal')
+            }
+
+            # material index lookup by MTL name
+            json_info['mtlIndexes'] = {}
+            for idx, data in enumerate(json_info.get('materials', [])):
+                # shader 23 (pixelShader 20) uses texture2 as the MTL material
+                if data.get('shader') == 23:
+                    tex_id = data.get('texture2', 0)
+                else:
+                    tex_id = data.get('texture1', 0)
 
-                    if tex_id in json_info['mtlTextureIds']:
-                        mtl_name = json_info['mtlTextureIds'][tex_id]
-                        if mtl_name not in json_info['mtlIndexes']:
-                            json_info['mtlIndexes'][mtl_name] = idx
+                if tex_id in json_info['mtlTextureIds']:
+                    mtl_name = json_info['mtlTextureIds'][tex_id]
+                    if mtl_name not in json_info['mtlIndexes']:
+                        json_info['mtlIndexes'][mtl_name] = idx
     except:
         pass
 
-    curMesh = OBJMesh()
+
+    # resolve the material of every group, including blending mode variants
+    groupMaterials = []
     matBlendModes = defaultdict(list)
-    meshIndex = -1
-    with open(objectFile, 'rb') as f:
-        for line in f:
-            line_split = line.split()
-            if not line_split:
-                continue
-            line_start = line_split[0]
-            if line_start == b'mtllib':
-                mtlfile = line_split[1]
-            elif line_start == b'v':
-                verts.append([float(v) for v in line_split[1:]])
-            elif line_start == b'vn':
-                normals.append([float(v) for v in line_split[1:]])
-            elif line_start == b'vc':
-                vertex_colors.append([float(v) for v in line_split[1:]])
-            elif line_start.startswith(b'vt'):
-                layer_index = 0
-
-                if len(line_start) > 2:
-                    line_str = line_start.decode('utf8')
-                    layer_index = int(line_str[-1]) - 1
-
-                if len(uvs) <= layer_index:
-                    uvs.append([])
-
-                uvs[layer_index].append([float(v) for v in line_split[1:]])
-            elif line_start == b'f':
-                line_split = line_split[1:]
-                fv = [int(v.split(b'/')[0]) for v in line_split]
-                meshes[meshIndex].faces.append((fv[0], fv[1], fv[2]))
-                meshes[meshIndex].verts.update([i - 1 for i in fv])
-            elif line_start == b'g':
-                meshIndex += 1
-                meshes.append(OBJMesh())
-                meshes[meshIndex].name = line_split[1].decode('utf-8')
-                # Extract skin section index from mesh name for M2 files
+    for meshIndex, group in enumerate(objData.groups):
+        # Extract skin section index from mesh name for M2 files
+        if json_info.get('fileType') == 'm2':
+            # Mesh names are typically like 'Geoset_000', extract the number
+            try:
+                skin_section_idx = int(group.name.split('_')[-1])
+                json_info['meshToSkinSection'][meshIndex] = skin_section_idx
+            except (ValueError, IndexError):
+                # Fallback: use mesh index if name parsing fails
+                json_info['meshToSkinSection'][meshIndex] = meshIndex
+
+        materialName = ''
+        if group.material:
+            materialName = normalizeName(group.material)
+
+            if settings.useAlpha:
+                blendingMode = None
+
                 if json_info.get('fileType') == 'm2':
-                    mesh_name = meshes[meshIndex].name
-                    # Mesh names are typically like 'Geoset_000', extract the number
+                    blendingMode = json_info['materials'][json_info['skinTexUnits'][meshIndex]['materialIndex']]['blendingMode']
+                elif json_info.get('fileType') == 'wmo':
                     try:
-                        skin_section_idx = int(mesh_name.split('_')[-1])
-                        json_info['meshToSkinSection'][meshIndex] = skin_section_idx
-                    except (ValueError, IndexError):
-                        # Fallback: use mesh index if name parsing fails
-                        json_info['meshToSkinSection'][meshIndex] = meshIndex
-            elif line_start == b'usemtl':
-                materialName = normalizeName(line_split[1].decode('utf-8'))
-
-                if settings.useAlpha:
-                    blendingMode = None
-
-                    if json_info.get('fileType') == 'm2':
-                        blendingMode = json_info['materials'][json_info['skinTexUnits'][meshIndex]['materialIndex']]['blendingMode']
-                    elif json_info.get('fileType') == 'wmo':
-                        try:
-                            blendingMode = json_info['materials'][json_info['mtlIndexes'][materialName]]['blendMode']
-                        except KeyError:
-                            print('error getting material blending mode for %s' % materialName)
+                        blendingMode = json_info['materials'][json_info['mtlIndexes'][materialName]]['blendMode']
+                    except KeyError:
+                        print('error getting material blending mode for %s' % materialName)
 
-                    if blendingMode is not None:
-                        matBlendModes[materialName].append(blendingMode)
-                        # use texture with specific blending mode
-                        materialName += '_B' + str(blendingMode)
+                if blendingMode is not None:
+                    matBlendModes[materialName].append(blendingMode)
+                    # use texture with specific blending mode
+                    materialName += '_B' + str(blendingMode)
 
-                meshes[meshIndex].usemtl = materialName
+        groupMaterials.append(materialName)
 
     # Defaults to master collection if no collection exists.
     collection = bpy.context.view_layer.active_layer_collection.collection.objects
 
     ## Materials file (.mtl)
     materials = dict()
-    matname = ''
-    matfile = ''
-    if mtlfile != '':
-        with open(os.path.join(baseDir, mtlfile.decode('utf-8') ), 'r') as f:
-            for line in f:
-                line_split = line.split()
-                if not line_split:
-                    continue
-                line_start = line_split[0]
-
-                if line_start == 'newmtl':
-                    matname = normalizeName(line_split[1])
-                elif line_start == 'map_Kd':
-                    matfile = line_split[1]
-                    materials[matname] = os.path.join(baseDir, matfile)
-
-    if bpy.ops.object.select_all.poll():
-        bpy.ops.object.select_all(action='DESELECT')
-
-
-    # TODO: Better handling for dupes?
-    objname = os.path.basename(objectFile)
-
-    if objname in bpy.data.objects:
-        objindex = 1
-        newname = objname
-        while(newname in bpy.data.objects):
-            newname = objname + '.' + str(objindex).rjust(3, '0')
-            objindex += 1
-
-    newmesh = bpy.data.meshes.new(objname)
-    obj = bpy.data.objects.new(objname, newmesh)
+    for matname, matfile in model.materials.items():
+        materials[normalizeName(matname)] = matfile
 
     # Create a new material instance for each material entry.
+    stage = profiler.begin('materials')
+    materialSlots = {}
+    slotMaterials = []
     if settings.importTextures:
-        usedMaterials = {mesh.usemtl for mesh in meshes}
+        usedMaterials = set(groupMaterials)
+        materialCache = _get_material_cache(settings)
         
         # Detect terrain file and texture extension mode
         terrainFile = isTerrainFile(fileName)
@@ -1946,11 +2732,17 @@ def importWoWOBJ(objectFile, givenParent = None, settings = None):
                         pass
 
                     if 'layers' in material_json:
-                        material = createBlendedTerrain(materialName, textureLocation, material_json['layers'], baseDir, textureExtensionMode)
+                        material = materialCache.get(
+                            terrain_material_key(textureLocation, material_json['layers'], baseDir, textureExtensionMode),
+                            lambda: createBlendedTerrain(materialName, textureLocation, material_json['layers'], baseDir, textureExtensionMode)
+                        )
                 
                 if material is None and materialName in usedMaterials and is_wmo_shader20(json_info, materialName):
                     try:
-                        material = createWMOShader20Material(materialName, json_info, baseDir)
+                        material = materialCache.get(
+                            wmo_shader20_material_key(json_info, baseDir, materialName),
+                            lambda: createWMOShader20Material(materialName, json_info, baseDir)
+                        )
                     except Exception as e:
                         print('failed to create WMO shader 20 material for %s: %s' % (materialName, e))
                         material = None
@@ -1959,8 +2751,8 @@ def importWoWOBJ(objectFile, givenParent = None, settings = None):
                     if has_advanced_m2_data(json_info):
                         # Find the FIRST mesh that uses this material to get the correct texture unit
                         texture_unit_found = None
-                        for mesh_idx, mesh in enumerate(meshes):
-                            if mesh.usemtl == materialName or mesh.usemtl.startswith(materialName + '_B'):
+                        for mesh_idx, usemtl in enumerate(groupMaterials):
+                            if usemtl == materialName or usemtl.startswith(materialName + '_B'):
                                 # Use the mesh to skin section mapping
                                 skin_section_idx = json_info['meshToSkinSection'].get(mesh_idx, mesh_idx)
                                 if skin_section_idx in json_info.get('skinTexUnits', {}):
@@ -1973,11 +2765,20 @@ def importWoWOBJ(objectFile, givenParent = None, settings = None):
                             json_texture_combos = json_info.get('textureCombos', [])
                             json_texture_transforms = json_info.get('textureTransforms', [])
                             json_texture_transforms_lookup = json_info.get('textureTransformsLookup', [])
-                            material = createAdvancedM2Material(materialName, texture_unit_found, json_materials, json_textures, json_texture_combos, settings, baseDir, json_texture_transforms, json_texture_transforms_lookup, textureLocation)
+                            material = materialCache.get(
+                                advanced_m2_material_key(texture_unit_found, json_materials, json_textures, json_texture_combos, settings, baseDir, json_texture_transforms, json_texture_transforms_lookup, textureLocation),
+                                lambda: createAdvancedM2Material(materialName, texture_unit_found, json_materials, json_textures, json_texture_combos, settings, baseDir, json_texture_transforms, json_texture_transforms_lookup, textureLocation)
+                            )
                         else:
-                            material = createStandardMaterial(materialName, textureLocation, -1, False, textureExtensionMode)
+                            material = materialCache.get(
+                                standard_material_key(textureLocation, -1, False, textureExtensionMode),
+                                lambda: createStandardMaterial(materialName, textureLocation, -1, False, textureExtensionMode)
+                            )
                     else:
-                        material = createStandardMaterial(materialName, textureLocation, -1, False, textureExtensionMode)
+                        material = materialCache.get(
+                            standard_material_key(textureLocation, -1, False, textureExtensionMode),
+                            lambda: createStandardMaterial(materialName, textureLocation, -1, False, textureExtensionMode)
+                        )
 
             if settings.useAlpha:
                 for bm, (materialBName, materialBMat) in materialB.items():
@@ -1985,15 +2786,21 @@ def importWoWOBJ(objectFile, givenParent = None, settings = None):
                     if materialBName in usedMaterials and materialBMat is None:
                         if is_wmo_shader20(json_info, materialName):
                             try:
-                                materialB[bm] = (materialBName, createWMOShader20Material(materialBName, json_info, baseDir, lookup_name=materialName))
+                                materialB[bm] = (materialBName, materialCache.get(
+                                    wmo_shader20_material_key(json_info, baseDir, materialName),
+                                    lambda: createWMOShader20Material(materialBName, json_info, baseDir, lookup_name=materialName)
+                                ))
                             except Exception as e:
                                 print('failed to create WMO shader 20 blend material for %s: %s' % (materialBName, e))
-                                materialB[bm] = (materialBName, createStandardMaterial(materialBName, textureLocation, bm, settings.createEmissiveMaterials, textureExtensionMode))
+                                materialB[bm] = (materialBName, materialCache.get(
+                                    standard_material_key(textureLocation, bm, settings.createEmissiveMaterials, textureExtensionMode),
+                                    lambda: createStandardMaterial(materialBName, textureLocation, bm, settings.createEmissiveMaterials, textureExtensionMode)
+                                ))
                         elif has_advanced_m2_data(json_info):
                             # Find the mesh that uses this blend mode material
                             texture_unit_found = None
-                            for mesh_idx, mesh in enumerate(meshes):
-                                if mesh.usemtl == materialBName:
+                            for mesh_idx, usemtl in enumerate(groupMaterials):
+                                if usemtl == materialBName:
                                     skin_section_idx = json_info['meshToSkinSection'].get(mesh_idx, mesh_idx)
                                     if skin_section_idx in json_info.get('skinTexUnits', {}):
                                         texture_unit_found = json_info['skinTexUnits'][skin_section_idx]
@@ -2005,158 +2812,209 @@ def importWoWOBJ(objectFile, givenParent = None, settings = None):
                                 json_texture_combos = json_info.get('textureCombos', [])
                                 json_texture_transforms = json_info.get('textureTransforms', [])
                                 json_texture_transforms_lookup = json_info.get('textureTransformsLookup', [])
-                                materialB[bm] = (materialBName, createAdvancedM2Material(materialBName, texture_unit_found, json_materials, json_textures, json_texture_combos, settings, baseDir, json_texture_transforms, json_texture_transforms_lookup, textureLocation))
+                                materialB[bm] = (materialBName, materialCache.get(
+                                    advanced_m2_material_key(texture_unit_found, json_materials, json_textures, json_texture_combos, settings, baseDir, json_texture_transforms, json_texture_transforms_lookup, textureLocation),
+                                    lambda: createAdvancedM2Material(materialBName, texture_unit_found, json_materials, json_textures, json_texture_combos, settings, baseDir, json_texture_transforms, json_texture_transforms_lookup, textureLocation)
+                                ))
                             else:
-                                materialB[bm] = (materialBName, createStandardMaterial(materialBName, textureLocation, bm, settings.createEmissiveMaterials, textureExtensionMode))
+                                materialB[bm] = (materialBName, materialCache.get(
+                                    standard_material_key(textureLocation, bm, settings.createEmissiveMaterials, textureExtensionMode),
+                                    lambda: createStandardMaterial(materialBName, textureLocation, bm, settings.createEmissiveMaterials, textureExtensionMode)
+                                ))
                         else:
-                            materialB[bm] = (materialBName, createStandardMaterial(materialBName, textureLocation, bm, settings.createEmissiveMaterials, textureExtensionMode))
+                            materialB[bm] = (materialBName, materialCache.get(
+                                standard_material_key(textureLocation, bm, settings.createEmissiveMaterials, textureExtensionMode),
+                                lambda: createStandardMaterial(materialBName, textureLocation, bm, settings.createEmissiveMaterials, textureExtensionMode)
+                            ))
 
             if materialName in usedMaterials:
-                obj.data.materials.append(material)
+                materialSlots[materialName] = _append_material_slot(slotMaterials, material)
 
             for (materialBName, materialBMat) in materialB.values():
                 if materialBName in usedMaterials:
-                    obj.data.materials.append(materialBMat)
-
-    ## Meshes
-    bm = bmesh.new()
+                    materialSlots[materialBName] = _append_material_slot(slotMaterials, materialBMat)
 
-    i = 0
-    for v in verts:
-        vert = bm.verts.new(v)
-        vert.normal = normals[i]
-        i = i + 1
+    profiler.end(stage)
+    progress.set_stage('mesh')
+    yield
 
-    bm.verts.ensure_lookup_table()
-    bm.verts.index_update()
+    ## Meshes
+    stage = profiler.begin('mesh')
+    groupSlots = [materialSlots.get(usemtl, 0) for usemtl in groupMaterials]
+    sharedMesh, sharedMaterials = _find_shared_mesh(objData, groupSlots, slotMaterials, settings)
 
-    for mesh in meshes:
-        exampleFaceSet = False
-        for face in mesh.faces:
-            try:
-                ## TODO: Must be a better way to do this, this is already much faster than doing material every face, but still.
-                if exampleFaceSet == False:
-                    bm.faces.new((
-                        bm.verts[face[0] - 1],
-                        bm.verts[face[1] - 1],
-                        bm.verts[face[2] - 1]
-                    ))
-                    bm.faces.ensure_lookup_table()
-
-                    if mesh.usemtl:
-                        bm.faces[-1].material_index = obj.data.materials.find(mesh.usemtl)
-
-                    bm.faces[-1].smooth = True
-                    exampleFace = bm.faces[-1]
-                    exampleFaceSet = True
-                else:
-                    ## Use example face if set to speed up material copy!
-                    bm.faces.new((
-                        bm.verts[face[0] - 1],
-                        bm.verts[face[1] - 1],
-                        bm.verts[face[2] - 1]
-                    ), exampleFace)
-            except ValueError:
-                ## TODO: Duplicate faces happen for some reason
-                pass
-
-    for layer_index, layer in enumerate(uvs):
+    # later imports of the same model find it by this name, copies get a suffix
+    objname = os.path.basename(objectFile)
+    if sharedMesh is not None:
+        obj = _new_datablock('objects', objname, sharedMesh)
+        _get_source_sync(settings).stamp(objectFile, model.sources, obj)
+        _link_shared_materials(obj, sharedMaterials)
+
+        # vertex groups are named per object, their weights are already in the mesh
+        if settings.createVertexGroups:
+            for groupIndex in sharedMesh[GEOMETRY_PROP].get('vertex_groups', ()):
+                obj.vertex_groups.new(name=f"{objData.groups[groupIndex].name}")
+
+        _get_geometry_registry(settings).shared += 1
+        profiler.end(stage)
+        if assetKey is not None:
+            assetCache.queue(assetKey, obj, objectFile, assetRecord, settings)
+        return (yield from _finish_model(obj, collection, progress))
+
+    newmesh = _new_datablock('meshes', objname)
+    obj = _new_datablock('objects', objname, newmesh)
+    _get_source_sync(settings).stamp(objectFile, model.sources, obj, newmesh)
+    for material in slotMaterials:
+        newmesh.materials.append(material)
+
+    groupMaterialIndices = array('i')
+    for group, materialIndex in zip(objData.groups, groupSlots):
+        groupMaterialIndices.extend([materialIndex] * group.face_count)
+
+    # duplicate faces happen for some reason, drop them like bmesh would
+    loops, materialIndices = filter_triangles(objData.faces, groupMaterialIndices)
+
+    uvLayers = []
+    for layer_index, layer in enumerate(objData.uv_layers):
         uv_name = layer_index > 0 and ('UV' + str(layer_index + 1) + 'Map') or 'UVMap'
-        uv_layer = bm.loops.layers.uv.new(uv_name)
-
-        for face in bm.faces:
-            for loop in face.loops:
-                loop[uv_layer].uv = layer[loop.vert.index]
+        uvLayers.append((uv_name, layer))
 
-    bm.to_mesh(newmesh)
-    bm.free()
+    build_mesh(newmesh, objData.positions, loops, array('i', range(0, len(loops), 3)), materialIndices, uvLayers)
 
     # import vertex colors as color attribute for WMO shader 20 blend weights
-    if vertex_colors:
+    if objData.colors:
         color_layer = newmesh.color_attributes.new(name='wmo_colors2', type='FLOAT_COLOR', domain='POINT')
-        for i, color in enumerate(vertex_colors):
-            if i < len(color_layer.data):
-                color_layer.data[i].color = color if len(color) >= 4 else [*color, 1.0]
+        colorBuffer = array('f', bytes(len(color_layer.data) * 16))
+        color_layer.data.foreach_get('color', colorBuffer)
+        fill_colors(colorBuffer, objData.colors, objData.color_size)
+        color_layer.data.foreach_set('color', colorBuffer)
 
     # needed to have a mesh before we can create vertex groups, so do that now
+    vertexGroups = []
     if settings.createVertexGroups:
-        for mesh in sorted(meshes, key=lambda m: m.name.lower()):
-            vg = obj.vertex_groups.new(name=f"{mesh.name}")
-            vg.add(list(mesh.verts), 1.0, "REPLACE")
+        vertexGroups = sorted(range(len(objData.groups)), key=lambda index: objData.groups[index].name.lower())
+        for groupIndex in vertexGroups:
+            group = objData.groups[groupIndex]
+            vg = obj.vertex_groups.new(name=f"{group.name}")
+            vg.add(objData.group_vertices(group), 1.0, "REPLACE")
 
+    _get_geometry_registry(settings).add(objData.fingerprint, newmesh, groupSlots, vertexGroups)
+    profiler.end(stage, len(objData.positions) * 4 + len(loops) * 4)
+
+    if assetKey is not None:
+        # written once the images are loaded, at the end of the session
+        assetCache.queue(assetKey, obj, objectFile, assetRecord, settings)
+    return (yield from _finish_model(obj, collection, progress))
+
+
+def _finish_model(obj, collection, progress):
     ## Rotate object the right way
     obj.rotation_euler = [0, 0, 0]
     obj.rotation_euler.x = radians(90)
 
     collection.link(obj)
-    obj.select_set(True)
+    progress.set_stage('liquids')
+    yield
+
+    return obj
 
 
+def _importWoWOBJ(objectFile, givenParent, settings, importPlacements=True):
+    baseDir, fileName = os.path.split(objectFile)
+    profiler = _get_profiler(settings)
+    progress = _get_progress(settings)
+
+    # an incremental import updates a file already in the scene instead of importing it again
+    reuse = False
+    if settings.incrementalSync and importPlacements and givenParent is None and progress.depth == 1:
+        obj = _get_source_sync(settings).find_root(objectFile)
+        if obj is not None:
+            reuse = True
+            print(f'[WoWOBJ][{fileName}] Updating {obj.name} in place')
+            yield from _refresh_model(objectFile, settings)
+            progress.set_stage('liquids')
+
+    if not reuse:
+        obj = yield from _importModel(objectFile, settings)
+
+    if not importPlacements:
+        return obj
+
+    collection = bpy.context.view_layer.active_layer_collection.collection.objects
+
     ## Import liquids
     if settings.importLiquid:
-        baseDir, fileName = os.path.split(objectFile)
-        baseName = fileName[:fileName.rfind('.')]
-        tileID = baseName.replace('adt_', '') if baseName.startswith('adt_') else baseName
-        liquidPath = os.path.join(baseDir, f'liquid_{tileID}.json')
+        liquidPath = get_liquid_path(objectFile)
         print(f'Checking for liquid file: {liquidPath}')
-        if os.path.exists(liquidPath):
+
+        if reuse:
+            sourceSync = _get_source_sync(settings)
+            liquids = [child for child in obj.children if child.get(SOURCE_PROP) is not None and child[SOURCE_PROP].get('path') == liquidPath]
+            if liquids and os.path.exists(liquidPath) and all(sourceSync.is_current(child[SOURCE_PROP]) for child in liquids):
+                liquidPath = None
+            else:
+                _remove_objects(liquids)
+
+        if liquidPath is not None and os.path.exists(liquidPath):
             print(f'Liquid file found! Importing liquid data from {liquidPath}')
+            stage = profiler.begin('liquids')
             importLiquidChunks(liquidPath, obj, settings)
-        else:
+            profiler.end(stage, os.path.getsize(liquidPath))
+            yield
+        elif liquidPath is not None:
             print(f'No liquid file found at {liquidPath}')
 
     ## Import doodads and/or WMOs
-    csvPath = objectFile.replace('.obj', '_ModelPlacementInformation.csv')
+    csvPath = get_placement_path(objectFile)
     use_csv = settings.importWMO or settings.importM2 or settings.importWMOSets or settings.importGOBJ
 
     if use_csv and os.path.exists(csvPath):
+        stage = profiler.begin('placements')
+        progress.set_stage('placements')
         placementStats = _new_placement_stats(fileName)
+        pointInstances = {}
+        mergedPlacements = defaultdict(list)
         print(f"[WoWOBJ][{fileName}] Importing placement CSV: {csvPath}")
 
         with open(csvPath, newline='', encoding='utf-8') as csvFile:
-            reader = csv.DictReader(csvFile, delimiter=';')
-            if 'Type' in reader.fieldnames:
+            placements = PlacementTable.read(csvFile)
+            if placements.is_adt:
                 importType = 'ADT'
-
-                wmoparent = None
-                if settings.importWMO:
-                    wmoparent = bpy.data.objects.new('WMOs', None)
-                    wmoparent.parent = obj
-                    wmoparent.name = 'WMOs'
-                    wmoparent.rotation_euler = [0, 0, 0]
-                    wmoparent.rotation_euler.x = radians(-90)
-                    collection.link(wmoparent)
-
-                doodadparent = None
-                if settings.importM2:
-                    doodadparent = bpy.data.objects.new('Doodads', None)
-                    doodadparent.parent = obj
-                    doodadparent.name = 'Doodads'
-                    doodadparent.rotation_euler = [0, 0, 0]
-                    doodadparent.rotation_euler.x = radians(-90)
-                    collection.link(doodadparent)
-
-                gobjparent = None
-                if settings.importGOBJ:
-                    gobjparent = bpy.data.objects.new('GameObjects', None)
-                    gobjparent.parent = obj
-                    gobjparent.name = 'GameObjects'
-                    gobjparent.rotation_euler = [0, 0, 0]
-                    gobjparent.rotation_euler.x = radians(-90)
-                    collection.link(gobjparent)
+                placementIndex = _get_placement_index(settings)
+                if reuse:
+                    placementIndex.forget(obj.name)
+
+                # rows outside the placement filter are dropped before any of their files is read
+                spatialFilter = _get_spatial_filter(settings)
+                inRange = spatialFilter.select(placements) if spatialFilter is not None else None
+
+                wmoparent = _get_placement_parent(obj, 'WMOs', collection, reuse) if settings.importWMO else None
+                doodadparent = _get_placement_parent(obj, 'Doodads', collection, reuse) if settings.importM2 else None
+                gobjparent = _get_placement_parent(obj, 'GameObjects', collection, reuse) if settings.importGOBJ else None
+                placementParents = [parent for parent in (wmoparent, doodadparent, gobjparent) if parent is not None]
             else:
                 importType = 'WMO'
                 if not givenParent:
                     print('WMO import without given parent, creating..')
                     if settings.importWMOSets:
-                        givenParent = bpy.data.objects.new('WMO parent', None)
-                        givenParent.parent = obj
-                        givenParent.name = 'Doodads'
-                        givenParent.rotation_euler = [0, 0, 0]
-                        givenParent.rotation_euler.x = radians(-90)
-                        collection.link(givenParent)
-
-            for rowIndex, row in enumerate(reader, start=2):
+                        givenParent = _get_placement_parent(obj, 'Doodads', collection, reuse)
+                placementParents = [givenParent or obj]
+
+            # placements already in the scene, matched against the rows by key and removed if none is left
+            existingPlacements = None
+            if reuse:
+                existingPlacements, combinedObjects = _collect_placements(placementParents)
+                # point instances and merged meshes don't have an object per row, they are all created again
+                _remove_objects(combinedObjects)
+
+            rows = placements.rows
+            for rowIndex, row in enumerate(rows, start=2):
+                # one row per slice, models placed by the row are sliced further
+                yield
+                if progress.cancelled:
+                    break
+
+                progress.set_rows(rowIndex - 2, len(rows))
                 placementStats['rows_total'] += 1
 
                 if importType == 'ADT':
@@ -2170,67 +3028,82 @@ def importWoWOBJ(objectFile, givenParent = None, settings = None):
                     else:
                         placementStats['rows_other'] += 1
 
-                    tempModelIDList = bpy.context.scene.get('importedModelIDs', [])
-                    modelID = row.get('ModelId')
-                    if modelID:
-                        if modelID in tempModelIDList and not settings.allowDuplicates:
-                            placementStats['skipped_duplicates'] += 1
-                            print('Skipping already imported model ' + modelID)
-                            continue
+                    if inRange is not None and rowIndex - 2 not in inRange:
+                        placementStats['skipped_out_of_range'] += 1
+                        continue
 
-                        if modelID not in tempModelIDList:
-                            tempModelIDList.append(modelID)
-                            bpy.context.scene['importedModelIDs'] = tempModelIDList
+                    modelID = row.get('ModelId')
+                    if modelID and modelID in placementIndex and not settings.allowDuplicates:
+                        placementStats['skipped_duplicates'] += 1
+                        print('Skipping already imported model ' + modelID)
+                        continue
 
                     modelFile = row.get('ModelFile', '')
-                    modelName = os.path.basename(modelFile)
+                    modelName = normalizeName(os.path.basename(modelFile))
                     modelPath = os.path.normpath(os.path.join(baseDir, modelFile))
 
+                    placedBefore = _placed_count(placementStats)
                     try:
+                        placementKey = placements.key(rowIndex - 2)
+                        if settings.incrementalSync:
+                            yield from _refresh_model(modelPath, settings)
+
+                        if existingPlacements and existingPlacements.get(placementKey):
+                            # unchanged row, the placement from the earlier import stays
+                            existingPlacements[placementKey].pop()
+                            placementStats['kept'] += 1
+                            continue
+
                         if rowType == 'wmo':
                             if not settings.importWMO:
                                 placementStats['skipped_disabled_or_unknown'] += 1
                                 continue
 
                             print('ADT WMO import: ' + modelFile)
+                            matrix = Matrix(placements.matrix(rowIndex - 2))
 
                             # Make WMO parent that holds WMO and doodads
-                            parent = bpy.data.objects.new(modelName + ' parent', None)
+                            parent = _new_datablock('objects', modelName + ' parent', None)
                             parent.parent = wmoparent
-                            parent.location = (MAX_SIZE - float(row['PositionX']), (MAX_SIZE - float(row['PositionZ'])) * -1, float(row['PositionY']))
-                            parent.rotation_euler = [0, 0, 0]
-                            parent.rotation_euler.x += radians(float(row['RotationZ']))
-                            parent.rotation_euler.y += radians(float(row['RotationX']))
-                            parent.rotation_euler.z = radians((90 + float(row['RotationY'])))
-
-                            if row['ScaleFactor']:
-                                parent.scale = (float(row['ScaleFactor']), float(row['ScaleFactor']), float(row['ScaleFactor']))
-
+                            parent.matrix_basis = matrix
+                            parent[PLACEMENT_PROP] = placementKey
                             collection.link(parent)
 
+                            if settings.useProxies:
+                                # the proxy takes the place of the WMO object, which only has the OBJ orientation
+                                if _place_proxy(modelPath, parent, Matrix.Rotation(radians(90), 4, 'X'), collection, None, settings) is None:
+                                    placementStats['missing_files'] += 1
+                                    _remove_datablock('objects', parent)
+                                    _log_placement_issue(placementStats, f"[WoWOBJ][{fileName}] Missing WMO model (line {rowIndex}): {modelPath}")
+                                    continue
+                                placementStats['imported_wmo'] += 1
+                                continue
+
                             ## Only import OBJ if model is not yet in scene, otherwise copy existing
+                            ## Don't copy WMOs with doodads!
+                            modelPlacementPath = get_placement_path(modelPath)
                             if modelName not in bpy.data.objects:
                                 if not os.path.exists(modelPath):
                                     placementStats['missing_files'] += 1
-                                    bpy.data.objects.remove(parent, do_unlink=True)
+                                    _remove_datablock('objects', parent)
                                     _log_placement_issue(placementStats, f"[WoWOBJ][{fileName}] Missing WMO model (line {rowIndex}): {modelPath}")
                                     continue
-                                importedFile = importWoWOBJ(modelPath, parent, settings)
+                                importedFile = yield from importWoWOBJSteps(modelPath, parent, settings)
+
+                                # the collection instance carries the OBJ orientation itself
+                                if settings.instancingMode in INSTANCE_COLLECTION_MODES and not os.path.exists(modelPlacementPath):
+                                    importedFile = _new_placement_object(modelName, importedFile, collection, settings)
                             else:
-                                ## Don't copy WMOs with doodads!
-                                modelPlacementPath = os.path.splitext(modelPath)[0] + '_ModelPlacementInformation.csv'
                                 if os.path.exists(modelPlacementPath):
                                     if not os.path.exists(modelPath):
                                         placementStats['missing_files'] += 1
-                                        bpy.data.objects.remove(parent, do_unlink=True)
+                                        _remove_datablock('objects', parent)
                                         _log_placement_issue(placementStats, f"[WoWOBJ][{fileName}] Missing WMO model with placements (line {rowIndex}): {modelPath}")
                                         continue
-                                    importedFile = importWoWOBJ(modelPath, parent, settings)
+                                    importedFile = yield from importWoWOBJSteps(modelPath, parent, settings)
                                 else:
                                     originalObject = bpy.data.objects[modelName]
-                                    importedFile = originalObject.copy()
-                                    importedFile.data = originalObject.data.copy()
-                                    collection.link(importedFile)
+                                    importedFile = _new_placement_object(modelName, originalObject, collection, settings, copyData=True)
 
                             importedFile.parent = parent
                             placementStats['imported_wmo'] += 1
@@ -2240,6 +3113,15 @@ def importWoWOBJ(objectFile, givenParent = None, settings = None):
                                 continue
 
                             print('ADT M2 import: ' + modelFile)
+                            matrix = Matrix(placements.matrix(rowIndex - 2))
+
+                            if settings.useProxies:
+                                if _place_proxy(modelPath, doodadparent, matrix, collection, placementKey, settings) is None:
+                                    placementStats['missing_files'] += 1
+                                    _log_placement_issue(placementStats, f"[WoWOBJ][{fileName}] Missing M2 model (line {rowIndex}): {modelPath}")
+                                    continue
+                                placementStats['imported_m2'] += 1
+                                continue
 
                             ## Only import OBJ if model is not yet in scene, otherwise copy existing
                             if modelName not in bpy.data.objects:
@@ -2247,49 +3129,72 @@ def importWoWOBJ(objectFile, givenParent = None, settings = None):
                                     placementStats['missing_files'] += 1
                                     _log_placement_issue(placementStats, f"[WoWOBJ][{fileName}] Missing M2 model (line {rowIndex}): {modelPath}")
                                     continue
-                                importedFile = importWoWOBJ(modelPath, None, settings)
+                                originalObject = importedFile = yield from importWoWOBJSteps(modelPath, None, settings)
+                                if settings.instancingMode == 'COLLECTION':
+                                    importedFile = _new_placement_object(modelName, originalObject, collection, settings)
+                            elif settings.instancingMode in ('POINTS', 'MERGE'):
+                                originalObject = bpy.data.objects[modelName]
                             else:
                                 originalObject = bpy.data.objects[modelName]
-                                importedFile = originalObject.copy()
-                                importedFile.rotation_euler = [0, 0, 0]
-                                importedFile.rotation_euler.x = radians(90)
-                                collection.link(importedFile)
+                                importedFile = _new_placement_object(modelName, originalObject, collection, settings)
+
+                            if settings.instancingMode == 'POINTS':
+                                _add_point_instance(pointInstances, originalObject, doodadparent, collection, '', matrix)
+                                placementStats['imported_m2'] += 1
+                                continue
+
+                            if settings.instancingMode == 'MERGE':
+                                _add_merged_placement(mergedPlacements, originalObject, doodadparent, matrix)
+                                placementStats['imported_m2'] += 1
+                                continue
 
                             importedFile.parent = doodadparent
-                            importedFile.location.x = (MAX_SIZE - float(row['PositionX']))
-                            importedFile.location.y = (MAX_SIZE - float(row['PositionZ'])) * -1
-                            importedFile.location.z = float(row['PositionY'])
-                            importedFile.rotation_euler.x += radians(float(row['RotationZ']))
-                            importedFile.rotation_euler.y += radians(float(row['RotationX']))
-                            importedFile.rotation_euler.z = radians(90 + float(row['RotationY']))
-                            if row['ScaleFactor']:
-                                importedFile.scale = (float(row['ScaleFactor']), float(row['ScaleFactor']), float(row['ScaleFactor']))
+                            importedFile.matrix_basis = matrix
+                            importedFile[PLACEMENT_PROP] = placementKey
+                            _apply_instance_offset(importedFile, originalObject)
                             placementStats['imported_m2'] += 1
                         elif rowType == 'gobj':
                             if not settings.importGOBJ:
                                 placementStats['skipped_disabled_or_unknown'] += 1
                                 continue
 
+                            matrix = Matrix(placements.matrix(rowIndex - 2))
+                            if settings.useProxies:
+                                if _place_proxy(modelPath, gobjparent, matrix, collection, placementKey, settings) is None:
+                                    placementStats['missing_files'] += 1
+                                    _log_placement_issue(placementStats, f"[WoWOBJ][{fileName}] Missing GOBJ model (line {rowIndex}): {modelPath}")
+                                    continue
+                                placementStats['imported_gobj'] += 1
+                                continue
+
                             if modelName not in bpy.data.objects:
                                 if not os.path.exists(modelPath):
                                     placementStats['missing_files'] += 1
                                     _log_placement_issue(placementStats, f"[WoWOBJ][{fileName}] Missing GOBJ model (line {rowIndex}): {modelPath}")
                                     continue
-                                importedFile = importWoWOBJ(modelPath, None, settings)
+                                originalObject = importedFile = yield from importWoWOBJSteps(modelPath, None, settings)
+                                if settings.instancingMode == 'COLLECTION':
+                                    importedFile = _new_placement_object(modelName, originalObject, collection, settings)
+                            elif settings.instancingMode in ('POINTS', 'MERGE'):
+                                originalObject = bpy.data.objects[modelName]
                             else:
                                 originalObject = bpy.data.objects[modelName]
-                                importedFile = originalObject.copy()
-                                importedFile.rotation_euler = [0, 0, 0]
-                                importedFile.rotation_euler.x = radians(90)
-                                collection.link(importedFile)
+                                importedFile = _new_placement_object(modelName, originalObject, collection, settings)
+
+                            if settings.instancingMode == 'POINTS':
+                                _add_point_instance(pointInstances, originalObject, gobjparent, collection, '', matrix)
+                                placementStats['imported_gobj'] += 1
+                                continue
+
+                            if settings.instancingMode == 'MERGE':
+                                _add_merged_placement(mergedPlacements, originalObject, gobjparent, matrix)
+                                placementStats['imported_gobj'] += 1
+                                continue
 
                             importedFile.parent = gobjparent
-                            importedFile.location = (float(row['PositionY']), -float(row['PositionX']), float(row['PositionZ']))
-                            rotQuat = Quaternion((float(row['RotationX']), float(row['RotationY']), -float(row['RotationZ']), float(row['RotationW'])))
-                            rotEul = rotQuat.to_euler()
-                            importedFile.rotation_euler = rotEul
-                            if row['ScaleFactor']:
-                                importedFile.scale = (float(row['ScaleFactor']), float(row['ScaleFactor']), float(row['ScaleFactor']))
+                            importedFile.matrix_basis = matrix
+                            importedFile[PLACEMENT_PROP] = placementKey
+                            _apply_instance_offset(importedFile, originalObject)
                             placementStats['imported_gobj'] += 1
                         else:
                             placementStats['skipped_disabled_or_unknown'] += 1
@@ -2299,51 +3204,66 @@ def importWoWOBJ(objectFile, givenParent = None, settings = None):
                             placementStats,
                             f"[WoWOBJ][{fileName}] Failed to import ADT row {rowIndex} ({rowType} {modelFile}): {ex}"
                         )
+                    finally:
+                        # only rows that placed their model count as imported, missing or failed ones can be retried
+                        if modelID and _placed_count(placementStats) > placedBefore:
+                            placementIndex.add(modelID)
                 elif settings.importWMOSets:
                     # WMO CSV
                     modelFile = row.get('ModelFile', '')
-                    modelName = os.path.basename(modelFile)
+                    modelName = normalizeName(os.path.basename(modelFile))
                     modelPath = os.path.normpath(os.path.join(baseDir, modelFile))
                     print('WMO M2 import: ' + modelFile)
 
                     try:
+                        placementKey = placements.key(rowIndex - 2)
+                        if settings.incrementalSync:
+                            yield from _refresh_model(modelPath, settings)
+
+                        if existingPlacements and existingPlacements.get(placementKey):
+                            # unchanged row, the placement from the earlier import stays
+                            existingPlacements[placementKey].pop()
+                            placementStats['kept'] += 1
+                            continue
+
+                        matrix = Matrix(placements.matrix(rowIndex - 2))
+                        if settings.useProxies:
+                            if _place_proxy(modelPath, givenParent or obj, matrix, collection, placementKey, settings) is None:
+                                placementStats['missing_files'] += 1
+                                _log_placement_issue(placementStats, f"[WoWOBJ][{fileName}] Missing WMO set model (line {rowIndex}): {modelPath}")
+                            continue
+
                         if modelName not in bpy.data.objects:
                             if not os.path.exists(modelPath):
                                 placementStats['missing_files'] += 1
                                 _log_placement_issue(placementStats, f"[WoWOBJ][{fileName}] Missing WMO set model (line {rowIndex}): {modelPath}")
                                 continue
-                            importedFile = importWoWOBJ(modelPath, None, settings)
+                            originalObject = importedFile = yield from importWoWOBJSteps(modelPath, None, settings)
+                            if settings.instancingMode in ('COLLECTION', 'MERGE'):
+                                importedFile = _new_placement_object(modelName, originalObject, collection, settings, link=not settings.createDoodadSetCollections)
+                        elif settings.instancingMode == 'POINTS':
+                            originalObject = bpy.data.objects[modelName]
                         else:
                             originalObject = bpy.data.objects[modelName]
-                            importedFile = originalObject.copy()
-                            if not settings.createDoodadSetCollections:
-                                collection.link(importedFile)
-
-                        importedFile.location = (float(row['PositionX']), float(row['PositionY']), float(row['PositionZ']))
+                            importedFile = _new_placement_object(modelName, originalObject, collection, settings, link=not settings.createDoodadSetCollections)
+
+                        if settings.instancingMode == 'POINTS':
+                            target = collection
+                            doodadSet = row['DoodadSet'] if settings.createDoodadSetCollections else ''
+                            if doodadSet:
+                                target = _get_doodad_set_collection(doodadSet).objects
+                            _add_point_instance(pointInstances, originalObject, givenParent or obj, target, doodadSet, matrix)
+                            continue
 
-                        importedFile.rotation_euler = [0, 0, 0]
-                        rotQuat = Quaternion((float(row['RotationW']), float(row['RotationX']), float(row['RotationY']), float(row['RotationZ'])))
-                        rotEul = rotQuat.to_euler()
-                        rotEul.x += radians(90)
-                        importedFile.rotation_euler = rotEul
+                        importedFile.matrix_basis = matrix
                         importedFile.parent = givenParent or obj
-                        if row['ScaleFactor']:
-                            importedFile.scale = (float(row['ScaleFactor']), float(row['ScaleFactor']), float(row['ScaleFactor']))
+                        importedFile[PLACEMENT_PROP] = placementKey
+                        _apply_instance_offset(importedFile, originalObject)
 
                         if settings.createDoodadSetCollections:
                             if row['DoodadSet']:
                                 print("Valid DoodadSet found: " + row['DoodadSet'])
-                                collectionName = row['DoodadSet']
-                                collection = bpy.data.collections.get(collectionName)
-
-                                if collection is None:
-                                    print("Collection for " + collectionName + " does not exist. Creating collection..")
-                                    collection = bpy.data.collections.new(collectionName)
-                                    bpy.context.scene.collection.children.link(collection)
-
-                                if collection.name not in bpy.context.scene.collection.children:
-                                    print("Collection " + collectionName + " isn't linked to scene. Linking collection..")
-                                    bpy.context.scene.collection.children.link(collection)
+                                collection = _get_doodad_set_collection(row['DoodadSet'])
 
                                 if collection:
                                     print("Valid collection present. Linking " + importedFile.name)
@@ -2355,7 +3275,18 @@ def importWoWOBJ(objectFile, givenParent = None, settings = None):
                             f"[WoWOBJ][{fileName}] Failed to import WMO set row {rowIndex} ({modelFile}): {ex}"
                         )
 
+        if existingPlacements and not progress.cancelled:
+            removedPlacements = [placement for objects in existingPlacements.values() for placement in objects]
+            placementStats['removed'] += len(removedPlacements)
+            _remove_objects(removedPlacements)
+
+        if importType == 'ADT':
+            placementIndex.commit(obj.name)
+
+        _create_point_instances(pointInstances)
+        _create_merged_meshes(mergedPlacements, collection, obj.name)
         _print_placement_summary(placementStats)
+        profiler.end(stage, os.path.getsize(csvPath))
     elif use_csv:
         print(f"[WoWOBJ][{fileName}] Placement CSV not found: {csvPath}")
     return obj
@@ -0,0 +1,150 @@
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# distance between liquid vertices, CHUNK_SIZE / 8 as in import_wowobj
+UNIT_SIZE = 33.33333 / 8.0
+
+
+class LiquidBuffers:
+    """Merged geometry of every instance of one liquid type, ready for build_mesh"""
+    __slots__ = ('positions', 'loops', 'loop_starts', 'instances')
+
+    def __init__(self):
+        self.positions = array('f')
+        self.loops = array('i')
+        self.loop_starts = array('i')
+        self.instances = 0
+
+    @property
+    def face_count(self):
+        return len(self.loop_starts)
+
+
+def _default_height(instance, heights):
+    if not heights:
+        return instance['worldPosition'][1]
+
+    min_height = instance.get('minHeightLevel', 0.0)
+    max_height = instance.get('maxHeightLevel', 0.0)
+    return min_height if min_height == max_height else (min_height + max_height) / 2.0
+
+
+def _append_instance_numpy(buffers, instance, width, height):
+    face_count = width * height
+    bitmap = instance.get('bitmap') or []
+    if bitmap:
+        # one bit per cell, least significant first; cells past the bitmap are kept
+        bits = numpy.unpackbits(numpy.asarray(bitmap, dtype=numpy.uint8), bitorder='little')[:face_count]
+        mask = numpy.ones(face_count, dtype=bool)
+        mask[:len(bits)] = bits.astype(bool)
+        cells = numpy.flatnonzero(mask)
+    else:
+        cells = numpy.arange(face_count)
+
+    if len(cells) == 0:
+        return
+
+    stride = width + 1
+    y, x = numpy.divmod(cells, width)
+    corner = y * stride + x
+    quads = numpy.stack((corner, corner + 1, corner + stride + 1, corner + stride), axis=1).ravel()
+
+    # only keep the vertices referenced by a face
+    vert_count = stride * (height + 1)
+    used = numpy.zeros(vert_count, dtype=bool)
+    used[quads] = True
+    remap = numpy.cumsum(used, dtype=numpy.int64) - 1 + len(buffers.positions) // 3
+    verts = numpy.flatnonzero(used)
+
+    heights = (instance.get('vertexData') or {}).get('height') or []
+    z = numpy.full(vert_count, _default_height(instance, heights), dtype=numpy.float64)
+    known = min(len(heights), vert_count)
+    z[:known] = heights[:known]
+
+    vy, vx = numpy.divmod(verts, stride)
+    world_position = instance['worldPosition']
+    positions = numpy.empty((len(verts), 3), dtype=numpy.float32)
+    positions[:, 0] = world_position[0] - (vx - width / 2) * UNIT_SIZE
+    positions[:, 1] = -(world_position[2] - (vy - height / 2) * UNIT_SIZE)
+    positions[:, 2] = z[verts]
+
+    loop_base = len(buffers.loops)
+    buffers.positions.frombytes(positions.tobytes())
+    buffers.loops.frombytes(remap[quads].astype(numpy.int32).tobytes())
+    buffers.loop_starts.frombytes((numpy.arange(len(cells), dtype=numpy.int32) * 4 + loop_base).tobytes())
+    buffers.instances += 1
+
+
+def _append_instance(buffers, instance, width, height):
+    face_count = width * height
+    bitmap = instance.get('bitmap') or []
+    bit_count = len(bitmap) * 8
+    if bitmap:
+        cells = [i for i in range(face_count) if i >= bit_count or (bitmap[i >> 3] >> (i & 7)) & 1]
+    else:
+        cells = range(face_count)
+
+    if not cells:
+        return
+
+    stride = width + 1
+    heights = (instance.get('vertexData') or {}).get('height') or []
+    default_height = _default_height(instance, heights)
+    world_position = instance['worldPosition']
+    remap = {}
+    loop_base = len(buffers.loops)
+    positions = buffers.positions
+    loops = buffers.loops
+
+    for cell in cells:
+        y, x = divmod(cell, width)
+        corner = y * stride + x
+        for vert in (corner, corner + 1, corner + stride + 1, corner + stride):
+            index = remap.get(vert)
+            if index is None:
+                index = remap[vert] = len(positions) // 3
+                vy, vx = divmod(vert, stride)
+                positions.append(world_position[0] - (vx - width / 2) * UNIT_SIZE)
+                positions.append(-(world_position[2] - (vy - height / 2) * UNIT_SIZE))
+                positions.append(heights[vert] if vert < len(heights) else default_height)
+            loops.append(index)
+
+    buffers.loop_starts.extend(range(loop_base, len(loops), 4))
+    buffers.instances += 1
+
+
+def build_liquid_buffers(liquid_chunks):
+    """Merge the liquid instances of a tile into one set of buffers per liquid type.
+
+    Every instance becomes a grid of (width + 1) x (height + 1) vertices
+    around its world position, with a quad for each cell its bitmap enables.
+    Vertices no quad uses are left out.
+    """
+    append = _append_instance_numpy if numpy is not None else _append_instance
+    liquids = {}
+
+    for chunk in liquid_chunks:
+        if not chunk or not isinstance(chunk.get('instances'), list):
+            continue
+
+        for instance in chunk['instances']:
+            if not instance or instance.get('worldPosition') is None:
+                continue
+
+            width = instance.get('width', 8)
+            height = instance.get('height', 8)
+            if width <= 0 or height <= 0:
+                continue
+
+            liquid_type = instance.get('liquidType', 2)
+            buffers = liquids.get(liquid_type)
+            if buffers is None:
+                buffers = liquids[liquid_type] = LiquidBuffers()
+
+            append(buffers, instance, width, height)
+
+    return {liquid_type: buffers for liquid_type, buffers in liquids.items() if buffers.face_count > 0}
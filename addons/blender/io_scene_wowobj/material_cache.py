@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+
+import bpy
+
+# custom property holding the content key of materials created by the importer
+MATERIAL_KEY_PROP = 'wowexport_material_key'
+
+
+def _resolve(path):
+    return os.path.normcase(os.path.abspath(path)) if path else ''
+
+
+def material_key(kind, *parts):
+    """Hash the inputs that decide a material's node tree into a stable key"""
+    payload = json.dumps([kind, parts], sort_keys=True, separators=(',', ':'), default=str)
+    return kind + ':' + hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def standard_material_key(textureLocation, blendMode, createEmissive, extension_mode='REPEAT'):
+    return material_key('standard', _resolve(textureLocation), blendMode, createEmissive, extension_mode)
+
+
+def terrain_material_key(textureLocation, layers, baseDir, extension_mode='REPEAT'):
+    return material_key('terrain', _resolve(textureLocation), layers, _resolve(baseDir), extension_mode)
+
+
+def wmo_shader20_material_key(json_info, base_dir, lookup_name):
+    mat_data = json_info['materials'][json_info['mtlIndexes'][lookup_name]]
+    tex_paths = json_info.get('texturePathsByFDID', {})
+
+    runtime_data = mat_data.get('runtimeData', [0, 0, 0, 0])
+    fdids = [mat_data.get(field, 0) for field in ('texture2', 'texture3', 'color3', 'flags3')]
+    fdids += [runtime_data[i] if i < len(runtime_data) else 0 for i in range(4)]
+
+    paths = [_resolve(os.path.join(base_dir, tex_paths[fdid])) if fdid and tex_paths.get(fdid) else '' for fdid in fdids]
+    return material_key('wmo_shader20', mat_data, paths)
+
+
+def advanced_m2_material_key(texture_unit, materials, textures, texture_combos, settings, base_dir, texture_transforms=None, texture_transforms_lookup=None, fallback_texture=None):
+    """Key for createAdvancedM2Material, resolving indices so equal materials of different models match"""
+    texture_count = texture_unit['textureCount']
+    material_index = texture_unit['materialIndex']
+    texture_combo_index = texture_unit.get('textureComboIndex', 0)
+    material_data = materials[material_index] if material_index < len(materials) else {}
+
+    texture_paths = []
+    if texture_combo_index < len(texture_combos) and texture_count > 0:
+        for texture_index in texture_combos[texture_combo_index:texture_combo_index + texture_count]:
+            texture_filename = textures[texture_index].get('fileNameExternal', '') if texture_index < len(textures) else ''
+            if not texture_filename:
+                texture_paths.append('')
+            elif os.path.isabs(texture_filename):
+                texture_paths.append(_resolve(texture_filename))
+            else:
+                texture_paths.append(_resolve(os.path.join(base_dir, texture_filename.replace('\\', '/'))))
+
+    transform_data = None
+    if settings.importUVAnimations:
+        transform_combo_index = texture_unit.get('textureTransformComboIndex', -1)
+        if (transform_combo_index not in {-1, 65535} and
+            texture_transforms_lookup and texture_transforms and
+            transform_combo_index < len(texture_transforms_lookup)):
+            transform_index = texture_transforms_lookup[transform_combo_index]
+            if transform_index < len(texture_transforms):
+                transform_data = texture_transforms[transform_index]
+
+    return material_key(
+        'm2',
+        texture_unit['shaderID'],
+        texture_count,
+        material_data.get('blendingMode', 0),
+        material_data.get('flags', 0),
+        texture_paths,
+        transform_data,
+        settings.createEmissiveMaterials,
+        _resolve(fallback_texture)
+    )
+
+
+class MaterialCache:
+    """Materials created by the importer, keyed by the inputs of their node tree.
+
+    Keys are stored on the materials themselves, so materials from earlier
+    imports in the same .blend are found again. A hit returns the existing
+    material instead of building an identical node tree under a new name.
+    """
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._materials = None
+
+    def _index(self):
+        if self._materials is None:
+            self._materials = {}
+            for material in bpy.data.materials:
+                key = material.get(MATERIAL_KEY_PROP)
+                if key:
+                    self._materials.setdefault(key, material)
+
+        return self._materials
+
+    def get(self, key, create):
+        """Return the material for key, calling create() to build it on a miss"""
+        materials = self._index()
+        material = materials.get(key)
+
+        if material is not None:
+            try:
+                material.name
+            except ReferenceError:
+                # removed since it was indexed
+                material = None
+
+        if material is not None:
+            self.hits += 1
+            return material
+
+        self.misses += 1
+        material = create()
+        if material is not None:
+            material[MATERIAL_KEY_PROP] = key
+            materials[key] = material
+
+        return material
+
+    def adopt(self, material):
+        """Return the material cached under the key of material, or cache material under it"""
+        key = material.get(MATERIAL_KEY_PROP)
+        if not key:
+            return material
+
+        materials = self._index()
+        existing = materials.get(key)
+        if existing is not None and existing != material:
+            try:
+                existing.name
+                self.hits += 1
+                return existing
+            except ReferenceError:
+                pass
+
+        materials[key] = material
+        return material
@@ -0,0 +1,123 @@
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def filter_triangles(indices, material_indices):
+    """Drop degenerate and repeated triangles, matching bmesh.faces.new rejection"""
+    loops = array('i')
+    materials = array('i')
+    seen = set()
+
+    for tri, material_index in enumerate(material_indices):
+        base = tri * 3
+        a = indices[base]
+        b = indices[base + 1]
+        c = indices[base + 2]
+
+        if a == b or b == c or a == c:
+            continue
+
+        if a < b:
+            key = (a, b, c) if b < c else ((a, c, b) if a < c else (c, a, b))
+        else:
+            key = (b, a, c) if a < c else ((b, c, a) if b < c else (c, b, a))
+
+        if key in seen:
+            continue
+
+        seen.add(key)
+        loops.extend((a, b, c))
+        materials.append(material_index)
+
+    return loops, materials
+
+
+def expand_loop_uvs(uvs, loops):
+    """Map a per-vertex UV buffer (u, v pairs) onto a loop-ordered buffer"""
+    if numpy is not None:
+        uv_array = numpy.frombuffer(memoryview(uvs).cast('B'), dtype=numpy.float32).reshape(-1, 2)
+        loop_array = numpy.frombuffer(memoryview(loops).cast('B'), dtype=numpy.int32)
+        return uv_array[loop_array].ravel()
+
+    result = array('f', bytes(len(loops) * 8))
+    for i, vert_index in enumerate(loops):
+        result[i * 2] = uvs[vert_index * 2]
+        result[i * 2 + 1] = uvs[vert_index * 2 + 1]
+
+    return result
+
+
+def fill_colors(target, colors, color_size):
+    """Copy per-vertex colors into an RGBA buffer, keeping existing values past the end"""
+    if color_size <= 0:
+        return target
+
+    count = min(len(colors) // color_size, len(target) // 4)
+    width = min(color_size, 4)
+
+    if numpy is not None:
+        source = numpy.frombuffer(memoryview(colors).cast('B'), dtype=numpy.float32)
+        source = source[:count * color_size].reshape(-1, color_size)
+        rgba = numpy.frombuffer(memoryview(target).cast('B'), dtype=numpy.float32).reshape(-1, 4)
+        rgba[:count, :width] = source[:, :width]
+        if width < 4:
+            rgba[:count, 3] = 1.0
+        return target
+
+    for i in range(count):
+        for j in range(width):
+            target[i * 4 + j] = colors[i * color_size + j]
+        if width < 4:
+            target[i * 4 + 3] = 1.0
+
+    return target
+
+
+def build_mesh(mesh, positions, loops, loop_starts, material_indices=None, uv_layers=None, smooth=True):
+    """Fill an empty mesh datablock from flat buffers using foreach_set.
+
+    positions is a flat xyz buffer, loops holds the vertex index of every
+    corner, loop_starts the first corner of each polygon. uv_layers is a
+    list of (name, per-vertex uv buffer) pairs.
+    """
+    vert_count = len(positions) // 3
+    loop_count = len(loops)
+    poly_count = len(loop_starts)
+
+    mesh.vertices.add(vert_count)
+    mesh.vertices.foreach_set('co', positions)
+
+    mesh.loops.add(loop_count)
+    mesh.loops.foreach_set('vertex_index', loops)
+
+    mesh.polygons.add(poly_count)
+    mesh.polygons.foreach_set('loop_start', loop_starts)
+
+    # loop_total is derived from loop_start on newer versions and read-only
+    if poly_count > 0 and not mesh.polygons[0].bl_rna.properties['loop_total'].is_readonly:
+        loop_totals = array('i', bytes(poly_count * 4))
+        for i in range(poly_count):
+            end = loop_starts[i + 1] if i + 1 < poly_count else loop_count
+            loop_totals[i] = end - loop_starts[i]
+        mesh.polygons.foreach_set('loop_total', loop_totals)
+
+    if material_indices is not None and poly_count > 0:
+        mesh.polygons.foreach_set('material_index', material_indices)
+
+    for uv_name, uvs in uv_layers or ():
+        uv_layer = mesh.uv_layers.new(name=uv_name)
+        uv_layer.data.foreach_set('uv', expand_loop_uvs(uvs, loops))
+
+    mesh.update(calc_edges=True)
+
+    if smooth and poly_count > 0:
+        if hasattr(mesh, 'shade_smooth'):
+            mesh.shade_smooth()
+        else:
+            mesh.polygons.foreach_set('use_smooth', [True] * poly_count)
+
+    return mesh
@@ -0,0 +1,159 @@
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class MeshPart:
+    """The triangles of a mesh that use one material, with only the vertices they reference.
+
+    positions is a flat xyz buffer, triangles holds three indices into it
+    per triangle and uv_layers is a list of (name, per-vertex uv buffer)
+    pairs, like the arguments of build_mesh.
+    """
+    __slots__ = ('positions', 'triangles', 'uv_layers')
+
+    def __init__(self, positions, triangles, uv_layers):
+        self.positions = positions
+        self.triangles = triangles
+        self.uv_layers = uv_layers
+
+
+def split_by_material(positions, loops, material_indices, loop_uv_layers):
+    """MeshParts of a triangle mesh by material index.
+
+    loops holds three vertex indices per triangle, loop_uv_layers is a list
+    of (name, per-loop uv buffer) pairs. Per-loop UVs are folded back onto
+    the vertices, which is lossless for meshes built by build_mesh.
+    """
+    vertex_count = len(positions) // 3
+    if numpy is not None:
+        return _split_by_material_numpy(positions, loops, material_indices, loop_uv_layers, vertex_count)
+
+    vertex_uvs = []
+    for name, loop_uvs in loop_uv_layers:
+        uvs = array('f', bytes(vertex_count * 8))
+        for corner, vertex in enumerate(loops):
+            uvs[vertex * 2] = loop_uvs[corner * 2]
+            uvs[vertex * 2 + 1] = loop_uvs[corner * 2 + 1]
+        vertex_uvs.append((name, uvs))
+
+    triangles_by_material = {}
+    for triangle, material_index in enumerate(material_indices):
+        triangles_by_material.setdefault(material_index, array('i')).extend(loops[triangle * 3:triangle * 3 + 3])
+
+    parts = {}
+    for material_index, corners in triangles_by_material.items():
+        used = sorted(set(corners))
+        remap = {vertex: index for index, vertex in enumerate(used)}
+
+        part_positions = array('f')
+        for vertex in used:
+            part_positions.extend(positions[vertex * 3:vertex * 3 + 3])
+
+        part_uvs = []
+        for name, uvs in vertex_uvs:
+            part_layer = array('f')
+            for vertex in used:
+                part_layer.extend(uvs[vertex * 2:vertex * 2 + 2])
+            part_uvs.append((name, part_layer))
+
+        parts[material_index] = MeshPart(part_positions, array('i', [remap[vertex] for vertex in corners]), part_uvs)
+
+    return parts
+
+
+def _split_by_material_numpy(positions, loops, material_indices, loop_uv_layers, vertex_count):
+    positions = numpy.frombuffer(positions, dtype=numpy.float32).reshape(-1, 3)
+    corners = numpy.frombuffer(loops, dtype=numpy.int32).reshape(-1, 3)
+    materials = numpy.frombuffer(material_indices, dtype=numpy.int32)
+
+    vertex_uvs = []
+    for name, loop_uvs in loop_uv_layers:
+        uvs = numpy.zeros((vertex_count, 2), dtype=numpy.float32)
+        uvs[corners.reshape(-1)] = numpy.frombuffer(loop_uvs, dtype=numpy.float32).reshape(-1, 2)
+        vertex_uvs.append((name, uvs))
+
+    parts = {}
+    for material_index in numpy.unique(materials).tolist():
+        part_corners = corners[materials == material_index].reshape(-1)
+        used, remapped = numpy.unique(part_corners, return_inverse=True)
+        parts[material_index] = MeshPart(
+            array('f', positions[used].tobytes()),
+            array('i', remapped.astype(numpy.int32).tobytes()),
+            [(name, array('f', uvs[used].tobytes())) for name, uvs in vertex_uvs]
+        )
+
+    return parts
+
+
+def _transform(positions, matrix):
+    (a, b, c, x), (d, e, f, y), (g, h, i, z) = matrix[0], matrix[1], matrix[2]
+    result = array('f', bytes(len(positions) * 4))
+    for index in range(0, len(positions), 3):
+        px, py, pz = positions[index], positions[index + 1], positions[index + 2]
+        result[index] = a * px + b * py + c * pz + x
+        result[index + 1] = d * px + e * py + f * pz + y
+        result[index + 2] = g * px + h * py + i * pz + z
+    return result
+
+
+def merge_parts(entries):
+    """Concatenate (MeshPart, matrix) entries into one mesh with every transform baked in.
+
+    matrix is a 4x4 transform as four row tuples. Returns the positions,
+    loops and uv_layers for build_mesh. UV layers missing from some parts
+    are filled with zeros for their vertices.
+    """
+    uv_names = []
+    for part, _ in entries:
+        for name, _ in part.uv_layers:
+            if name not in uv_names:
+                uv_names.append(name)
+
+    if not entries:
+        return array('f'), array('i'), []
+
+    if numpy is not None:
+        positions = []
+        loops = []
+        uv_layers = {name: [] for name in uv_names}
+        offset = 0
+        for part, matrix in entries:
+            matrix = numpy.asarray(matrix, dtype=numpy.float64)
+            local = numpy.frombuffer(part.positions, dtype=numpy.float32).reshape(-1, 3)
+            positions.append((local @ matrix[:3, :3].T + matrix[:3, 3]).astype(numpy.float32))
+            loops.append(numpy.frombuffer(part.triangles, dtype=numpy.int32) + offset)
+
+            layers = dict(part.uv_layers)
+            for name in uv_names:
+                if name in layers:
+                    uv_layers[name].append(numpy.frombuffer(layers[name], dtype=numpy.float32))
+                else:
+                    uv_layers[name].append(numpy.zeros(len(local) * 2, dtype=numpy.float32))
+            offset += len(local)
+
+        return (
+            array('f', numpy.concatenate(positions).tobytes()),
+            array('i', numpy.concatenate(loops).astype(numpy.int32).tobytes()),
+            [(name, array('f', numpy.concatenate(uv_layers[name]).tobytes())) for name in uv_names]
+        )
+
+    positions = array('f')
+    loops = array('i')
+    uv_layers = [(name, array('f')) for name in uv_names]
+    for part, matrix in entries:
+        offset = len(positions) // 3
+        positions.extend(_transform(part.positions, matrix))
+        loops.extend(vertex + offset for vertex in part.triangles)
+
+        layers = dict(part.uv_layers)
+        for name, target in uv_layers:
+            if name in layers:
+                target.extend(layers[name])
+            else:
+                target.extend(array('f', bytes(len(part.positions) // 3 * 8)))
+
+    return positions, loops, uv_layers
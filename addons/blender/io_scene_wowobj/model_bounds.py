@@ -0,0 +1,111 @@
+import json
+import os
+from array import array
+
+from .obj_parser import read_positions
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+BOUNDS_VERSION = 1
+
+
+class ModelBounds:
+    """Axis-aligned bounds of an OBJ in its own coordinates"""
+    __slots__ = ('min', 'max')
+
+    def __init__(self, bounds_min, bounds_max):
+        self.min = tuple(bounds_min)
+        self.max = tuple(bounds_max)
+
+    def corners(self):
+        """The eight box corners as flat xyz positions"""
+        (x0, y0, z0), (x1, y1, z1) = self.min, self.max
+        positions = array('f')
+        for z in (z0, z1):
+            for y in (y0, y1):
+                for x in (x0, x1):
+                    positions.extend((x, y, z))
+        return positions
+
+
+def read_model_bounds(path):
+    """Bounds of the OBJ at path from its `v` lines alone, None if it has no positions"""
+    positions = read_positions(path)
+    count = len(positions) // 3
+    if count == 0:
+        return None
+
+    if numpy is not None:
+        values = numpy.frombuffer(positions, dtype=numpy.float32).reshape(count, 3)
+        return ModelBounds(values.min(axis=0).tolist(), values.max(axis=0).tolist())
+
+    axes = [positions[axis::3] for axis in range(3)]
+    return ModelBounds([min(values) for values in axes], [max(values) for values in axes])
+
+
+class BoundsIndex:
+    """Bounds of OBJ exports, cached in one JSON file across sessions.
+
+    Entries are keyed by the absolute OBJ path and hold its size and mtime,
+    an entry whose file changed since is read again. Without a path the
+    index only lives in memory.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as fp:
+                    stored = json.load(fp)
+                if stored.get('version') == BOUNDS_VERSION:
+                    self.entries = stored.get('models', {})
+            except (OSError, ValueError) as e:
+                print(f'[WoWOBJ] Ignoring unreadable bounds index {path}: {e}')
+
+    def get(self, objectFile):
+        """ModelBounds of objectFile, None if it is missing or has no positions"""
+        key = os.path.abspath(objectFile)
+        try:
+            stat = os.stat(key)
+        except OSError:
+            return None
+
+        source = [stat.st_size, stat.st_mtime_ns]
+        entry = self.entries.get(key)
+        if entry is not None and entry['source'] == source:
+            self.hits += 1
+            return ModelBounds(entry['min'], entry['max'])
+
+        self.misses += 1
+        bounds = read_model_bounds(key)
+        if bounds is None:
+            return None
+
+        self.entries[key] = {
+            'source': source,
+            'min': list(bounds.min),
+            'max': list(bounds.max)
+        }
+        self.dirty = True
+        return bounds
+
+    def save(self):
+        if self.path is None or not self.dirty:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp = self.path + '.tmp'
+            with open(temp, 'w', encoding='utf-8') as fp:
+                json.dump({'version': BOUNDS_VERSION, 'models': self.entries}, fp)
+            os.replace(temp, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f'[WoWOBJ] Unable to write bounds index {self.path}: {e}')
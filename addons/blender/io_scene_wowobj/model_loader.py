@@ -0,0 +1,81 @@
+import json
+import os
+
+from .obj_parser import parse_mtl, parse_obj
+
+
+class ParsedModel:
+    """Everything read from disk for one OBJ export, before any datablocks exist"""
+    def __init__(self, path, obj, materials, json_info, sources):
+        self.path = path
+        self.obj = obj
+        self.materials = materials
+        self.json_info = json_info
+        self.sources = sources
+
+
+def get_json_path(objectFile):
+    baseDir, fileName = os.path.split(objectFile)
+    return os.path.join(baseDir, fileName[:fileName.rfind('.')] + '.json')
+
+
+def get_placement_path(objectFile):
+    return os.path.splitext(objectFile)[0] + '_ModelPlacementInformation.csv'
+
+
+def get_liquid_path(objectFile):
+    baseDir, fileName = os.path.split(objectFile)
+    baseName = fileName[:fileName.rfind('.')]
+    tileID = baseName.replace('adt_', '') if baseName.startswith('adt_') else baseName
+    return os.path.join(baseDir, f'liquid_{tileID}.json')
+
+
+def stat_sources(paths):
+    """Map every existing path to its (size, mtime_ns), used to validate cached data"""
+    sources = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+
+        sources[path] = (stat.st_size, stat.st_mtime_ns)
+
+    return sources
+
+
+def parse_model(objectFile):
+    baseDir = os.path.dirname(objectFile)
+    obj = parse_obj(objectFile)
+
+    materials = {}
+    mtlPath = None
+    if obj.mtllib:
+        mtlPath = os.path.join(baseDir, obj.mtllib)
+        materials = parse_mtl(mtlPath, baseDir)
+
+    jsonPath = get_json_path(objectFile)
+    json_info = {}
+    try:
+        with open(jsonPath) as fp:
+            json_info = json.load(fp)
+    except Exception:
+        pass
+
+    sources = stat_sources([p for p in (objectFile, mtlPath, jsonPath) if p])
+    return ParsedModel(objectFile, obj, materials, json_info, sources)
+
+
+def load_model(objectFile, cache=None):
+    """Load an OBJ export with its MTL and JSON sidecar, through the parse cache if given"""
+    if cache is not None:
+        model = cache.load(objectFile)
+        if model is not None:
+            return model
+
+    model = parse_model(objectFile)
+
+    if cache is not None:
+        cache.store(model)
+
+    return model
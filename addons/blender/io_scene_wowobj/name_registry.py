@@ -0,0 +1,65 @@
+import bpy
+
+
+class NameRegistry:
+    """Unique names for the objects, meshes, materials and images an import creates.
+
+    The names of each bpy.data collection are read once, after that a name
+    is checked against a set, and every base name remembers the last
+    '.001' style suffix it handed out, so the thousandth copy of a doodad
+    doesn't probe every suffix before it. Names go through normalize
+    first, which keeps them inside Blender's name length limit. Names of
+    datablocks removed during the session are given back with release().
+    """
+    def __init__(self, normalize=None):
+        self.normalize = normalize
+        self._names = {}
+        self._suffixes = {}
+
+    def _index(self, collection):
+        names = self._names.get(collection)
+        if names is None:
+            names = self._names[collection] = set(getattr(bpy.data, collection).keys())
+
+        return names
+
+    def allocate(self, collection, name):
+        """Return a name not yet used in bpy.data.<collection>"""
+        if self.normalize is not None:
+            name = self.normalize(name)
+
+        names = self._index(collection)
+        if name not in names:
+            return name
+
+        key = (collection, name)
+        suffix = self._suffixes.get(key, 0)
+        while True:
+            suffix += 1
+            candidate = f'{name}.{suffix:03d}'
+            if candidate not in names:
+                break
+
+        self._suffixes[key] = suffix
+        return candidate
+
+    def claim(self, collection, name):
+        """Record a name given out by Blender, for example to a copied object"""
+        self._index(collection).add(name)
+
+    def new(self, collection, name, *args, **kwargs):
+        """Create a datablock in bpy.data.<collection> under a unique name"""
+        candidate = self.allocate(collection, name)
+        block = getattr(bpy.data, collection).new(candidate, *args, **kwargs)
+
+        # if Blender still renamed it, the candidate is taken by something the index missed
+        names = self._index(collection)
+        names.add(candidate)
+        names.add(block.name)
+        return block
+
+    def release(self, collection, names):
+        """Forget names of removed datablocks, so they can be handed out again"""
+        index = self._index(collection)
+        for name in names:
+            index.discard(name)
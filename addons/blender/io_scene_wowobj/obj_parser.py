@@ -0,0 +1,270 @@
+import hashlib
+import os
+import re
+import struct
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# record payloads are buffered and converted in bulk once this many lines are pending
+CHUNK_LINES = 65536
+
+FACE_SUFFIX = re.compile(rb'/\S*')
+
+
+class OBJGroup:
+    """A `g` block of an OBJ file, referencing a contiguous range of triangles"""
+    __slots__ = ('name', 'material', 'face_start', 'face_count')
+
+    def __init__(self, name, face_start):
+        self.name = name
+        self.material = ''
+        self.face_start = face_start
+        self.face_count = 0
+
+
+class OBJData:
+    """Geometry of an OBJ file held in flat typed buffers.
+
+    positions/normals hold xyz triplets, every entry of uv_layers holds uv
+    pairs and colors holds color_size components per vertex. faces holds
+    three zero-based vertex indices per triangle. fingerprint identifies
+    the geometry independent of names and materials, see
+    geometry_fingerprint.
+    """
+    def __init__(self):
+        self.mtllib = ''
+        self.fingerprint = ''
+        self.positions = array('f')
+        self.normals = array('f')
+        self.uv_layers = []
+        self.colors = array('f')
+        self.color_size = 0
+        self.faces = array('i')
+        self.groups = []
+
+    @property
+    def vertex_count(self):
+        return len(self.positions) // 3
+
+    @property
+    def face_count(self):
+        return len(self.faces) // 3
+
+    def group_faces(self, group):
+        return self.faces[group.face_start * 3:(group.face_start + group.face_count) * 3]
+
+    def group_vertices(self, group):
+        return sorted(set(self.group_faces(group)))
+
+
+def geometry_fingerprint(data):
+    """Hash of the buffers a mesh is built from and the face range of every group.
+
+    Exports of the same geometry under different names or with different
+    materials share a fingerprint, so they can share one mesh.
+    """
+    digest = hashlib.sha1()
+    buffers = [data.positions, data.faces, data.colors] + list(data.uv_layers)
+    digest.update(struct.pack('<5I', len(data.positions), len(data.faces), len(data.colors), data.color_size, len(data.uv_layers)))
+    for group in data.groups:
+        digest.update(struct.pack('<2I', group.face_start, group.face_count))
+
+    for buffer in buffers:
+        digest.update(struct.pack('<I', len(buffer)))
+        digest.update(memoryview(buffer).cast('B'))
+
+    return digest.hexdigest()
+
+
+def _flush_floats(target, pending, width):
+    if not pending:
+        return
+
+    payload = b' '.join(pending)
+    if numpy is not None:
+        values = numpy.fromstring(payload, dtype=numpy.float32, sep=' ')
+        if len(values) == width * len(pending):
+            target.frombytes(values.tobytes())
+            pending.clear()
+            return
+    else:
+        values = array('f', map(float, payload.split()))
+        if len(values) == width * len(pending):
+            target.extend(values)
+            pending.clear()
+            return
+
+    # uneven records, keep the first `width` components of each line
+    for line in pending:
+        target.extend(map(float, line.split()[:width]))
+
+    pending.clear()
+
+
+def _flush_faces(target, pending):
+    if not pending:
+        return
+
+    payload = FACE_SUFFIX.sub(b'', b' '.join(pending))
+    if numpy is not None:
+        values = numpy.fromstring(payload, dtype=numpy.int32, sep=' ')
+        if len(values) == 3 * len(pending):
+            values -= 1
+            target.frombytes(values.tobytes())
+            pending.clear()
+            return
+    else:
+        values = payload.split()
+        if len(values) == 3 * len(pending):
+            target.extend([int(v) - 1 for v in values])
+            pending.clear()
+            return
+
+    # polygons with more than three corners only contribute their first triangle
+    for line in pending:
+        fv = FACE_SUFFIX.sub(b'', line).split()
+        target.extend((int(fv[0]) - 1, int(fv[1]) - 1, int(fv[2]) - 1))
+
+    pending.clear()
+
+
+def parse_obj(path):
+    """Stream an OBJ file exported by wow.export into an OBJData"""
+    data = OBJData()
+
+    pending_positions = []
+    pending_normals = []
+    pending_colors = []
+    pending_uvs = []
+    pending_faces = []
+    face_total = 0
+    group = None
+
+    with open(path, 'rb') as f:
+        for line in f:
+            tag = line[:2]
+
+            if tag[:1] in (b' ', b'\t'):
+                line = line.lstrip()
+                tag = line[:2]
+
+            if tag == b'v ':
+                pending_positions.append(line[2:])
+                if len(pending_positions) >= CHUNK_LINES:
+                    _flush_floats(data.positions, pending_positions, 3)
+            elif tag == b'f ':
+                if group is None:
+                    group = OBJGroup('', face_total)
+                    data.groups.append(group)
+
+                pending_faces.append(line[2:])
+                group.face_count += 1
+                face_total += 1
+                if len(pending_faces) >= CHUNK_LINES:
+                    _flush_faces(data.faces, pending_faces)
+            elif tag == b'vn':
+                pending_normals.append(line[3:])
+                if len(pending_normals) >= CHUNK_LINES:
+                    _flush_floats(data.normals, pending_normals, 3)
+            elif tag == b'vt':
+                sep = line.find(b' ')
+                layer_index = int(line[2:sep]) - 1 if sep > 2 else 0
+
+                while len(data.uv_layers) <= layer_index:
+                    data.uv_layers.append(array('f'))
+                    pending_uvs.append([])
+
+                pending_uvs[layer_index].append(line[sep + 1:])
+                if len(pending_uvs[layer_index]) >= CHUNK_LINES:
+                    _flush_floats(data.uv_layers[layer_index], pending_uvs[layer_index], 2)
+            elif tag == b'vc':
+                if data.color_size == 0:
+                    data.color_size = len(line.split()) - 1
+
+                pending_colors.append(line[3:])
+                if len(pending_colors) >= CHUNK_LINES:
+                    _flush_floats(data.colors, pending_colors, data.color_size)
+            elif tag == b'g ':
+                parts = line.split()
+                group = OBJGroup(parts[1].decode('utf-8') if len(parts) > 1 else '', face_total)
+                data.groups.append(group)
+            elif line.startswith(b'usemtl'):
+                parts = line.split()
+                if len(parts) > 1:
+                    if group is None:
+                        group = OBJGroup('', face_total)
+                        data.groups.append(group)
+
+                    group.material = parts[1].decode('utf-8')
+            elif line.startswith(b'mtllib'):
+                parts = line.split()
+                if len(parts) > 1:
+                    data.mtllib = parts[1].decode('utf-8')
+
+    _flush_floats(data.positions, pending_positions, 3)
+    _flush_floats(data.normals, pending_normals, 3)
+    _flush_floats(data.colors, pending_colors, data.color_size)
+    for layer_index, pending in enumerate(pending_uvs):
+        _flush_floats(data.uv_layers[layer_index], pending, 2)
+    _flush_faces(data.faces, pending_faces)
+
+    data.fingerprint = geometry_fingerprint(data)
+    return data
+
+
+def read_positions(path):
+    """Vertex positions of the OBJ at path as flat xyz floats, reading its `v` lines alone"""
+    positions = array('f')
+    pending = []
+    with open(path, 'rb') as f:
+        for line in f:
+            if line[:2] == b'v ':
+                pending.append(line[2:])
+                if len(pending) >= CHUNK_LINES:
+                    _flush_floats(positions, pending, 3)
+
+    _flush_floats(positions, pending, 3)
+    return positions
+
+
+def read_mtllib(path):
+    """Read the mtllib of an OBJ file from its header, without parsing the geometry"""
+    with open(path, 'rb') as f:
+        for line in f:
+            line = line.lstrip()
+            if line.startswith(b'mtllib'):
+                parts = line.split()
+                return parts[1].decode('utf-8') if len(parts) > 1 else ''
+
+            # wow.export writes mtllib ahead of any geometry
+            if line[:2] in (b'v ', b'vt', b'vn', b'vc', b'f ', b'g '):
+                break
+
+    return ''
+
+
+def parse_mtl(path, base_dir=None):
+    """Map material names in an MTL file to the path of their map_Kd texture"""
+    if base_dir is None:
+        base_dir = os.path.dirname(path)
+
+    materials = {}
+    material_name = ''
+
+    with open(path, 'r') as f:
+        for line in f:
+            line_split = line.split()
+            if not line_split:
+                continue
+
+            line_start = line_split[0]
+            if line_start == 'newmtl':
+                material_name = line_split[1]
+            elif line_start == 'map_Kd':
+                materials[material_name] = os.path.join(base_dir, line_split[1])
+
+    return materials
@@ -0,0 +1,275 @@
+import hashlib
+import marshal
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+
+from .model_loader import ParsedModel, get_json_path
+from .obj_parser import OBJData, OBJGroup
+
+CACHE_MAGIC = b'WOWOBJC\x01'
+CACHE_VERSION = 2
+CACHE_EXT = '.objcache'
+HEADER = struct.Struct('<8sII')
+
+# marshal output is only stable within a Python minor version
+MARSHAL_TAG = (sys.version_info[0] << 8) | sys.version_info[1]
+ALIGNMENT = 8
+
+
+class ParseCache:
+    """On-disk cache of parsed OBJ exports.
+
+    Every OBJ path maps to a single blob holding the geometry buffers, the
+    MTL material map and the JSON sidecar. Blobs are validated against the
+    size and mtime of their source files and memory-mapped on load. The
+    file mtime of a blob doubles as its last use, which drives LRU
+    eviction once the directory grows past max_bytes. Safe to share
+    between parsing threads.
+    """
+    def __init__(self, directory, max_bytes=1024 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = None
+        self._total = 0
+        self._lock = threading.RLock()
+
+    def entry_path(self, objectFile):
+        key = os.path.normcase(os.path.abspath(objectFile)).encode('utf-8')
+        return os.path.join(self.directory, hashlib.sha1(key).hexdigest() + CACHE_EXT)
+
+    def load(self, objectFile):
+        entryPath = self.entry_path(objectFile)
+
+        try:
+            with open(entryPath, 'rb') as fp:
+                buffer = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            model = self._read(buffer, objectFile)
+        except Exception as e:
+            print(f'[WoWOBJ] Discarding unreadable parse cache entry {entryPath}: {e}')
+            model = None
+
+        if model is None:
+            buffer.close()
+            with self._lock:
+                self._remove(entryPath)
+                self.misses += 1
+            return None
+
+        # bump last use for eviction
+        try:
+            os.utime(entryPath)
+        except OSError:
+            pass
+
+        with self._lock:
+            if self._entries is not None and entryPath in self._entries:
+                self._entries[entryPath][0] = time.time()
+
+            self.hits += 1
+
+        return model
+
+    def _read(self, buffer, objectFile):
+        magic, marshalTag, metaSize = HEADER.unpack_from(buffer, 0)
+        if magic != CACHE_MAGIC or marshalTag != MARSHAL_TAG:
+            return None
+
+        meta = marshal.loads(buffer[HEADER.size:HEADER.size + metaSize])
+        if meta.get('version') != CACHE_VERSION or meta.get('byteorder') != sys.byteorder:
+            return None
+
+        if os.path.normcase(meta['path']) != os.path.normcase(objectFile):
+            return None
+
+        # invalidate when any source changed, appeared or disappeared
+        sources = meta['sources']
+        for path, stat in sources.items():
+            try:
+                current = os.stat(path)
+            except OSError:
+                return None
+
+            if (current.st_size, current.st_mtime_ns) != stat:
+                return None
+
+        for path in meta['optional']:
+            if path not in sources and os.path.exists(path):
+                return None
+
+        view = memoryview(buffer)
+
+        def buffer_at(entry):
+            offset, size, typecode = entry
+            return view[offset:offset + size].cast(typecode)
+
+        obj = OBJData()
+        obj.mtllib = meta['mtllib']
+        obj.color_size = meta['color_size']
+        obj.fingerprint = meta['fingerprint']
+        obj.positions = buffer_at(meta['buffers']['positions'])
+        obj.normals = buffer_at(meta['buffers']['normals'])
+        obj.colors = buffer_at(meta['buffers']['colors'])
+        obj.faces = buffer_at(meta['buffers']['faces'])
+        obj.uv_layers = [buffer_at(entry) for entry in meta['buffers']['uv_layers']]
+
+        for name, material, faceStart, faceCount in meta['groups']:
+            group = OBJGroup(name, faceStart)
+            group.material = material
+            group.face_count = faceCount
+            obj.groups.append(group)
+
+        # views keep the mapping alive until the model is released
+        obj.source_buffer = buffer
+
+        return ParsedModel(objectFile, obj, meta['materials'], meta['json_info'], sources)
+
+    def store(self, model):
+        os.makedirs(self.directory, exist_ok=True)
+        obj = model.obj
+
+        arrays = [obj.positions, obj.normals, obj.colors, obj.faces] + list(obj.uv_layers)
+        offsets = []
+
+        def layout(metaSize):
+            offsets.clear()
+            offset = HEADER.size + metaSize
+            for arr in arrays:
+                offset += -offset % ALIGNMENT
+                size = len(arr) * arr.itemsize
+                offsets.append((offset, size, arr.typecode))
+                offset += size
+
+        json_path = get_json_path(model.path)
+        mtl_path = os.path.join(os.path.dirname(model.path), obj.mtllib) if obj.mtllib else None
+
+        meta = {
+            'version': CACHE_VERSION,
+            'byteorder': sys.byteorder,
+            'path': model.path,
+            'sources': {path: tuple(stat) for path, stat in model.sources.items()},
+            'optional': [p for p in (json_path, mtl_path) if p],
+            'mtllib': obj.mtllib,
+            'color_size': obj.color_size,
+            'fingerprint': obj.fingerprint,
+            'groups': [[g.name, g.material, g.face_start, g.face_count] for g in obj.groups],
+            'materials': model.materials,
+            'json_info': model.json_info,
+        }
+
+        # offsets depend on the metadata size, which depends on the offsets
+        metaSize = 0
+        layout(metaSize)
+        while True:
+            meta['buffers'] = {
+                'positions': offsets[0],
+                'normals': offsets[1],
+                'colors': offsets[2],
+                'faces': offsets[3],
+                'uv_layers': offsets[4:],
+            }
+            metaBytes = marshal.dumps(meta)
+            if len(metaBytes) == metaSize:
+                break
+
+            metaSize = len(metaBytes)
+            layout(metaSize)
+
+        entryPath = self.entry_path(model.path)
+        tempPath = f'{entryPath}.{threading.get_ident()}.tmp'
+
+        try:
+            with open(tempPath, 'wb') as fp:
+                fp.write(HEADER.pack(CACHE_MAGIC, MARSHAL_TAG, len(metaBytes)))
+                fp.write(metaBytes)
+                for arr, (offset, size, typecode) in zip(arrays, offsets):
+                    fp.write(b'\0' * (offset - fp.tell()))
+                    fp.write(memoryview(arr).cast('B'))
+
+            os.replace(tempPath, entryPath)
+        except OSError as e:
+            print(f'[WoWOBJ] Failed to write parse cache entry for {model.path}: {e}')
+            self._remove(tempPath)
+            return
+
+        with self._lock:
+            entries = self._scan()
+            previous = entries.get(entryPath)
+            if previous is not None:
+                self._total -= previous[1]
+
+            entries[entryPath] = [time.time(), offsets[-1][0] + offsets[-1][1]]
+            self._total += entries[entryPath][1]
+
+            if self._total > self.max_bytes:
+                self.evict()
+
+    def _scan(self):
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = {}
+        self._total = 0
+
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            names = []
+
+        for name in names:
+            if not name.endswith(CACHE_EXT):
+                continue
+
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+
+            self._entries[path] = [stat.st_mtime, stat.st_size]
+            self._total += stat.st_size
+
+        return self._entries
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        with self._lock:
+            entries = self._scan()
+
+            for path, _ in sorted(entries.items(), key=lambda item: item[1][0]):
+                if self._total <= self.max_bytes:
+                    break
+
+                # entries mapped by this session can't be removed on every platform
+                self._remove(path)
+
+    def clear(self):
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+
+        for name in names:
+            if name.endswith(CACHE_EXT):
+                self._remove(os.path.join(self.directory, name))
+
+    def _remove(self, path):
+        with self._lock:
+            try:
+                os.remove(path)
+                if self._entries is not None and path in self._entries:
+                    self._total -= self._entries.pop(path)[1]
+                return True
+            except OSError:
+                return False
@@ -0,0 +1,102 @@
+from array import array
+
+# scene property holding the ModelIds of imported ADT placements, per tile object
+SCENE_PROP = 'importedModelIDs'
+
+# ModelIds are unsigned 32-bit, ID property arrays hold signed 32-bit ints
+MAX_MODEL_ID = 0xFFFFFFFF
+
+
+def _pack(ids):
+    return array('i', array('I', sorted(ids)).tobytes()).tolist()
+
+
+def _unpack(values):
+    return array('I', array('i', values).tobytes())
+
+
+def _parse_id(modelID):
+    try:
+        value = int(modelID)
+    except ValueError:
+        return modelID
+
+    return value if 0 <= value <= MAX_MODEL_ID else modelID
+
+
+class PlacementIndex:
+    """ModelIds of the ADT placements already in a scene, for the duplicate check.
+
+    Lookups go to a set held for the whole import session. The scene keeps
+    the ids as one packed int array per tile object, written once the
+    placements of that tile are done, so the check carries over to later
+    imports and reopened .blend files. Tiles whose object is gone are
+    dropped on load, which lets their placements be imported again.
+    """
+    def __init__(self, scene, objects):
+        self.scene = scene
+        self._ids = set()
+        self._tiles = {}
+        self._pending = set()
+        self._load(objects)
+
+    def _load(self, objects):
+        stored = self.scene.get(SCENE_PROP)
+        if stored is None:
+            return
+
+        if not hasattr(stored, 'keys'):
+            # flat list of earlier versions, which doesn't say what tile it came from
+            del self.scene[SCENE_PROP]
+            print('[WoWOBJ] Cleared importedModelIDs list left by an earlier version.')
+            return
+
+        for tileName in list(stored.keys()):
+            if tileName not in objects:
+                del stored[tileName]
+                continue
+
+            self._tiles[tileName] = set(_unpack(stored[tileName]))
+            self._ids.update(self._tiles[tileName])
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, modelID):
+        return _parse_id(modelID) in self._ids
+
+    def add(self, modelID):
+        """Record modelID as placed, returning False when it was imported before"""
+        key = _parse_id(modelID)
+        if key in self._ids:
+            return False
+
+        self._ids.add(key)
+        self._pending.add(key)
+        return True
+
+    def forget(self, tileName):
+        """Drop the ids stored under tileName, so an update of that tile can place them again"""
+        if self._tiles.pop(tileName, None) is None:
+            return
+
+        del self.scene[SCENE_PROP][tileName]
+        self._ids = set().union(*self._tiles.values())
+
+    def commit(self, tileName):
+        """Store the ids recorded since the last commit under the tile object tileName"""
+        # ids that aren't numbers only last for the session
+        ids = {key for key in self._pending if isinstance(key, int)}
+        self._pending.clear()
+        if not ids:
+            return
+
+        if SCENE_PROP not in self.scene:
+            self.scene[SCENE_PROP] = {}
+
+        stored = self.scene[SCENE_PROP]
+        if tileName in stored:
+            ids.update(_unpack(stored[tileName]))
+
+        stored[tileName] = _pack(ids)
+        self._tiles[tileName] = ids
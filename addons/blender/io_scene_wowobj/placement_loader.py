@@ -0,0 +1,233 @@
+import csv
+from array import array
+from math import cos, radians, sin, sqrt
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# matches MAX_SIZE in import_wowobj
+MAX_SIZE = 51200 / 3
+
+NUMERIC_FIELDS = ('PositionX', 'PositionY', 'PositionZ', 'RotationX', 'RotationY', 'RotationZ', 'RotationW', 'ScaleFactor')
+
+# fields that identify a placement between two exports of the same CSV
+KEY_FIELDS = ('Type', 'ModelId', 'FileDataID', 'ModelFile') + NUMERIC_FIELDS + ('DoodadSet', 'DoodadSetIndexes', 'DoodadSetNames')
+
+# per-row transform kinds
+KIND_NONE = 0
+KIND_M2 = 1
+KIND_WMO = 2
+KIND_GOBJ = 3
+KIND_WMO_SET = 4
+
+ADT_KINDS = {'m2': KIND_M2, 'wmo': KIND_WMO, 'gobj': KIND_GOBJ}
+
+
+def _parse_float(value, default):
+    if not value:
+        return default
+
+    try:
+        return float(value)
+    except ValueError:
+        return float('nan')
+
+
+class PlacementTable:
+    """A placement CSV parsed once into typed columns.
+
+    rows keeps the text fields of every row for the import loop, the
+    position, rotation and scale columns are parsed to floats once and
+    turned into one local matrix per row in a single pass (vectorized with
+    numpy when available) the first time a matrix is asked for. Row kinds
+    follow the ADT Type column, rows of a WMO doodad set CSV all use the set
+    transform. grid holds the PlacementGrid over the world positions once a
+    spatial filter built it, for every later query on the same table.
+    """
+    def __init__(self, fieldnames, rows):
+        self.fieldnames = fieldnames
+        self.rows = rows
+        self.is_adt = 'Type' in fieldnames
+
+        self.columns = {}
+        for field in NUMERIC_FIELDS:
+            default = 1.0 if field == 'ScaleFactor' else float('nan')
+            self.columns[field] = array('d', [_parse_float(row.get(field), default) for row in rows])
+
+        if self.is_adt:
+            self.kinds = array('b', [ADT_KINDS.get((row.get('Type') or '').strip().lower(), KIND_NONE) for row in rows])
+        else:
+            self.kinds = array('b', [KIND_WMO_SET]) * len(rows)
+
+        self.grid = None
+        self._matrices = None
+        self._positions = None
+
+    @classmethod
+    def read(cls, csvFile):
+        reader = csv.DictReader(csvFile, delimiter=';')
+        rows = list(reader)
+        return cls(reader.fieldnames or [], rows)
+
+    def matrix(self, index):
+        """Local matrix of row index as four row tuples, for mathutils.Matrix"""
+        if self._matrices is None:
+            if numpy is not None:
+                self._matrices = _compute_matrices_numpy(self.columns, self.kinds)
+            else:
+                self._matrices = _compute_matrices(self.columns, self.kinds)
+
+        values = self._matrices[index * 16:index * 16 + 16]
+        if any(value != value for value in values):
+            raise ValueError(f'invalid placement transform in row {index + 2}')
+
+        return (tuple(values[0:4]), tuple(values[4:8]), tuple(values[8:12]), tuple(values[12:16]))
+
+    def world_position(self, index):
+        """WoW world X and Y of an ADT row, NaN for rows of other kinds"""
+        kind = self.kinds[index]
+        if kind == KIND_M2 or kind == KIND_WMO:
+            # MDDF and MODF positions are offset from the map corner, with X and Z on the ground plane
+            return MAX_SIZE - self.columns['PositionZ'][index], MAX_SIZE - self.columns['PositionX'][index]
+        elif kind == KIND_GOBJ:
+            return self.columns['PositionX'][index], self.columns['PositionY'][index]
+
+        return float('nan'), float('nan')
+
+    def world_positions(self):
+        """world_position of every row"""
+        if self._positions is None:
+            self._positions = [self.world_position(index) for index in range(len(self.rows))]
+
+        return self._positions
+
+    def key(self, index):
+        """Identity of row index for diffing against an earlier import, its model and transform"""
+        row = self.rows[index]
+        return ';'.join(row.get(field) or '' for field in KEY_FIELDS)
+
+
+def _euler_matrix(x, y, z):
+    # XYZ euler, Rz @ Ry @ Rx like mathutils
+    ci, cj, ch = cos(x), cos(y), cos(z)
+    si, sj, sh = sin(x), sin(y), sin(z)
+    cc, cs, sc, ss = ci * ch, ci * sh, si * ch, si * sh
+    return (
+        (cj * ch, sj * sc - cs, sj * cc + ss),
+        (cj * sh, sj * ss + cc, sj * cs - sc),
+        (-sj, cj * si, cj * ci)
+    )
+
+
+def _quaternion_matrix(w, x, y, z):
+    length = sqrt(w * w + x * x + y * y + z * z)
+    if length == 0.0:
+        # what mathutils normalizes a zero quaternion to
+        w, x, y, z = 0.0, 1.0, 0.0, 0.0
+    else:
+        w, x, y, z = w / length, x / length, y / length, z / length
+
+    return (
+        (1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)),
+        (2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)),
+        (2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y))
+    )
+
+
+def _compute_matrices(columns, kinds):
+    px, py, pz = columns['PositionX'], columns['PositionY'], columns['PositionZ']
+    rx, ry, rz, rw = columns['RotationX'], columns['RotationY'], columns['RotationZ'], columns['RotationW']
+    scales = columns['ScaleFactor']
+    result = array('d', bytes(len(kinds) * 16 * 8))
+
+    for i, kind in enumerate(kinds):
+        if kind == KIND_M2:
+            location = (MAX_SIZE - px[i], -(MAX_SIZE - pz[i]), py[i])
+            rotation = _euler_matrix(radians(90 + rz[i]), radians(rx[i]), radians(90 + ry[i]))
+        elif kind == KIND_WMO:
+            location = (MAX_SIZE - px[i], -(MAX_SIZE - pz[i]), py[i])
+            rotation = _euler_matrix(radians(rz[i]), radians(rx[i]), radians(90 + ry[i]))
+        elif kind == KIND_GOBJ:
+            location = (py[i], -px[i], pz[i])
+            rotation = _quaternion_matrix(rx[i], ry[i], -rz[i], rw[i])
+        elif kind == KIND_WMO_SET:
+            location = (px[i], py[i], pz[i])
+            # the set rotation gets an extra 90 degrees around its local X axis
+            r = _quaternion_matrix(rw[i], rx[i], ry[i], rz[i])
+            rotation = tuple((row[0], row[2], -row[1]) for row in r)
+        else:
+            location = (0.0, 0.0, 0.0)
+            rotation = ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0))
+
+        scale = scales[i]
+        base = i * 16
+        for row in range(3):
+            result[base + row * 4] = rotation[row][0] * scale
+            result[base + row * 4 + 1] = rotation[row][1] * scale
+            result[base + row * 4 + 2] = rotation[row][2] * scale
+            result[base + row * 4 + 3] = location[row]
+        result[base + 15] = 1.0
+
+    return result
+
+
+def _compute_matrices_numpy(columns, kinds):
+    count = len(kinds)
+    px, py, pz, rx, ry, rz, rw, scales = (numpy.frombuffer(columns[field], dtype=numpy.float64) for field in NUMERIC_FIELDS)
+    kinds = numpy.frombuffer(kinds, dtype=numpy.int8)
+
+    matrices = numpy.zeros((count, 4, 4), dtype=numpy.float64)
+    matrices[:, 0, 0] = matrices[:, 1, 1] = matrices[:, 2, 2] = matrices[:, 3, 3] = 1.0
+
+    def euler(mask, x, y, z):
+        ci, cj, ch = numpy.cos(x), numpy.cos(y), numpy.cos(z)
+        si, sj, sh = numpy.sin(x), numpy.sin(y), numpy.sin(z)
+        cc, cs, sc, ss = ci * ch, ci * sh, si * ch, si * sh
+        m = matrices[mask]
+        m[:, 0, :3] = numpy.stack((cj * ch, sj * sc - cs, sj * cc + ss), axis=1)
+        m[:, 1, :3] = numpy.stack((cj * sh, sj * ss + cc, sj * cs - sc), axis=1)
+        m[:, 2, :3] = numpy.stack((-sj, cj * si, cj * ci), axis=1)
+        return m
+
+    def quaternion(mask, w, x, y, z):
+        length = numpy.sqrt(w * w + x * x + y * y + z * z)
+        zero = length == 0.0
+        length[zero] = 1.0
+        w, x, y, z = w / length, x / length, y / length, z / length
+        w[zero], x[zero], y[zero], z[zero] = 0.0, 1.0, 0.0, 0.0
+        m = matrices[mask]
+        m[:, 0, :3] = numpy.stack((1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)), axis=1)
+        m[:, 1, :3] = numpy.stack((2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)), axis=1)
+        m[:, 2, :3] = numpy.stack((2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)), axis=1)
+        return m
+
+    mask = kinds == KIND_M2
+    if mask.any():
+        m = euler(mask, numpy.radians(90 + rz[mask]), numpy.radians(rx[mask]), numpy.radians(90 + ry[mask]))
+        m[:, :3, 3] = numpy.stack((MAX_SIZE - px[mask], -(MAX_SIZE - pz[mask]), py[mask]), axis=1)
+        matrices[mask] = m
+
+    mask = kinds == KIND_WMO
+    if mask.any():
+        m = euler(mask, numpy.radians(rz[mask]), numpy.radians(rx[mask]), numpy.radians(90 + ry[mask]))
+        m[:, :3, 3] = numpy.stack((MAX_SIZE - px[mask], -(MAX_SIZE - pz[mask]), py[mask]), axis=1)
+        matrices[mask] = m
+
+    mask = kinds == KIND_GOBJ
+    if mask.any():
+        m = quaternion(mask, rx[mask], ry[mask], -rz[mask], rw[mask])
+        m[:, :3, 3] = numpy.stack((py[mask], -px[mask], pz[mask]), axis=1)
+        matrices[mask] = m
+
+    mask = kinds == KIND_WMO_SET
+    if mask.any():
+        m = quaternion(mask, rw[mask], rx[mask], ry[mask], rz[mask])
+        # the set rotation gets an extra 90 degrees around its local X axis
+        m[:, :3, 1], m[:, :3, 2] = m[:, :3, 2].copy(), -m[:, :3, 1]
+        m[:, :3, 3] = numpy.stack((px[mask], py[mask], pz[mask]), axis=1)
+        matrices[mask] = m
+
+    matrices[:, :3, :3] *= scales[:, None, None]
+    return array('d', matrices.tobytes())
@@ -0,0 +1,172 @@
+import struct
+import zlib
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# decoding needs numpy, without it every image is left to Blender
+DECODE_AVAILABLE = numpy is not None
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# channels per color type, for 8 bit images
+COLOR_TYPE_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+class UnsupportedPNG(Exception):
+    pass
+
+
+def _read_chunks(data):
+    if data[:8] != PNG_SIGNATURE:
+        raise UnsupportedPNG('not a PNG file')
+
+    offset = 8
+    while offset + 8 <= len(data):
+        length, tag = struct.unpack_from('>I4s', data, offset)
+        yield tag, data[offset + 8:offset + 8 + length]
+        if tag == b'IEND':
+            return
+        offset += length + 12
+
+
+def _unfilter_rows(filters, data):
+    # None, Sub and Up only depend on the row above, each row is one vectorized pass
+    out = numpy.empty_like(data)
+    previous = numpy.zeros_like(data[0])
+    for row, filter_type in enumerate(filters):
+        if filter_type == 0:
+            out[row] = data[row]
+        elif filter_type == 1:
+            numpy.cumsum(data[row], axis=0, dtype=numpy.uint8, out=out[row])
+        else:
+            numpy.add(data[row], previous, out=out[row])
+        previous = out[row]
+
+    return out
+
+
+def _unfilter_wavefront(filters, data):
+    # Average and Paeth depend on the pixel to the left. The pixels of one
+    # anti-diagonal don't depend on each other, so they are laid out
+    # diagonal by diagonal and each diagonal is reconstructed in one pass
+    height, width, channels = data.shape
+    skewed = numpy.zeros((height + width, height, channels), dtype=numpy.int16)
+    out = numpy.zeros((height + width + 1, height + 1, channels), dtype=numpy.int16)
+    for row in range(height):
+        skewed[row:row + width, row] = data[row]
+    kinds = filters.astype(numpy.int16)[:, None]
+
+    for diagonal in range(height + width - 1):
+        first, last = max(0, diagonal - width + 1), min(height, diagonal + 1)
+        left = out[diagonal, first + 1:last + 1]
+        up = out[diagonal, first:last]
+        up_left = out[diagonal - 1, first:last]
+
+        # distances of left + up - up_left to left, up and up_left
+        dist_left = numpy.abs(up - up_left)
+        dist_up = numpy.abs(left - up_left)
+        dist_up_left = numpy.abs(left + up - up_left - up_left)
+        paeth = numpy.where((dist_left <= dist_up) & (dist_left <= dist_up_left), left, numpy.where(dist_up <= dist_up_left, up, up_left))
+
+        predictor = numpy.choose(kinds[first:last], (0, left, up, (left + up) >> 1, paeth))
+        out[diagonal + 1, first + 1:last + 1] = (skewed[diagonal, first:last] + predictor) & 0xFF
+
+    pixels = numpy.empty_like(data)
+    for row in range(height):
+        pixels[row] = out[row + 1:row + 1 + width, row + 1]
+
+    return pixels
+
+
+def read_png(path):
+    """Decode an 8 bit, non-interlaced PNG to (width, height, rgba).
+
+    rgba is a uint8 array of shape (height, width, 4), top row first.
+    Raises UnsupportedPNG for files Blender has to decode itself.
+    Decompression runs in zlib and the unfiltering in numpy, so most of the
+    work happens without holding the GIL.
+    """
+    if not DECODE_AVAILABLE:
+        raise UnsupportedPNG('numpy is not available')
+
+    with open(path, 'rb') as fp:
+        data = fp.read()
+
+    header = None
+    palette = None
+    transparency = None
+    compressed = []
+    for tag, payload in _read_chunks(data):
+        if tag == b'IHDR':
+            header = struct.unpack('>IIBBBBB', payload[:13])
+        elif tag == b'PLTE':
+            palette = numpy.frombuffer(payload, dtype=numpy.uint8).reshape(-1, 3)
+        elif tag == b'tRNS':
+            transparency = payload
+        elif tag == b'IDAT':
+            compressed.append(payload)
+
+    if header is None:
+        raise UnsupportedPNG('missing IHDR')
+
+    width, height, depth, color_type, _, _, interlace = header
+    channels = COLOR_TYPE_CHANNELS.get(color_type)
+    if depth != 8 or interlace != 0 or channels is None or (color_type == 3 and palette is None):
+        raise UnsupportedPNG(f'unsupported format (depth {depth}, color type {color_type}, interlace {interlace})')
+
+    try:
+        raw = zlib.decompress(b''.join(compressed))
+    except zlib.error as e:
+        raise UnsupportedPNG(f'corrupt image data: {e}')
+
+    stride = width * channels + 1
+    if len(raw) < stride * height:
+        raise UnsupportedPNG('truncated image data')
+
+    rows = numpy.frombuffer(raw, dtype=numpy.uint8, count=stride * height).reshape(height, stride)
+    filters = rows[:, 0]
+    if filters.max(initial=0) > 4:
+        raise UnsupportedPNG('unknown filter type')
+
+    filtered = rows[:, 1:].reshape(height, width, channels)
+    if (filters >= 3).any():
+        pixels = _unfilter_wavefront(filters, filtered)
+    else:
+        pixels = _unfilter_rows(filters, filtered)
+
+    rgba = numpy.empty((height, width, 4), dtype=numpy.uint8)
+    rgba[..., 3] = 255
+    if color_type == 3:
+        indices = pixels[..., 0]
+        rgba[..., :3] = palette[numpy.minimum(indices, len(palette) - 1)]
+        if transparency:
+            alpha = numpy.full(256, 255, dtype=numpy.uint8)
+            alpha[:len(transparency)] = numpy.frombuffer(transparency[:256], dtype=numpy.uint8)
+            rgba[..., 3] = alpha[indices]
+    elif color_type in (0, 4):
+        rgba[..., :3] = pixels[..., :1]
+        if color_type == 4:
+            rgba[..., 3] = pixels[..., 1]
+        elif transparency and len(transparency) >= 2:
+            key = struct.unpack('>H', transparency[:2])[0]
+            rgba[..., 3][pixels[..., 0] == key] = 0
+    else:
+        rgba[..., :channels] = pixels
+        if color_type == 2 and transparency and len(transparency) >= 6:
+            key = numpy.array(struct.unpack('>HHH', transparency[:6]))
+            rgba[..., 3][(pixels == key).all(axis=2)] = 0
+
+    return width, height, rgba
+
+
+def decode_png(path):
+    """Decode a PNG like read_png to (width, height, pixels), pixels laid out like Image.pixels"""
+    width, height, rgba = read_png(path)
+
+    # Image.pixels is float RGBA starting at the bottom row
+    result = rgba[::-1].reshape(-1).astype(numpy.float32)
+    result *= 1.0 / 255.0
+    return width, height, result
@@ -0,0 +1,149 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .import_plan import normalize_path, read_placement_models
+from .model_loader import get_placement_path, load_model
+
+# parsing holds the GIL for most of its time, so workers only overlap the waits on file reads
+# with the main thread. 8 exports of 9 MB parsed next to 3 s of pure Python main thread work
+# (CPython 3.11, one core, median of 3-5 runs):
+#   warm file cache:           6.3 s one after the other, 6.8 s with 1 worker, 6.7 s with 4
+#   cold cache, local SSD:     7.2 s one after the other, 7.4 s with 1 worker
+#   reads limited to 50 MB/s:  8.9 s one after the other, 8.4 s with 1 worker, 7.3 s with 2
+# which is why parallel parsing is off by default, it pays off on slow storage such as a
+# network share. Two workers keep a read in flight while the other parses
+MAX_WORKERS = min(2, os.cpu_count() or 1)
+
+# read size used to pull textures into the OS file cache
+WARM_CHUNK_SIZE = 1024 * 1024
+
+
+def _warm_file(path):
+    try:
+        with open(path, 'rb', buffering=0) as fp:
+            while fp.read(WARM_CHUNK_SIZE):
+                pass
+    except OSError:
+        pass
+
+
+class ModelPrefetcher:
+    """Parses OBJ exports on worker threads ahead of the import.
+
+    prefetch_tile() queues an export together with every model it places,
+    get() hands the parsed result to the main thread, parsing synchronously
+    when the file was never queued. With an ImportPlan the models of nested
+    placement CSVs are queued as well and texture files are read ahead into
+    the OS file cache. Only bpy-free code runs on the workers; datablocks
+    are still created on the main thread. What the workers save is the time
+    the main thread would otherwise wait on the disk and the parse cache,
+    see MAX_WORKERS.
+    """
+    def __init__(self, cache=None, rowTypes=('m2', 'wmo', 'gobj'), includeSets=True, knownNames=(), workers=MAX_WORKERS, plan=None, spatialFilter=None):
+        self.cache = cache
+        self.rowTypes = frozenset(rowTypes)
+        self.includeSets = includeSets
+        self.spatialFilter = spatialFilter
+        self.plan = plan
+        self.hits = 0
+        self.misses = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='wowobj-parse')
+        self._futures = {}
+        self._tiles = set()
+        # models are only ever imported once per object name, see importWoWOBJ
+        self._names = set(knownNames)
+        # except WMOs with their own placements, which are imported for every placement and
+        # queued again by every tile that places them
+        self._retained = plan.placed_models() if plan is not None else set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def prefetch(self, objectFile):
+        key = normalize_path(objectFile)
+        with self._lock:
+            if self._closed or key in self._futures:
+                return
+
+            self._futures[key] = self._executor.submit(load_model, objectFile, self.cache)
+
+    def prefetch_tile(self, objectFile):
+        key = normalize_path(objectFile)
+        with self._lock:
+            if self._closed or key in self._tiles:
+                return
+
+            self._tiles.add(key)
+
+        self.prefetch(objectFile)
+
+        if self.plan is not None and key in self.plan.nodes:
+            self._prefetch_planned(self.plan.nodes[key])
+        else:
+            self._executor.submit(self._prefetch_placements, get_placement_path(objectFile))
+
+    def _prefetch_planned(self, root):
+        textures = []
+        for node in self.plan.walk(root):
+            if not node.exists or node is root:
+                continue
+
+            if node.kind == 'obj':
+                self._prefetch_model(node.path)
+            elif node.kind == 'texture':
+                textures.append(node.path)
+
+        # textures are loaded late by Blender, so they queue behind the models
+        for path in textures:
+            with self._lock:
+                if self._closed:
+                    return
+
+                self._executor.submit(_warm_file, path)
+
+    def _prefetch_placements(self, csvPath):
+        if not os.path.exists(csvPath):
+            return
+
+        try:
+            modelPaths = read_placement_models(csvPath, self.rowTypes, self.includeSets, self.spatialFilter)
+        except Exception as e:
+            print(f'[WoWOBJ] Unable to prefetch models from {csvPath}: {e}')
+            return
+
+        for modelPath in modelPaths:
+            if os.path.exists(modelPath):
+                self._prefetch_model(modelPath)
+
+    def _prefetch_model(self, modelPath):
+        name = os.path.basename(modelPath)
+        with self._lock:
+            if name in self._names and normalize_path(modelPath) not in self._retained:
+                return
+            self._names.add(name)
+
+        self.prefetch(modelPath)
+
+    def get(self, objectFile):
+        """Return the ParsedModel for objectFile, re-raising any error from its worker.
+
+        A prefetched model is handed out once and then released, the import
+        adds to its json_info. Later requests parse it again.
+        """
+        key = normalize_path(objectFile)
+        with self._lock:
+            future = self._futures.pop(key, None)
+
+        if future is None:
+            self.misses += 1
+            return load_model(objectFile, self.cache)
+
+        self.hits += 1
+        return future.result()
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            self._futures.clear()
+
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,175 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+
+# number of slowest models listed in the summary
+SUMMARY_MODEL_LIMIT = 10
+
+
+class _Frame:
+    __slots__ = ('name', 'label', 'start', 'child_time', 'bytes')
+
+    def __init__(self, name, label, start):
+        self.name = name
+        self.label = label
+        self.start = start
+        self.child_time = 0.0
+        self.bytes = 0
+
+
+class Profiler:
+    """Records wall time, call counts and byte counts per import stage.
+
+    Stages nest: a model stage holds the parse, materials, mesh, liquids
+    and placements stages of that model, and placements hold the models
+    they import. Totals are kept inclusive and exclusive of nested stages,
+    every stage is also kept as an event for JSON and Chrome trace output.
+    Time between pause() and resume(), when a modal import hands control
+    back to Blender, is left out of every stage.
+    """
+    def __init__(self):
+        self.stages = {}
+        self.models = []
+        self.events = []
+        self._stack = []
+        self._paused = None
+        self._paused_total = 0.0
+        self._origin = self._clock()
+
+    def _clock(self):
+        return time.perf_counter() - self._paused_total
+
+    def pause(self):
+        if self._paused is None:
+            self._paused = time.perf_counter()
+
+    def resume(self):
+        if self._paused is not None:
+            self._paused_total += time.perf_counter() - self._paused
+            self._paused = None
+
+    def begin(self, name, label=None):
+        frame = _Frame(name, label, self._clock())
+        self._stack.append(frame)
+        return frame
+
+    def end(self, frame, bytes=0):
+        # frames left open by an exception are closed with their parent
+        while self._stack:
+            current = self._stack.pop()
+            self._close(current, bytes if current is frame else 0)
+            if current is frame:
+                break
+
+    def add_bytes(self, bytes):
+        if self._stack:
+            self._stack[-1].bytes += bytes
+
+    @contextmanager
+    def stage(self, name, label=None):
+        frame = self.begin(name, label)
+        try:
+            yield frame
+        finally:
+            self.end(frame)
+
+    def _close(self, frame, bytes):
+        now = self._clock()
+        elapsed = now - frame.start
+        frame.bytes += bytes
+
+        if self._stack:
+            self._stack[-1].child_time += elapsed
+
+        stats = self.stages.get(frame.name)
+        if stats is None:
+            stats = self.stages[frame.name] = {'calls': 0, 'total': 0.0, 'self': 0.0, 'bytes': 0}
+
+        stats['calls'] += 1
+        stats['total'] += elapsed
+        stats['self'] += elapsed - frame.child_time
+        stats['bytes'] += frame.bytes
+
+        if frame.name == 'model':
+            self.models.append({'file': frame.label, 'depth': len(self._stack), 'total': elapsed, 'self': elapsed - frame.child_time})
+
+        self.events.append({
+            'name': frame.name,
+            'label': frame.label,
+            'start': frame.start - self._origin,
+            'duration': elapsed,
+            'bytes': frame.bytes,
+            'depth': len(self._stack)
+        })
+
+    def summary(self):
+        lines = ['[WoWOBJ] Import profile:']
+        lines.append(f"{'stage':<14}{'calls':>8}{'total (s)':>12}{'self (s)':>12}{'bytes':>14}")
+
+        for name, stats in sorted(self.stages.items(), key=lambda item: item[1]['self'], reverse=True):
+            lines.append(f"{name:<14}{stats['calls']:>8}{stats['total']:>12.3f}{stats['self']:>12.3f}{stats['bytes']:>14}")
+
+        if self.models:
+            lines.append(f'slowest models (of {len(self.models)}):')
+            for model in sorted(self.models, key=lambda model: model['total'], reverse=True)[:SUMMARY_MODEL_LIMIT]:
+                lines.append(f"  {model['total']:>8.3f}s  {model['file']}")
+
+        return '\n'.join(lines)
+
+    def write(self, path, format='JSON', metadata=None):
+        """Write the recorded stages as a JSON trace or a Chrome trace (chrome://tracing, Perfetto)"""
+        if format == 'CHROME':
+            data = {
+                'traceEvents': [{
+                    'name': event['label'] or event['name'],
+                    'cat': event['name'],
+                    'ph': 'X',
+                    'ts': event['start'] * 1e6,
+                    'dur': event['duration'] * 1e6,
+                    'pid': 1,
+                    'tid': 1,
+                    'args': {'bytes': event['bytes']}
+                } for event in self.events],
+                'displayTimeUnit': 'ms',
+                'otherData': metadata or {}
+            }
+        else:
+            data = {
+                'metadata': metadata or {},
+                'stages': self.stages,
+                'models': self.models,
+                'events': sorted(self.events, key=lambda event: event['start'])
+            }
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with open(path, 'w', encoding='utf-8') as fp:
+            json.dump(data, fp, indent=1)
+
+
+class NullProfiler:
+    """Stands in for Profiler when profiling is off"""
+    def begin(self, name, label=None):
+        return None
+
+    def end(self, frame, bytes=0):
+        pass
+
+    def pause(self):
+        pass
+
+    def resume(self):
+        pass
+
+    def add_bytes(self, bytes):
+        pass
+
+    @contextmanager
+    def stage(self, name, label=None):
+        yield None
+
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,70 @@
+import os
+
+# share of a file's progress reached when each stage starts, placements fill the rest
+STAGE_PROGRESS = {
+    'parse': 0.0,
+    'materials': 0.05,
+    'mesh': 0.1,
+    'liquids': 0.2,
+    'placements': 0.25,
+}
+
+
+class ImportProgress:
+    """Tracks how far an import session got, for progress display and cancellation.
+
+    Only the selected files (depth 1) move the stage and row counters, the
+    models they place count towards models_done. Setting cancelled makes
+    the import stop at the next placement row or file while keeping
+    everything imported so far.
+    """
+    def __init__(self, files=(), models_total=0):
+        self.files = list(files)
+        self.file_index = 0
+        self.models_total = models_total
+        self.models_done = 0
+        self.stage = 'parse'
+        self.rows_done = 0
+        self.rows_total = 0
+        self.depth = 0
+        self.cancelled = False
+
+    def begin_file(self, index):
+        self.file_index = index
+        self.stage = 'parse'
+        self.rows_done = self.rows_total = 0
+
+    def set_stage(self, stage):
+        if self.depth == 1:
+            self.stage = stage
+
+    def set_rows(self, done, total):
+        if self.depth == 1:
+            self.rows_done = done
+            self.rows_total = total
+
+    def fraction(self):
+        if not self.files:
+            return 1.0
+
+        current = STAGE_PROGRESS.get(self.stage, 0.0)
+        if self.stage == 'placements' and self.rows_total:
+            current += (1.0 - current) * self.rows_done / self.rows_total
+
+        return min(1.0, (self.file_index + current) / len(self.files))
+
+    def status(self):
+        if not self.files:
+            return 'Importing'
+
+        parts = [f'Importing {os.path.basename(self.files[self.file_index])} ({self.file_index + 1}/{len(self.files)})', self.stage]
+        if self.stage == 'placements' and self.rows_total:
+            parts.append(f'{self.rows_total - self.rows_done} rows remaining')
+
+        if self.models_total:
+            parts.append(f'{max(0, self.models_total - self.models_done)} models remaining')
+        else:
+            parts.append(f'{self.models_done} models imported')
+
+        parts.append('Esc to cancel')
+        return ' | '.join(parts)
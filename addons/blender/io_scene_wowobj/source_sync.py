@@ -0,0 +1,144 @@
+import hashlib
+import os
+
+import bpy
+
+# ID property with the source files a datablock was imported from
+SOURCE_PROP = 'wowexport_source'
+# ID property with the placement CSV row a placement object was created from
+PLACEMENT_PROP = 'wowexport_placement'
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _hash_files(paths):
+    digest = hashlib.sha1()
+    for path in paths:
+        with open(path, 'rb') as fp:
+            while True:
+                chunk = fp.read(HASH_CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def _signature(paths):
+    """Total size and newest mtime of paths, None if one of them is gone"""
+    size = 0
+    mtime = 0.0
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        size += stat.st_size
+        mtime = max(mtime, stat.st_mtime)
+
+    # ID property ints are 32 bit, doubles hold any realistic size exactly
+    return float(size), mtime
+
+
+class SourceSync:
+    """Source file records of imported datablocks, for incremental re-imports.
+
+    Every imported model object and mesh records the path, total size and
+    newest mtime of the files it was built from (OBJ, MTL and JSON
+    sidecar), and with hashFiles set their content hash. A later import
+    compares those against the files on disk: size and mtime first, the
+    hash only when they differ, since wow.export rewrites unchanged files
+    on every export. A record without a hash is changed once its size or
+    mtime is. Each path is checked at most once per session.
+    """
+    def __init__(self, hashFiles=True):
+        self.hashFiles = hashFiles
+        self._records = {}
+        self._checked = {}
+        self._meshes = None
+
+    def record(self, path, sources):
+        """Record for the model at path, sources being the files it was read from"""
+        record = self._records.get(path)
+        if record is None:
+            files = sorted(sources)
+            size, mtime = _signature(files) or (0.0, 0.0)
+            # ID property arrays can't hold strings
+            record = self._records[path] = {
+                'path': path,
+                'files': '\n'.join(files),
+                'size': size,
+                'mtime': mtime
+            }
+            if self.hashFiles:
+                record['hash'] = _hash_files(files)
+
+        return record
+
+    def stamp(self, path, sources, *blocks):
+        record = self.record(path, sources)
+        for block in blocks:
+            block[SOURCE_PROP] = record
+
+    def _source_meshes(self):
+        # built once, meshes created later in the session are current anyway
+        if self._meshes is None:
+            self._meshes = {}
+            for mesh in bpy.data.meshes:
+                record = mesh.get(SOURCE_PROP)
+                if record is not None:
+                    self._meshes.setdefault(record.get('path'), []).append(mesh)
+
+        return self._meshes
+
+    def meshes(self, path):
+        return [mesh for mesh in self._source_meshes().get(path, ()) if mesh.users]
+
+    def find_root(self, path):
+        """Top-level object imported from path, if any"""
+        for obj in bpy.data.objects:
+            if obj.parent is None and PLACEMENT_PROP not in obj:
+                record = obj.get(SOURCE_PROP)
+                if record is not None and record.get('path') == path:
+                    return obj
+
+        return None
+
+    def is_current(self, record):
+        files = record.get('files', '').split('\n')
+        signature = _signature(files)
+        if signature is None:
+            # keep what was imported rather than dropping it for a missing sidecar
+            return True
+
+        if signature == (record.get('size'), record.get('mtime')):
+            return True
+
+        if not record.get('hash'):
+            return False
+
+        try:
+            return _hash_files(files) == record.get('hash')
+        except OSError:
+            return True
+
+    def needs_rebuild(self, path):
+        """True the first time in a session path is checked and its meshes are stale"""
+        if path in self._checked:
+            return False
+
+        meshes = self.meshes(path)
+        stale = bool(meshes) and not self.is_current(meshes[0][SOURCE_PROP])
+        self._checked[path] = stale
+
+        if meshes and not stale:
+            # touched but identical, refresh the signature so the next check skips the hash
+            signature = _signature(meshes[0][SOURCE_PROP]['files'].split('\n'))
+            if signature is not None:
+                for mesh in meshes:
+                    # meshes linked from an asset library can't be changed
+                    if mesh.library is None:
+                        mesh[SOURCE_PROP]['size'], mesh[SOURCE_PROP]['mtime'] = signature
+
+        return stale
@@ -0,0 +1,122 @@
+from collections import defaultdict
+from math import floor, hypot, inf
+
+from .placement_loader import ADT_KINDS, KIND_NONE
+
+# edge length of a grid cell in yards, two ADT chunks
+GRID_CELL_SIZE = 33.33333 * 2
+
+
+class PlacementGrid:
+    """Uniform grid over the world positions of placement rows.
+
+    Each cell lists the rows whose position falls in it, so a box query only
+    looks at rows in the cells the box overlaps. Rows without a position
+    aren't indexed.
+    """
+    def __init__(self, positions, cell_size=GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+
+        for index, (x, y) in enumerate(positions):
+            if x == x and y == y:
+                self.cells[(floor(x / cell_size), floor(y / cell_size))].append(index)
+
+    def query(self, min_x, min_y, max_x, max_y):
+        """Yield the rows in every cell overlapping the box"""
+        cell_size = self.cell_size
+        x0, x1 = floor(min_x / cell_size), floor(max_x / cell_size)
+        y0, y1 = floor(min_y / cell_size), floor(max_y / cell_size)
+
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self.cells):
+            # the box covers more cells than there are rows in, walk the rows instead
+            for (cx, cy), rows in self.cells.items():
+                if x0 <= cx <= x1 and y0 <= cy <= y1:
+                    yield from rows
+            return
+
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                yield from self.cells.get((cx, cy), ())
+
+
+class SpatialFilter:
+    """Which ADT placements to import, by their position in WoW world coordinates.
+
+    region limits rows to an axis-aligned box (min_x, min_y, max_x, max_y),
+    centre and radius to a circle. type_distances optionally limits a row
+    type ('m2', 'wmo', 'gobj') further, to a distance from the centre of the
+    circle or of the region. Rows outside are dropped before any of their
+    files is read.
+    """
+    def __init__(self, region=None, centre=None, radius=inf, type_distances=None):
+        if region is not None:
+            min_x, min_y, max_x, max_y = region
+            region = (min(min_x, max_x), min(min_y, max_y), max(min_x, max_x), max(min_y, max_y))
+            if centre is None:
+                centre = ((region[0] + region[2]) / 2, (region[1] + region[3]) / 2)
+
+        self.region = region
+        self.centre = centre
+        self.radius = radius if centre is not None else inf
+        self.type_distances = {
+            ADT_KINDS[row_type]: distance
+            for row_type, distance in (type_distances or {}).items()
+            if row_type in ADT_KINDS and distance > 0
+        }
+
+    def bounds(self):
+        """Box holding every position the filter can accept"""
+        min_x = min_y = -inf
+        max_x = max_y = inf
+        if self.region is not None:
+            min_x, min_y, max_x, max_y = self.region
+
+        # rows of a type without its own limit can be anywhere within the radius
+        reach = self.radius
+        if len(self.type_distances) == len(ADT_KINDS):
+            reach = min(reach, max(self.type_distances.values()))
+
+        if self.centre is not None and reach < inf:
+            cx, cy = self.centre
+            min_x, min_y = max(min_x, cx - reach), max(min_y, cy - reach)
+            max_x, max_y = min(max_x, cx + reach), min(max_y, cy + reach)
+
+        return min_x, min_y, max_x, max_y
+
+    def accepts(self, x, y, kind):
+        if x != x or y != y:
+            return False
+
+        if self.region is not None:
+            min_x, min_y, max_x, max_y = self.region
+            if not (min_x <= x <= max_x and min_y <= y <= max_y):
+                return False
+
+        if self.centre is not None:
+            distance = hypot(x - self.centre[0], y - self.centre[1])
+            if distance > self.radius or distance > self.type_distances.get(kind, inf):
+                return False
+
+        return True
+
+    def select(self, table):
+        """Indices of the rows of an ADT PlacementTable the filter accepts.
+
+        Rows of an unknown type have no position to filter by, they are
+        always selected and left to the import to skip.
+        """
+        positions = table.world_positions()
+        bounds = self.bounds()
+
+        if all(abs(value) == inf for value in bounds):
+            candidates = range(len(positions))
+        else:
+            if table.grid is None:
+                table.grid = PlacementGrid(positions)
+            candidates = table.grid.query(*bounds)
+
+        kinds = table.kinds
+        selected = {index for index in candidates if self.accepts(positions[index][0], positions[index][1], kinds[index])}
+        selected.update(index for index, kind in enumerate(kinds) if kind == KIND_NONE)
+        return selected
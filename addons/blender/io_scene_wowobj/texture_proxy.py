@@ -0,0 +1,130 @@
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import bpy
+
+from .image_registry import DECODED_PROP, FULL_PATH_PROP, PROXY_PATH_PROP, _hash_file
+from .png_decoder import DECODE_AVAILABLE, PNG_SIGNATURE, UnsupportedPNG, read_png
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+PROXY_WORKERS = min(8, os.cpu_count() or 1)
+
+# texture resolution setting mapped to the divisor of both image sides
+PROXY_DIVISORS = {'FULL': 1, 'HALF': 2, 'QUARTER': 4, 'EIGHTH': 8}
+
+
+def _png_chunk(tag, payload):
+    return struct.pack('>I', len(payload)) + tag + payload + struct.pack('>I', zlib.crc32(tag + payload))
+
+
+def _write_png(path, rgba):
+    height, width = rgba.shape[:2]
+    # filter type 0 on every row
+    rows = numpy.zeros((height, width * 4 + 1), dtype=numpy.uint8)
+    rows[:, 1:] = rgba.reshape(height, width * 4)
+
+    data = b''.join((
+        PNG_SIGNATURE,
+        _png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)),
+        _png_chunk(b'IDAT', zlib.compress(rows.tobytes(), 6)),
+        _png_chunk(b'IEND', b'')
+    ))
+
+    temp = path + '.tmp'
+    with open(temp, 'wb') as fp:
+        fp.write(data)
+    os.replace(temp, path)
+
+
+def downscale(rgba, divisor):
+    """Box filter rgba down by divisor on both sides, edge pixels that don't fill a box are dropped"""
+    height, width = rgba.shape[:2]
+    divisor = min(divisor, height, width)
+    if divisor <= 1:
+        return rgba
+
+    height, width = height // divisor, width // divisor
+    boxes = rgba[:height * divisor, :width * divisor].reshape(height, divisor, width, divisor, 4)
+    return (boxes.mean(axis=(1, 3), dtype=numpy.float32) + 0.5).astype(numpy.uint8)
+
+
+class TextureProxyCache:
+    """Downscaled copies of texture files for viewport work.
+
+    Copies are written to directory as PNG, named after the content hash of
+    the source file and the divisor, so every export of the same texture
+    shares one copy. prepare() builds the copies of a batch of files on a
+    thread pool. Files the PNG decoder can't read have no copy and are used
+    at full resolution.
+    """
+    def __init__(self, directory, divisor):
+        self.directory = directory
+        self.divisor = divisor
+        self.created = 0
+        self.hits = 0
+        self._paths = {}
+
+    def _build(self, path):
+        try:
+            target = os.path.join(self.directory, f'{_hash_file(path)}_{self.divisor}.png')
+            if os.path.exists(target):
+                return target, False
+
+            width, height, rgba = read_png(path)
+            os.makedirs(self.directory, exist_ok=True)
+            _write_png(target, downscale(rgba, self.divisor))
+            return target, True
+        except (OSError, UnsupportedPNG) as e:
+            print(f'[WoWOBJ] No texture proxy for {path}: {e}')
+            return None, False
+
+    def prepare(self, paths):
+        """Build the copies of every path that has none yet"""
+        paths = [path for path in dict.fromkeys(paths) if path not in self._paths]
+        if not paths or not DECODE_AVAILABLE:
+            return
+
+        with ThreadPoolExecutor(max_workers=PROXY_WORKERS, thread_name_prefix='wowobj-proxy') as executor:
+            for path, (target, created) in zip(paths, executor.map(self._build, paths)):
+                self._paths[path] = target
+                if created:
+                    self.created += 1
+                elif target is not None:
+                    self.hits += 1
+
+    def get(self, path):
+        """Path of the downscaled copy of path, None if it has none"""
+        if path not in self._paths:
+            self.prepare([path])
+
+        return self._paths.get(path)
+
+
+def swap_texture_resolution(full):
+    """Point the images loaded through a TextureProxyCache at their full resolution files, or back at the copies"""
+    swapped = 0
+    for image in bpy.data.images:
+        if image.library is not None or FULL_PATH_PROP not in image:
+            continue
+
+        target = image[FULL_PATH_PROP] if full else image.get(PROXY_PATH_PROP)
+        if not target or (not full and not os.path.exists(target)):
+            continue
+
+        if DECODED_PROP in image:
+            # pixels decoded during the import, reload them from the file instead
+            del image[DECODED_PROP]
+            image.source = 'FILE'
+        elif bpy.path.abspath(image.filepath) == target:
+            continue
+
+        image.filepath = target
+        swapped += 1
+
+    return swapped